@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import re
 import json
+from bisect import bisect_left
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.model_selection import train_test_split
@@ -19,6 +20,14 @@ from sklearn.metrics import accuracy_score, classification_report
 import warnings
 warnings.filterwarnings('ignore')
 
+# スコア変換テーブル (閾値は昇順、値が閾値を「超えた」数で区分を引く)
+_PREDICTION_CHANGE_THRESHOLDS = (-5, -2, 0, 2, 5, 10)
+_PREDICTION_SCORES = (0.1, 0.3, 0.4, 0.6, 0.7, 0.8, 0.9)
+_VOLATILITY_THRESHOLDS = (0.1, 0.2, 0.3, 0.4)
+_VOLATILITY_RISK_SCORES = (0.9, 0.7, 0.5, 0.3, 0.1)  # 超低リスク → 高リスク
+_RECOMMENDATION_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+_RECOMMENDATION_LEVELS = ("非推奨", "注意", "中立", "推奨", "強力推奨")
+
 class AdvancedAIAnalyzer:
     """高度なAI分析を行うクラス"""
     
@@ -442,30 +451,36 @@ class AdvancedAIAnalyzer:
         try:
             indicators = {}
             
-            # RSI
-            delta = data['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            indicators['rsi'] = rsi.iloc[-1]
-            
-            # MACD
-            ema_12 = data['Close'].ewm(span=12).mean()
-            ema_26 = data['Close'].ewm(span=26).mean()
-            macd = ema_12 - ema_26
-            signal = macd.ewm(span=9).mean()
-            indicators['macd'] = macd.iloc[-1]
-            indicators['macd_signal'] = signal.iloc[-1]
+            # 最新値だけを使うので、終値は NumPy 配列の末尾から計算
+            close_series = data['Close']
+            close = close_series.to_numpy(dtype=np.float64)
+            
+            # RSI (直近14本の値動きの単純平均)
+            if len(close) > 14:
+                delta = np.diff(close[-15:])
+                gain = np.maximum(delta, 0.0).mean()
+                loss = np.maximum(-delta, 0.0).mean()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rs = np.float64(gain) / loss
+                indicators['rsi'] = 100 - (100 / (1 + rs))
+            else:
+                indicators['rsi'] = np.nan
+            
+            # MACD (指数平滑は全期間が必要)
+            macd = close_series.ewm(span=12, adjust=False).mean() - close_series.ewm(span=26, adjust=False).mean()
+            indicators['macd'] = macd.to_numpy()[-1]
+            indicators['macd_signal'] = macd.ewm(span=9, adjust=False).mean().to_numpy()[-1]
             
             # ボリンジャーバンド
-            sma_20 = data['Close'].rolling(window=20).mean()
-            std_20 = data['Close'].rolling(window=20).std()
-            upper_band = sma_20 + (std_20 * 2)
-            lower_band = sma_20 - (std_20 * 2)
-            indicators['bb_upper'] = upper_band.iloc[-1]
-            indicators['bb_middle'] = sma_20.iloc[-1]
-            indicators['bb_lower'] = lower_band.iloc[-1]
+            if len(close) >= 20:
+                window = close[-20:]
+                sma_20 = window.mean()
+                std_20 = window.std(ddof=1)
+            else:
+                sma_20 = std_20 = np.nan
+            indicators['bb_upper'] = sma_20 + (std_20 * 2)
+            indicators['bb_middle'] = sma_20
+            indicators['bb_lower'] = sma_20 - (std_20 * 2)
             
             return indicators
             
@@ -630,20 +645,7 @@ class AdvancedAIAnalyzer:
             price_change = prediction.get('price_change_percent', 0)
             
             # 価格変動に基づくスコア
-            if price_change > 10:
-                return 0.9
-            elif price_change > 5:
-                return 0.8
-            elif price_change > 2:
-                return 0.7
-            elif price_change > 0:
-                return 0.6
-            elif price_change > -2:
-                return 0.4
-            elif price_change > -5:
-                return 0.3
-            else:
-                return 0.1
+            return _PREDICTION_SCORES[bisect_left(_PREDICTION_CHANGE_THRESHOLDS, price_change)]
                 
         except Exception as e:
             print(f"予測スコア計算エラー: {e}")
@@ -662,16 +664,7 @@ class AdvancedAIAnalyzer:
             volatility = data['Close'].pct_change().std() * np.sqrt(252)
             
             # ボラティリティをスコアに変換
-            if volatility > 0.4:
-                return 0.1  # 高リスク
-            elif volatility > 0.3:
-                return 0.3  # 中高リスク
-            elif volatility > 0.2:
-                return 0.5  # 中リスク
-            elif volatility > 0.1:
-                return 0.7  # 低リスク
-            else:
-                return 0.9  # 超低リスク
+            return _VOLATILITY_RISK_SCORES[bisect_left(_VOLATILITY_THRESHOLDS, volatility)]
                 
         except Exception as e:
             print(f"リスクスコア計算エラー: {e}")
@@ -680,16 +673,7 @@ class AdvancedAIAnalyzer:
     def _calculate_recommendation_level(self, total_score: float, factors: Dict) -> str:
         """推奨レベル計算"""
         try:
-            if total_score > 0.8:
-                return "強力推奨"
-            elif total_score > 0.6:
-                return "推奨"
-            elif total_score > 0.4:
-                return "中立"
-            elif total_score > 0.2:
-                return "注意"
-            else:
-                return "非推奨"
+            return _RECOMMENDATION_LEVELS[bisect_left(_RECOMMENDATION_THRESHOLDS, total_score)]
                 
         except Exception as e:
             print(f"推奨レベル計算エラー: {e}")
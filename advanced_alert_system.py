@@ -4,13 +4,17 @@
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import operator
 import smtplib
 import threading
 import time
+import uuid
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Deque
+from typing import Dict, List, Optional, Any, Callable, Deque, Tuple
 from dataclasses import dataclass, asdict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -18,8 +22,10 @@ import requests
 from enum import Enum
 import sqlite3
 import os
+import queue
 from collections import deque, defaultdict
 import statistics
+import numpy as np
 
 class AlertType(Enum):
     """アラートタイプ"""
@@ -35,6 +41,95 @@ class AlertType(Enum):
     BID_ASK_SPREAD = "bid_ask_spread"
     MOMENTUM_SHIFT = "momentum_shift"
 
+# 比較演算子 -> 比較関数
+COMPARISON_OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': lambda value, threshold: abs(value - threshold) < 1e-6,
+    '!=': lambda value, threshold: abs(value - threshold) >= 1e-6,
+}
+
+# 比較演算子 -> 価格アラート一括判定用のコード ('>', '<', '>=', '<=', '==', '!=' の順に 0-5)
+PRICE_OPERATOR_CODES: Dict[str, int] = {op: code for code, op in enumerate(COMPARISON_OPERATORS)}
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_default(value: Any) -> Any:
+    """標準 json 用のフォールバック変換 (Enum は値、日時は ISO 形式)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def _dumps(value: Any) -> str:
+    """DB 保存用の JSON 文字列を生成 (インデントなし、orjson があれば使用)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+def _loads(raw: str) -> Any:
+    """DB から読み込んだ JSON 文字列を復元"""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+# JIT Compilation (optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _scan_price_conditions(values: np.ndarray, thresholds: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """価格条件を1ループで判定 (価格が NaN の条件は不成立)"""
+    n = thresholds.shape[0]
+    hits = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        value = values[i]
+        threshold = thresholds[i]
+        code = codes[i]
+        if code == 0:
+            hits[i] = value > threshold
+        elif code == 1:
+            hits[i] = value < threshold
+        elif code == 2:
+            hits[i] = value >= threshold
+        elif code == 3:
+            hits[i] = value <= threshold
+        elif code == 4:
+            hits[i] = abs(value - threshold) < 1e-6
+        elif code == 5:
+            hits[i] = abs(value - threshold) >= 1e-6
+    return hits
+
+if NUMBA_AVAILABLE:
+    _scan_price_conditions = njit(cache=True)(_scan_price_conditions)
+else:
+    def _scan_price_conditions(values: np.ndarray, thresholds: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """価格条件を演算子コードごとのマスクで判定 (価格が NaN の条件は不成立)"""
+        with np.errstate(invalid='ignore'):
+            diff = np.abs(values - thresholds)
+            return (
+                ((codes == 0) & (values > thresholds))
+                | ((codes == 1) & (values < thresholds))
+                | ((codes == 2) & (values >= thresholds))
+                | ((codes == 3) & (values <= thresholds))
+                | ((codes == 4) & (diff < 1e-6))
+                | ((codes == 5) & (diff >= 1e-6))
+            )
+
 class AlertSeverity(Enum):
     """アラート重要度"""
     LOW = "low"
@@ -418,18 +513,46 @@ class NotificationService:
 
 class AlertDatabase:
     """アラートデータベースクラス"""
+
+    _RULE_UPSERT_SQL = """
+        INSERT OR REPLACE INTO alert_rules 
+        (id, name, description, conditions, severity, notification_channels, 
+         cooldown_period, enabled, created_at, last_triggered)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _TRIGGER_INSERT_SQL = """
+        INSERT INTO alert_triggers 
+        (id, rule_id, symbol, alert_type, condition, current_value, 
+         threshold_value, severity, message, timestamp, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
     
-    def __init__(self, db_path: str = "alerts.db"):
+    def __init__(self, db_path: str = "alerts.db", wal: bool = False):
         self.db_path = db_path
+        # WAL はファイルに永続する設定で -wal/-shm ファイルも作るため、構築時 (インポート時) には切り替えず
+        # wal=True か enable_wal() (監視開始時に呼ばれる) で有効化する
+        self.wal = wal
         self.logger = logging.getLogger(__name__)
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """接続を開く (WAL では synchronous=NORMAL でもコミットの整合性が保たれ、fsync はチェックポイント時のみ)"""
+        conn = sqlite3.connect(self.db_path)
+        if self.wal:
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
     def _init_database(self):
         """データベースを初期化"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # 変更をWAL (追記ログ) に書き、本体への反映はチェックポイントでまとめて行う
+            if self.wal:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            
             # アラートルールテーブル
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS alert_rules (
@@ -464,6 +587,18 @@ class AlertDatabase:
                 )
             """)
             
+            # 履歴の新しい順の取得と期限切れ削除で使う
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_alert_triggers_timestamp
+                ON alert_triggers (timestamp)
+            """)
+            
+            # 銘柄別の履歴取得はその銘柄の行だけを新しい順に読む (銘柄数が増えても全件を走査しない)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_alert_triggers_symbol_timestamp
+                ON alert_triggers (symbol, timestamp)
+            """)
+            
             conn.commit()
             conn.close()
             
@@ -473,26 +608,10 @@ class AlertDatabase:
     def save_alert_rule(self, rule: AlertRule) -> bool:
         """アラートルールを保存"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO alert_rules 
-                (id, name, description, conditions, severity, notification_channels, 
-                 cooldown_period, enabled, created_at, last_triggered)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                rule.id,
-                rule.name,
-                rule.description,
-                json.dumps([asdict(condition) for condition in rule.conditions]),
-                rule.severity.value,
-                json.dumps([channel.value for channel in rule.notification_channels]),
-                rule.cooldown_period,
-                rule.enabled,
-                rule.created_at.isoformat(),
-                rule.last_triggered.isoformat() if rule.last_triggered else None
-            ))
+            cursor.execute(self._RULE_UPSERT_SQL, self._rule_row(rule))
             
             conn.commit()
             conn.close()
@@ -507,7 +626,7 @@ class AlertDatabase:
     def load_alert_rules(self) -> List[AlertRule]:
         """アラートルールを読み込み"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute("SELECT * FROM alert_rules WHERE enabled = 1")
@@ -515,10 +634,9 @@ class AlertDatabase:
             
             rules = []
             for row in rows:
-                conditions_data = json.loads(row[3])
-                conditions = [AlertCondition(**condition) for condition in conditions_data]
+                conditions = [self._condition_from_dict(condition) for condition in _loads(row[3])]
                 
-                notification_channels = [NotificationChannel(channel) for channel in json.loads(row[5])]
+                notification_channels = [NotificationChannel(channel) for channel in _loads(row[5])]
                 
                 rule = AlertRule(
                     id=row[0],
@@ -544,27 +662,10 @@ class AlertDatabase:
     def save_alert_trigger(self, trigger: AlertTrigger) -> bool:
         """アラート発火を保存"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT INTO alert_triggers 
-                (id, rule_id, symbol, alert_type, condition, current_value, 
-                 threshold_value, severity, message, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trigger.id,
-                trigger.rule_id,
-                trigger.symbol,
-                trigger.alert_type.value,
-                trigger.condition,
-                trigger.current_value,
-                trigger.threshold_value,
-                trigger.severity.value,
-                trigger.message,
-                trigger.timestamp.isoformat(),
-                json.dumps(trigger.metadata)
-            ))
+            cursor.execute(self._TRIGGER_INSERT_SQL, self._trigger_row(trigger))
             
             conn.commit()
             conn.close()
@@ -576,11 +677,145 @@ class AlertDatabase:
             self.logger.error(f"アラート発火保存エラー: {e}")
             return False
     
+    @staticmethod
+    def _condition_from_dict(values: Dict[str, Any]) -> AlertCondition:
+        """保存済みの条件辞書から AlertCondition を復元"""
+        values = dict(values)
+        values['alert_type'] = AlertType(values['alert_type'])
+        for key in ('created_at', 'last_triggered'):
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        return AlertCondition(**values)
+
+    @staticmethod
+    def _rule_row(rule: AlertRule) -> Tuple[Any, ...]:
+        """アラートルールをINSERT用の行に変換"""
+        return (
+            rule.id,
+            rule.name,
+            rule.description,
+            _dumps([asdict(condition) for condition in rule.conditions]),
+            rule.severity.value,
+            _dumps([channel.value for channel in rule.notification_channels]),
+            rule.cooldown_period,
+            rule.enabled,
+            rule.created_at.isoformat(),
+            rule.last_triggered.isoformat() if rule.last_triggered else None
+        )
+
+    @staticmethod
+    def _trigger_row(trigger: AlertTrigger) -> Tuple[Any, ...]:
+        """アラート発火をINSERT用の行に変換"""
+        return (
+            trigger.id,
+            trigger.rule_id,
+            trigger.symbol,
+            trigger.alert_type.value,
+            trigger.condition,
+            trigger.current_value,
+            trigger.threshold_value,
+            trigger.severity.value,
+            trigger.message,
+            trigger.timestamp.isoformat(),
+            _dumps(trigger.metadata)
+        )
+
+    def save_batch(self, triggers: List[AlertTrigger], rules: List[AlertRule]) -> bool:
+        """アラート発火とルール更新を単一トランザクションでまとめて保存"""
+        trigger_rows = []
+        for trigger in triggers:
+            try:
+                trigger_rows.append(self._trigger_row(trigger))
+            except Exception as e:
+                self.logger.error(f"アラート発火シリアライズエラー {trigger.id}: {e}")
+
+        rule_rows = []
+        for rule in rules:
+            try:
+                rule_rows.append(self._rule_row(rule))
+            except Exception as e:
+                self.logger.error(f"アラートルールシリアライズエラー {rule.id}: {e}")
+
+        if not trigger_rows and not rule_rows:
+            return True
+
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    if trigger_rows:
+                        conn.executemany(self._TRIGGER_INSERT_SQL, trigger_rows)
+                    if rule_rows:
+                        conn.executemany(self._RULE_UPSERT_SQL, rule_rows)
+            finally:
+                conn.close()
+
+            self.logger.info(f"アラートを一括保存: 発火 {len(trigger_rows)}件, ルール {len(rule_rows)}件")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"アラート一括保存エラー: {e}")
+            return False
+
+    def delete_triggers_before(self, cutoff: datetime) -> int:
+        """指定時刻より古いアラート発火履歴を削除し、削除件数を返す"""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    # timestamp は ISO 形式の文字列なので文字列比較で時刻順になる
+                    cursor = conn.execute(
+                        "DELETE FROM alert_triggers WHERE timestamp < ?", (cutoff.isoformat(),)
+                    )
+                deleted = cursor.rowcount
+            finally:
+                conn.close()
+            
+            self.logger.info(f"古いアラート発火履歴を削除: {deleted}件")
+            return deleted
+            
+        except Exception as e:
+            self.logger.error(f"アラート発火履歴削除エラー: {e}")
+            return 0
+
+    def enable_wal(self) -> bool:
+        """WAL モードに切り替え (連続書き込み向け。設定はファイルに永続する)"""
+        if self.wal:
+            return True
+        try:
+            conn = self._connect()
+            try:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            finally:
+                conn.close()
+            self.wal = str(mode).lower() == 'wal'
+            return self.wal
+            
+        except Exception as e:
+            self.logger.error(f"WAL 設定エラー: {e}")
+            return False
+
+    def compact(self) -> bool:
+        """WAL の内容を本体に反映してログを切り詰める"""
+        if not self.wal:
+            return True
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"データベース圧縮エラー: {e}")
+            return False
+
     def get_alert_history(self, symbol: Optional[str] = None, 
                          limit: int = 100) -> List[AlertTrigger]:
         """アラート履歴を取得"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             if symbol:
@@ -612,7 +847,7 @@ class AlertDatabase:
                     severity=AlertSeverity(row[7]),
                     message=row[8],
                     timestamp=datetime.fromisoformat(row[9]),
-                    metadata=json.loads(row[10]) if row[10] else {}
+                    metadata=_loads(row[10]) if row[10] else {}
                 )
                 triggers.append(trigger)
             
@@ -623,13 +858,27 @@ class AlertDatabase:
             self.logger.error(f"アラート履歴取得エラー: {e}")
             return []
 
+# 生存中のアラートシステム (インスタンスごとに atexit へ登録せず、弱参照で1か所に集める)
+_LIVE_SYSTEMS: "weakref.WeakSet[AdvancedAlertSystem]" = weakref.WeakSet()
+
+def _flush_at_exit():
+    """終了時に各システムのキューに残っている書き込みを反映し WAL を切り詰める"""
+    for system in list(_LIVE_SYSTEMS):
+        try:
+            system.flush_pending_writes()
+            system.database.compact()
+        except Exception as e:
+            system.logger.error(f"終了時の書き込み反映エラー: {e}")
+
+atexit.register(_flush_at_exit)
+
 class AdvancedAlertSystem:
     """高度なアラートシステム"""
     
-    def __init__(self):
+    def __init__(self, database: Optional[AlertDatabase] = None):
         self.logger = logging.getLogger(__name__)
         self.notification_service = NotificationService()
-        self.database = AlertDatabase()
+        self.database = database or AlertDatabase()
         
         # アラートルール
         self.alert_rules: Dict[str, AlertRule] = {}
@@ -650,6 +899,36 @@ class AdvancedAlertSystem:
         self.snapshot_ttl = timedelta(seconds=30)
         self.snapshot_lock = threading.Lock()
 
+        # DB書き込みキュー (発火検知スレッドからSQLite書き込みを切り離す)
+        self._write_queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        # ライターは監視の有無に関係なく最初の書き込み時に起動する
+        self._db_writer_thread: Optional[threading.Thread] = None
+        self._db_writer_lock = threading.Lock()
+        self._db_writer_stop: Optional[threading.Event] = None
+        _LIVE_SYSTEMS.add(self)
+        self.write_batch_size = 100
+        # 最初の書き込みからこの秒数内に届いたものは同じトランザクションにまとめる
+        self.write_flush_interval = 0.5
+
+        # 価格アラート一括判定用の配列 (ルールの追加・削除で作り直す)
+        self._rules_version = 0
+        self._price_table: Optional[Dict[str, Any]] = None
+        self._price_table_key: Optional[Tuple[int, int, int]] = None
+
+        # 有効なルールID (状態取得で全ルールを走査しないよう追加・削除時に更新)
+        self._enabled_rule_ids: set = set()
+
+        # アラートタイプ -> 現在値算出関数 (data, history, time_window)
+        # PRICE_ABOVE / PRICE_BELOW は _evaluate_condition で直接評価し、未登録のタイプは _calculate_price
+        self._alert_dispatch: Dict[AlertType, Callable[[Dict[str, Any], List[Dict[str, Any]], int], Optional[float]]] = {
+            AlertType.PRICE_CHANGE_PERCENT: self._calculate_change_percent,
+            AlertType.VOLUME_SPIKE: self._calculate_volume_rate,
+            AlertType.VWAP_DEVIATION: self._calculate_vwap_deviation,
+            AlertType.VOLATILITY_SPIKE: lambda data, history, time_window: self._calculate_volatility(history, time_window),
+            AlertType.BID_ASK_SPREAD: self._calculate_bid_ask_spread,
+            AlertType.MOMENTUM_SHIFT: lambda data, history, time_window: self._calculate_momentum(history, time_window),
+        }
+
         # ルールを読み込み
         self._load_rules()
     
@@ -659,6 +938,7 @@ class AdvancedAlertSystem:
             rules = self.database.load_alert_rules()
             for rule in rules:
                 self.alert_rules[rule.id] = rule
+                self._track_enabled(rule)
             
             self.logger.info(f"アラートルールを読み込み: {len(rules)}件")
             
@@ -669,6 +949,8 @@ class AdvancedAlertSystem:
         """アラートルールを追加"""
         try:
             self.alert_rules[rule.id] = rule
+            self._rules_version += 1
+            self._track_enabled(rule)
             
             # データベースに保存
             success = self.database.save_alert_rule(rule)
@@ -679,6 +961,7 @@ class AdvancedAlertSystem:
             else:
                 # データベース保存に失敗した場合はメモリからも削除
                 del self.alert_rules[rule.id]
+                self._enabled_rule_ids.discard(rule.id)
                 return False
                 
         except Exception as e:
@@ -690,6 +973,8 @@ class AdvancedAlertSystem:
         try:
             if rule_id in self.alert_rules:
                 del self.alert_rules[rule_id]
+                self._rules_version += 1
+                self._enabled_rule_ids.discard(rule_id)
                 self.logger.info(f"アラートルールを削除: {rule_id}")
                 return True
             else:
@@ -700,6 +985,13 @@ class AdvancedAlertSystem:
             self.logger.error(f"アラートルール削除エラー: {e}")
             return False
     
+    def _track_enabled(self, rule: AlertRule):
+        """ルールの有効/無効を有効ルール数の集計に反映 (有効化の切り替えは add_alert_rule で再登録する)"""
+        if rule.enabled:
+            self._enabled_rule_ids.add(rule.id)
+        else:
+            self._enabled_rule_ids.discard(rule.id)
+    
     def update_data_source(self, symbol: str, data_source: Callable[[], Dict[str, Any]]):
         """データソースを更新"""
         self.data_sources[symbol] = data_source
@@ -709,14 +1001,14 @@ class AdvancedAlertSystem:
         try:
             ts = timestamp or datetime.now()
 
+            # 取り込み時に一度だけコピーし、以降は読み取り専用として最新値と履歴で共有
             enriched_snapshot = dict(snapshot)
             enriched_snapshot.setdefault('symbol', symbol)
             enriched_snapshot['timestamp'] = ts
 
             with self.snapshot_lock:
                 self.realtime_snapshots[symbol] = enriched_snapshot
-                history = self.realtime_history[symbol]
-                history.append(dict(enriched_snapshot))
+                self.realtime_history[symbol].append(enriched_snapshot)
 
         except Exception as e:
             self.logger.error(f"スナップショット更新エラー: {e}")
@@ -727,10 +1019,15 @@ class AdvancedAlertSystem:
             self.logger.warning("アラート監視は既に実行中です")
             return
         
+        # 監視中は発火ごとに書き込むため WAL に切り替える (停止時に compact でログを切り詰める)
+        self.database.enable_wal()
+
         self.is_running = True
         self.monitoring_thread = threading.Thread(target=self._monitoring_loop)
         self.monitoring_thread.daemon = True
         self.monitoring_thread.start()
+
+        self._ensure_db_writer()
         
         self.logger.info("アラート監視を開始")
     
@@ -739,13 +1036,88 @@ class AdvancedAlertSystem:
         self.is_running = False
         if self.monitoring_thread:
             self.monitoring_thread.join()
+        self._stop_db_writer()
+
+        # 残っている書き込みを反映
+        self.flush_pending_writes()
+        self.database.compact()
         
         self.logger.info("アラート監視を停止")
+
+    def _enqueue_write(self, kind: str, payload: Any):
+        """DB書き込みをキューに追加 (ライターが動いていなければ起動)"""
+        self._write_queue.put_nowait((kind, payload))
+        self._ensure_db_writer()
+
+    def _ensure_db_writer(self):
+        """バックグラウンドライターを起動 (既に動作中なら何もしない)"""
+        with self._db_writer_lock:
+            if self._db_writer_thread is not None and self._db_writer_thread.is_alive():
+                return
+            self._db_writer_stop = threading.Event()
+            self._db_writer_thread = threading.Thread(target=self._db_writer, args=(self._db_writer_stop,))
+            self._db_writer_thread.daemon = True
+            self._db_writer_thread.start()
+
+    def _stop_db_writer(self):
+        """バックグラウンドライターを停止"""
+        with self._db_writer_lock:
+            thread, stop = self._db_writer_thread, self._db_writer_stop
+            self._db_writer_thread = self._db_writer_stop = None
+            if thread is None:
+                return
+            stop.set()
+        thread.join()
+
+    def _db_writer(self, stop: threading.Event):
+        """DB書き込みキューをまとめて処理するバックグラウンドライター (stop がセットされるまで動作)"""
+        while not stop.is_set():
+            try:
+                item = self._write_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # 1チェック周期分の発火を1回の書き込みにまとめる
+            batch = [item]
+            deadline = time.monotonic() + self.write_flush_interval
+            while len(batch) < self.write_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._write_queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[str, Any]]):
+        """キューから取り出した書き込みを1トランザクションで保存"""
+        triggers = [payload for kind, payload in batch if kind == 'trigger']
+        # 同一ルールの更新は最後の状態のみ書き込めばよい
+        rules = list({payload.id: payload for kind, payload in batch if kind == 'rule'}.values())
+        self.database.save_batch(triggers, rules)
+
+    def flush_pending_writes(self):
+        """未処理のDB書き込みを同期的に反映"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if batch:
+            self._write_batch(batch)
     
     def _monitoring_loop(self):
         """監視ループ"""
         while self.is_running:
             try:
+                # 同じ銘柄を参照するルール間でデータ・履歴の取得を1チェック周期に1回にまとめる
+                symbol_cache: Dict[str, Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+                
                 for rule_id, rule in self.alert_rules.items():
                     if not rule.enabled:
                         continue
@@ -755,7 +1127,7 @@ class AdvancedAlertSystem:
                         continue
                     
                     # ルールの条件をチェック
-                    triggered = self._check_rule_conditions(rule)
+                    triggered = self._check_rule_conditions(rule, symbol_cache)
                     
                     if triggered:
                         self._trigger_alert(rule, triggered)
@@ -766,6 +1138,85 @@ class AdvancedAlertSystem:
                 self.logger.error(f"監視ループエラー: {e}")
                 time.sleep(5)
     
+    def _get_price_table(self) -> Dict[str, Any]:
+        """価格条件 (PRICE_ABOVE/PRICE_BELOW) を銘柄ID・閾値・演算子コードの並列配列にまとめる"""
+        key = (id(self.alert_rules), len(self.alert_rules), self._rules_version)
+        if self._price_table is not None and self._price_table_key == key:
+            return self._price_table
+
+        entries = [
+            (rule, condition)
+            for rule in self.alert_rules.values()
+            for condition in rule.conditions
+            if condition.alert_type in (AlertType.PRICE_ABOVE, AlertType.PRICE_BELOW)
+            and condition.comparison_operator in PRICE_OPERATOR_CODES
+        ]
+        symbols: Dict[str, int] = {}
+        for _, condition in entries:
+            symbols.setdefault(condition.symbol, len(symbols))
+
+        self._price_table = {
+            'entries': entries,
+            'symbols': symbols,
+            'symbol_ids': np.array([symbols[c.symbol] for _, c in entries], dtype=np.intp),
+            'thresholds': np.array([c.threshold_value for _, c in entries], dtype=np.float64),
+            'codes': np.array([PRICE_OPERATOR_CODES[c.comparison_operator] for _, c in entries], dtype=np.int8)
+        }
+        self._price_table_key = key
+        return self._price_table
+
+    def check_price_alerts_batch(self, prices: Dict[str, float], trigger: bool = True) -> List[Dict[str, Any]]:
+        """全銘柄の価格条件を配列演算で一括判定し、条件を満たしたルールを返す
+
+        価格以外の条件は対象外 (監視ループで評価される)。各ルールは最初に満たした条件で1回だけ
+        返され、trigger=True なら発火まで行う。条件をその場で書き換えた場合は add_alert_rule で
+        登録し直すこと。
+        """
+        try:
+            table = self._get_price_table()
+            entries = table['entries']
+            if not entries:
+                return []
+
+            current = np.full(len(table['symbols']), np.nan)
+            for symbol, symbol_id in table['symbols'].items():
+                price = prices.get(symbol)
+                if price is not None:
+                    current[symbol_id] = price
+
+            values = current[table['symbol_ids']]
+            hits = _scan_price_conditions(values, table['thresholds'], table['codes'])
+
+            # 条件を満たした行だけ Python 側でルールの状態を確認
+            results = []
+            matched_rules = set()
+            for i in np.flatnonzero(hits):
+                rule, condition = entries[i]
+                if rule.id in matched_rules or not rule.enabled or not condition.enabled:
+                    continue
+                if self._is_in_cooldown(rule):
+                    continue
+
+                current_value = float(values[i])
+                trigger_data = {
+                    'condition': condition,
+                    'data': {'price': current_value},
+                    'rule': rule,
+                    'current_value': current_value,
+                    'history': []
+                }
+                matched_rules.add(rule.id)
+                results.append(trigger_data)
+
+                if trigger:
+                    self._trigger_alert(rule, trigger_data)
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"価格アラート一括判定エラー: {e}")
+            return []
+
     def _is_in_cooldown(self, rule: AlertRule) -> bool:
         """クールダウン期間中かチェック"""
         if not rule.last_triggered:
@@ -774,20 +1225,23 @@ class AdvancedAlertSystem:
         cooldown_end = rule.last_triggered + timedelta(minutes=rule.cooldown_period)
         return datetime.now() < cooldown_end
     
-    def _check_rule_conditions(self, rule: AlertRule) -> Optional[Dict[str, Any]]:
-        """ルールの条件をチェック"""
+    def _check_rule_conditions(
+        self,
+        rule: AlertRule,
+        symbol_cache: Optional[Dict[str, Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """ルールの条件をチェック (symbol_cache を渡すと銘柄データを呼び出し間で共有)"""
         try:
             for condition in rule.conditions:
                 if not condition.enabled:
                     continue
                 
                 # データを取得
-                data = self._get_symbol_data(condition.symbol)
+                data, history = self._get_symbol_state(condition.symbol, symbol_cache)
                 if not data:
                     continue
 
                 # 条件をチェック
-                history = self._get_symbol_history(condition.symbol)
                 evaluated_value = self._evaluate_condition(condition, data, history)
                 if evaluated_value is not None:
                     return {
@@ -804,8 +1258,24 @@ class AdvancedAlertSystem:
             self.logger.error(f"条件チェックエラー: {e}")
             return None
     
+    def _get_symbol_state(
+        self,
+        symbol: str,
+        symbol_cache: Optional[Dict[str, Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """銘柄の現在データと履歴を取得 (キャッシュ済みの銘柄は再取得しない)"""
+        if symbol_cache is not None and symbol in symbol_cache:
+            return symbol_cache[symbol]
+        
+        data = self._get_symbol_data(symbol)
+        history = self._get_symbol_history(symbol) if data else []
+        
+        if symbol_cache is not None:
+            symbol_cache[symbol] = (data, history)
+        return data, history
+    
     def _get_symbol_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """銘柄データを取得"""
+        """銘柄データを取得 (スナップショットは内部で読み取り専用として共有し、コピーせず返す)"""
         try:
             with self.snapshot_lock:
                 snapshot = self.realtime_snapshots.get(symbol)
@@ -814,7 +1284,7 @@ class AdvancedAlertSystem:
                     if not isinstance(snapshot_ts, datetime):
                         snapshot_ts = datetime.now()
                     if datetime.now() - snapshot_ts <= self.snapshot_ttl:
-                        return dict(snapshot)
+                        return snapshot
 
             if symbol in self.data_sources:
                 return self.data_sources[symbol]()
@@ -822,20 +1292,23 @@ class AdvancedAlertSystem:
                 # デフォルトのデータ取得
                 import yfinance as yf
                 ticker = yf.Ticker(symbol)
-                info = ticker.info
                 hist = ticker.history(period="1d", interval="1m")
                 
                 if hist.empty:
                     return None
                 
+                # 列ごとに .iloc[-1] を繰り返さず、ndarray の末尾を Python のスカラーで取り出す
+                price = float(hist['Close'].to_numpy()[-1])
+                open_price = float(hist['Open'].to_numpy()[-1])
+                change = price - open_price
                 return {
-                    'price': hist['Close'].iloc[-1],
-                    'volume': hist['Volume'].iloc[-1] if 'Volume' in hist.columns else 0,
-                    'high': hist['High'].iloc[-1],
-                    'low': hist['Low'].iloc[-1],
-                    'open': hist['Open'].iloc[-1],
-                    'change': hist['Close'].iloc[-1] - hist['Open'].iloc[-1],
-                    'change_percent': ((hist['Close'].iloc[-1] - hist['Open'].iloc[-1]) / hist['Open'].iloc[-1]) * 100
+                    'price': price,
+                    'volume': float(hist['Volume'].to_numpy()[-1]) if 'Volume' in hist.columns else 0,
+                    'high': float(hist['High'].to_numpy()[-1]),
+                    'low': float(hist['Low'].to_numpy()[-1]),
+                    'open': open_price,
+                    'change': change,
+                    'change_percent': (change / open_price) * 100 if open_price else 0.0
                 }
                 
         except Exception as e:
@@ -859,55 +1332,57 @@ class AdvancedAlertSystem:
         """条件を評価し、閾値を満たした場合は現在値を返す"""
         try:
             alert_type = condition.alert_type
-            current_value: Optional[float] = None
-
-            if alert_type in {AlertType.PRICE_ABOVE, AlertType.PRICE_BELOW}:
+            if alert_type is AlertType.PRICE_ABOVE or alert_type is AlertType.PRICE_BELOW:
+                # 最も多い価格アラートは算出関数を経由せず直接評価
                 current_value = float(data.get('price', 0))
-            elif alert_type == AlertType.PRICE_CHANGE_PERCENT:
-                current_value = float(data.get('change_percent', 0))
-            elif alert_type == AlertType.VOLUME_SPIKE:
-                current_value = self._calculate_volume_rate(data, history, condition.time_window)
-            elif alert_type == AlertType.VWAP_DEVIATION:
-                current_value = self._calculate_vwap_deviation(data, history, condition.time_window)
-            elif alert_type == AlertType.VOLATILITY_SPIKE:
-                current_value = self._calculate_volatility(history, condition.time_window)
-            elif alert_type == AlertType.BID_ASK_SPREAD:
-                bid = data.get('bid')
-                ask = data.get('ask')
-                if bid and ask and bid > 0:
-                    current_value = ((ask - bid) / bid) * 100
-            elif alert_type == AlertType.MOMENTUM_SHIFT:
-                current_value = self._calculate_momentum(history, condition.time_window)
             else:
-                current_value = float(data.get('price', 0))
+                calculate = self._alert_dispatch.get(alert_type, self._calculate_price)
+                current_value = calculate(data, history, condition.time_window)
 
             if current_value is None:
                 return None
 
-            operator = condition.comparison_operator
-            threshold = condition.threshold_value
-
-            if operator == '>':
-                matched = current_value > threshold
-            elif operator == '<':
-                matched = current_value < threshold
-            elif operator == '>=':
-                matched = current_value >= threshold
-            elif operator == '<=':
-                matched = current_value <= threshold
-            elif operator == '==':
-                matched = abs(current_value - threshold) < 1e-6
-            elif operator == '!=':
-                matched = abs(current_value - threshold) >= 1e-6
-            else:
-                matched = False
+            compare = COMPARISON_OPERATORS.get(condition.comparison_operator)
+            if compare is None:
+                return None
 
-            return current_value if matched else None
+            return current_value if compare(current_value, condition.threshold_value) else None
 
         except Exception as e:
             self.logger.error(f"条件評価エラー: {e}")
             return None
 
+    def _calculate_price(
+        self,
+        data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        time_window: int
+    ) -> Optional[float]:
+        """現在価格を取得"""
+        return float(data.get('price', 0))
+
+    def _calculate_change_percent(
+        self,
+        data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        time_window: int
+    ) -> Optional[float]:
+        """前日比 (パーセント) を取得"""
+        return float(data.get('change_percent', 0))
+
+    def _calculate_bid_ask_spread(
+        self,
+        data: Dict[str, Any],
+        history: List[Dict[str, Any]],
+        time_window: int
+    ) -> Optional[float]:
+        """気配値スプレッド (パーセント) を計算"""
+        bid = data.get('bid')
+        ask = data.get('ask')
+        if bid and ask and bid > 0:
+            return ((ask - bid) / bid) * 100
+        return None
+
     def _filter_history(self, history: List[Dict[str, Any]], minutes: int) -> List[Dict[str, Any]]:
         """指定時間内の履歴を抽出"""
         if not history:
@@ -938,12 +1413,21 @@ class AdvancedAlertSystem:
         if not time_window or time_window <= 0:
             return float(current_volume)
 
-        window = self._filter_history(history, time_window)
-        volumes = [entry.get('volume') for entry in window if entry.get('volume') is not None]
-        if len(volumes) < 2:
+        # 最新の出来高を除いた平均を1パスで算出
+        total = 0.0
+        count = 0
+        last_volume = 0.0
+        for entry in self._filter_history(history, time_window):
+            volume = entry.get('volume')
+            if volume is not None:
+                total += volume
+                count += 1
+                last_volume = volume
+
+        if count < 2:
             return float(current_volume)
 
-        baseline = sum(volumes[:-1]) / max(len(volumes) - 1, 1)
+        baseline = (total - last_volume) / (count - 1)
         if baseline <= 0:
             return float(current_volume)
 
@@ -994,10 +1478,7 @@ class AdvancedAlertSystem:
         if len(prices) < 2:
             return None
 
-        returns = []
-        for prev, curr in zip(prices[:-1], prices[1:]):
-            if prev and prev != 0:
-                returns.append((curr - prev) / prev * 100)
+        returns = [(curr - prev) / prev * 100 for prev, curr in zip(prices, prices[1:]) if prev]
 
         if len(returns) < 2:
             return None
@@ -1035,7 +1516,8 @@ class AdvancedAlertSystem:
             current_value = trigger_data.get('current_value', data.get('price', 0))
             
             # アラート発火を作成
-            trigger_id = f"{rule.id}_{condition.symbol}_{int(time.time())}"
+            # 同じ DB を共有する他プロセスや再起動前の ID とも衝突しないようランダムな接尾辞を付ける
+            trigger_id = f"{rule.id}_{condition.symbol}_{uuid.uuid4().hex[:12]}"
             
             trigger = AlertTrigger(
                 id=trigger_id,
@@ -1046,18 +1528,19 @@ class AdvancedAlertSystem:
                 current_value=current_value,
                 threshold_value=condition.threshold_value,
                 severity=rule.severity,
-                message=f"{condition.symbol} で {condition.condition} 条件が満たされました (現在値: {round(current_value, 4)})",
+                message=f"{condition.symbol} で {condition.condition} 条件が満たされました (現在値: {current_value:.4f})",
                 timestamp=datetime.now(),
                 metadata={
                     'rule_name': rule.name,
-                    'data': data,
+                    # 共有スナップショットをコールバック・通知先に渡さないよう、外部へ出す時点でコピー
+                    'data': dict(data),
                     'current_value': current_value,
                     'history_size': len(trigger_data.get('history', []))
                 }
             )
             
-            # データベースに保存
-            self.database.save_alert_trigger(trigger)
+            # データベース書き込みキューに追加
+            self._enqueue_write('trigger', trigger)
             
             # ルールの最終発火時刻を更新
             rule.last_triggered = datetime.now()
@@ -1065,7 +1548,7 @@ class AdvancedAlertSystem:
             condition.trigger_count += 1
             
             # データベースを更新
-            self.database.save_alert_rule(rule)
+            self._enqueue_write('rule', rule)
             
             # 通知を送信
             asyncio.create_task(self._send_notifications(trigger))
@@ -1111,14 +1594,20 @@ class AdvancedAlertSystem:
     
     def get_alert_history(self, symbol: Optional[str] = None, limit: int = 100) -> List[AlertTrigger]:
         """アラート履歴を取得"""
+        self.flush_pending_writes()
         return self.database.get_alert_history(symbol, limit)
     
+    def cleanup_old_alerts(self, days: int = 30) -> int:
+        """保存期間を過ぎたアラート発火履歴を削除し、削除件数を返す"""
+        self.flush_pending_writes()
+        return self.database.delete_triggers_before(datetime.now() - timedelta(days=days))
+    
     def get_system_status(self) -> Dict[str, Any]:
         """システム状態を取得"""
         return {
             'is_running': self.is_running,
             'total_rules': len(self.alert_rules),
-            'enabled_rules': len([r for r in self.alert_rules.values() if r.enabled]),
+            'enabled_rules': len(self._enabled_rule_ids),
             'data_sources': len(self.data_sources),
             'callbacks': len(self.alert_callbacks)
         }
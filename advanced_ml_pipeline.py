@@ -6,39 +6,50 @@ Advanced Machine Learning Pipeline for Stock Analysis
 import pandas as pd
 import numpy as np
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import joblib
+from joblib import Parallel, delayed
+import copy
+import hashlib
 import json
 import os
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 import warnings
 warnings.filterwarnings('ignore')
 
+# Intel Extension for Scikit-learn (optional, sklearn import 前にパッチを適用)
+SKLEARNEX_ENABLED = False
+if os.getenv('STOCK_ANALYSIS_USE_SKLEARNEX') == '1':
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn()
+        SKLEARNEX_ENABLED = True
+    except ImportError:
+        logging.warning("scikit-learn-intelex not available. Using stock scikit-learn.")
+
 # Machine Learning Libraries
 from sklearn.ensemble import (
     RandomForestRegressor, GradientBoostingRegressor, 
-    VotingRegressor, AdaBoostRegressor, ExtraTreesRegressor
+    VotingRegressor, AdaBoostRegressor, ExtraTreesRegressor,
+    HistGradientBoostingRegressor
 )
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 from sklearn.svm import SVR
-from sklearn.neural_network import MLPRegressor
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
-from sklearn.model_selection import (
-    train_test_split, cross_val_score, GridSearchCV, 
-    TimeSeriesSplit, validation_curve
-)
+from sklearn.preprocessing import RobustScaler
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, TimeSeriesSplit
 from sklearn.metrics import (
     mean_squared_error, mean_absolute_error, r2_score,
     mean_absolute_percentage_error
 )
-from sklearn.feature_selection import (
-    SelectKBest, SelectFromModel, RFE, mutual_info_regression
-)
+from sklearn.feature_selection import SelectKBest, VarianceThreshold, f_regression
 from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.impute import SimpleImputer
 
 # Deep Learning Libraries (optional)
 try:
@@ -52,8 +63,35 @@ except ImportError:
     TENSORFLOW_AVAILABLE = False
     logging.warning("TensorFlow not available. Deep learning features disabled.")
 
+# JIT Compilation (optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Moving-window kernels (optional)
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Fast model compression (optional, used by joblib)
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
 # Time Series Libraries
-from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.tsa.arima.model import ARIMA
 import ta  # Technical Analysis library
@@ -63,6 +101,154 @@ from scipy import stats
 from scipy.signal import find_peaks
 import talib
 
+# 信頼区間の z 値 (信頼水準 → 標準正規分布の両側分位点)
+_Z = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
+def _as_float_array(values: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """TA-Lib に渡せる連続した float64 配列へ変換"""
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+@lru_cache(maxsize=32)
+def _slope_weights(window: int) -> np.ndarray:
+    """x = 0..window-1 の最小二乗傾きを与える重み (pinv([x, 1]) の傾き行)"""
+    x = np.arange(window, dtype=np.float64)
+    centered = x - x.mean()
+    return centered / centered.dot(centered)
+
+def _rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """ローリング線形回帰の傾き (x は全ウィンドウ共通なので重み付き和の畳み込みになる)"""
+    n = values.shape[0]
+    result = np.full(n, np.nan)
+    if window < 2 or n < window:
+        return result
+
+    # NaN を含む窓は畳み込みで NaN になる (rolling と同じ扱い)
+    result[window - 1:] = np.convolve(values, _slope_weights(window)[::-1], mode='valid')
+    return result
+
+def _rolling_skew_kurt(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Σx〜Σx⁴ のスライディング和からローリング歪度・尖度を計算 (pandas と同じ不偏補正)"""
+    n = values.shape[0]
+    skew = np.full(n, np.nan)
+    kurt = np.full(n, np.nan)
+    if n < window:
+        return skew, kurt
+
+    nobs = float(window)
+    shift = 0.0
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    nan_count = 0
+    for i in range(window - 1, n):
+        start = i - window + 1
+        if (i - window + 1) % window == 0:
+            # 桁落ちと累積誤差を抑えるため、window ごとに窓平均を原点として和を再計算
+            nan_count = 0
+            total = 0.0
+            for j in range(start, i + 1):
+                if np.isnan(values[j]):
+                    nan_count += 1
+                else:
+                    total += values[j]
+            shift = total / max(window - nan_count, 1)
+            s1 = 0.0
+            s2 = 0.0
+            s3 = 0.0
+            s4 = 0.0
+            for j in range(start, i + 1):
+                y = values[j]
+                if not np.isnan(y):
+                    y -= shift
+                    y2 = y * y
+                    s1 += y
+                    s2 += y2
+                    s3 += y2 * y
+                    s4 += y2 * y2
+        else:
+            y = values[i]
+            if np.isnan(y):
+                nan_count += 1
+            else:
+                y -= shift
+                y2 = y * y
+                s1 += y
+                s2 += y2
+                s3 += y2 * y
+                s4 += y2 * y2
+            y = values[start - 1]
+            if np.isnan(y):
+                nan_count -= 1
+            else:
+                y -= shift
+                y2 = y * y
+                s1 -= y
+                s2 -= y2
+                s3 -= y2 * y
+                s4 -= y2 * y2
+
+        if nan_count > 0:
+            continue
+
+        a = s1 / nobs
+        b = s2 / nobs - a * a
+        if b <= 1e-14:
+            # 定数窓は pandas と同じく歪度 0 / 尖度 -3
+            if window >= 3:
+                skew[i] = 0.0
+            if window >= 4:
+                kurt[i] = -3.0
+            continue
+        c = s3 / nobs - a * a * a - 3 * a * b
+        d = s4 / nobs - a * a * a * a - 6 * b * a * a - 4 * c * a
+
+        if window >= 3:
+            skew[i] = np.sqrt(nobs * (nobs - 1)) * c / ((nobs - 2) * b ** 1.5)
+        if window >= 4:
+            k = (nobs * nobs - 1) * d / (b * b) - 3 * (nobs - 1) ** 2
+            kurt[i] = k / ((nobs - 2) * (nobs - 3))
+
+    return skew, kurt
+
+if NUMBA_AVAILABLE:
+    _rolling_skew_kurt = njit(cache=True)(_rolling_skew_kurt)
+
+def _additive_decompose(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """移動平均トレンドと位相平均の季節成分による加法分解 (トレンドは過去データのみ使用)"""
+    n = values.shape[0]
+    if BOTTLENECK_AVAILABLE:
+        trend = bn.move_mean(values, period, min_count=period)
+    else:
+        trend = pd.Series(values).rolling(window=period).mean().to_numpy()
+    
+    detrended = values - trend
+    valid = ~np.isnan(detrended)
+    
+    # 位相ごとの平均を bincount で集計し、1周期で和が0になるよう中心化
+    phase = np.arange(n) % period
+    sums = np.bincount(phase[valid], weights=detrended[valid], minlength=period)
+    counts = np.bincount(phase[valid], minlength=period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        period_means = sums / counts
+    period_means -= np.nanmean(period_means)
+    
+    seasonal = period_means[phase]
+    residual = detrended - seasonal
+    return trend, seasonal, residual
+
+def _append_columns(data: pd.DataFrame, new_columns: Dict[str, Any]) -> pd.DataFrame:
+    """新しい列をまとめて1回の concat で追加 (同名の既存列は置き換え)"""
+    new_frame = pd.DataFrame(
+        {name: values.to_numpy() if isinstance(values, pd.Series) else values
+         for name, values in new_columns.items()},
+        index=data.index
+    )
+    existing = data.drop(columns=[name for name in new_columns if name in data.columns])
+    return pd.concat([existing, new_frame], axis=1)
+
 @dataclass
 class ModelPerformance:
     """モデル性能メトリクス"""
@@ -76,6 +262,7 @@ class ModelPerformance:
     prediction_time: float
     cross_val_score: float
     feature_importance: Dict[str, float]
+    residual_std: Optional[float] = None  # ホールドアウト残差の標準偏差
 
 @dataclass
 class PredictionResult:
@@ -91,74 +278,123 @@ class PredictionResult:
 class FeatureEngineer:
     """自動特徴量エンジニアリングクラス"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 64):
         self.logger = logging.getLogger(__name__)
-        self.feature_cache = {}
+        # (特徴量種別, 入力データのハッシュ) -> 生成済み特徴量 (LRU)
+        self.feature_cache: "OrderedDict[Tuple[str, str], pd.DataFrame]" = OrderedDict()
+        self.cache_size = cache_size
+    
+    def _feature_cache_key(self, kind: str, data: pd.DataFrame) -> Tuple[str, str]:
+        """入力データの内容からキャッシュキーを生成"""
+        digest = hashlib.md5(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        digest.update('\0'.join(map(str, data.columns)).encode())
+        return kind, digest.hexdigest()
+    
+    def _get_cached_features(self, key: Tuple[str, str]) -> Optional[pd.DataFrame]:
+        """キャッシュ済みの特徴量を取得"""
+        cached = self.feature_cache.get(key)
+        if cached is None:
+            return None
+        self.feature_cache.move_to_end(key)
+        return cached.copy()
+    
+    def _store_cached_features(self, key: Tuple[str, str], features: pd.DataFrame):
+        """特徴量をキャッシュに保存 (上限を超えたら最も古いものを削除)"""
+        self.feature_cache[key] = features.copy()
+        self.feature_cache.move_to_end(key)
+        while len(self.feature_cache) > self.cache_size:
+            self.feature_cache.popitem(last=False)
         
     def generate_technical_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """テクニカル指標の自動生成"""
         try:
-            features = data.copy()
+            cache_key = self._feature_cache_key('technical', data)
+            cached = self._get_cached_features(cache_key)
+            if cached is not None:
+                return cached
+            
+            # 新しい列は辞書に集め、最後に1回だけ結合する
+            new_cols: Dict[str, Any] = {}
+            n = len(data)
+            close_series = data['Close']
+            close = _as_float_array(close_series)
             
             # 基本的な価格特徴量
-            features['price_change'] = features['Close'].pct_change()
-            features['price_change_abs'] = features['price_change'].abs()
-            features['high_low_ratio'] = features['High'] / features['Low']
-            features['close_open_ratio'] = features['Close'] / features['Open']
+            price_change = close_series.pct_change()
+            new_cols['price_change'] = price_change
+            new_cols['price_change_abs'] = price_change.abs()
+            new_cols['high_low_ratio'] = data['High'] / data['Low']
+            new_cols['close_open_ratio'] = close_series / data['Open']
+            
+            # 終値EMAを一度だけ計算し、EMA列とMACDで共有
+            ema_windows = [5, 10, 20, 50, 100, 200]
+            ema_cache = {
+                span: talib.EMA(close, timeperiod=span)
+                for span in sorted(set(ema_windows) | {12, 26})
+                if n >= span
+            }
             
             # 移動平均
-            for window in [5, 10, 20, 50, 100, 200]:
-                if len(features) >= window:
-                    features[f'sma_{window}'] = features['Close'].rolling(window=window).mean()
-                    features[f'ema_{window}'] = features['Close'].ewm(span=window).mean()
-                    features[f'price_sma_ratio_{window}'] = features['Close'] / features[f'sma_{window}']
-                    features[f'price_ema_ratio_{window}'] = features['Close'] / features[f'ema_{window}']
+            for window in ema_windows:
+                if n >= window:
+                    sma = talib.SMA(close, timeperiod=window)
+                    ema = ema_cache[window]
+                    new_cols[f'sma_{window}'] = sma
+                    new_cols[f'ema_{window}'] = ema
+                    new_cols[f'price_sma_ratio_{window}'] = close / sma
+                    new_cols[f'price_ema_ratio_{window}'] = close / ema
             
             # ボラティリティ指標
-            features['volatility_5'] = features['Close'].rolling(window=5).std()
-            features['volatility_20'] = features['Close'].rolling(window=20).std()
-            features['volatility_ratio'] = features['volatility_5'] / features['volatility_20']
+            volatility_5 = close_series.rolling(window=5).std()
+            volatility_20 = close_series.rolling(window=20).std()
+            new_cols['volatility_5'] = volatility_5
+            new_cols['volatility_20'] = volatility_20
+            new_cols['volatility_ratio'] = volatility_5 / volatility_20
             
             # RSI
-            if len(features) >= 14:
-                features['rsi'] = self._calculate_rsi(features['Close'])
-                features['rsi_oversold'] = (features['rsi'] < 30).astype(int)
-                features['rsi_overbought'] = (features['rsi'] > 70).astype(int)
+            if n >= 14:
+                rsi = self._calculate_rsi(close_series)
+                new_cols['rsi'] = rsi
+                new_cols['rsi_oversold'] = (rsi < 30).astype(int)
+                new_cols['rsi_overbought'] = (rsi > 70).astype(int)
             
             # MACD
-            if len(features) >= 26:
-                features['macd'], features['macd_signal'], features['macd_hist'] = self._calculate_macd(features['Close'])
+            if n >= 26:
+                new_cols['macd'], new_cols['macd_signal'], new_cols['macd_hist'] = self._calculate_macd(close_series, ema_cache=ema_cache)
             
             # ボリンジャーバンド
-            if len(features) >= 20:
-                bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(features['Close'])
-                features['bb_upper'] = bb_upper
-                features['bb_middle'] = bb_middle
-                features['bb_lower'] = bb_lower
-                features['bb_width'] = (bb_upper - bb_lower) / bb_middle
-                features['bb_position'] = (features['Close'] - bb_lower) / (bb_upper - bb_lower)
+            if n >= 20:
+                bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(close_series)
+                new_cols['bb_upper'] = bb_upper
+                new_cols['bb_middle'] = bb_middle
+                new_cols['bb_lower'] = bb_lower
+                new_cols['bb_width'] = (bb_upper - bb_lower) / bb_middle
+                new_cols['bb_position'] = (close_series - bb_lower) / (bb_upper - bb_lower)
             
             # ストキャスティクス
-            if len(features) >= 14:
-                features['stoch_k'], features['stoch_d'] = self._calculate_stochastic(features)
+            if n >= 14:
+                new_cols['stoch_k'], new_cols['stoch_d'] = self._calculate_stochastic(data)
             
             # 出来高指標
-            features['volume_sma_20'] = features['Volume'].rolling(window=20).mean()
-            features['volume_ratio'] = features['Volume'] / features['volume_sma_20']
-            features['price_volume_trend'] = (features['Close'].pct_change() * features['Volume']).cumsum()
+            volume_sma_20 = data['Volume'].rolling(window=20).mean()
+            new_cols['volume_sma_20'] = volume_sma_20
+            new_cols['volume_ratio'] = data['Volume'] / volume_sma_20
+            new_cols['price_volume_trend'] = (price_change * data['Volume']).cumsum()
             
-            # 価格パターン
-            features['doji'] = (abs(features['Open'] - features['Close']) < 
-                              (features['High'] - features['Low']) * 0.1).astype(int)
-            features['hammer'] = self._detect_hammer_pattern(features)
-            features['shooting_star'] = self._detect_shooting_star_pattern(features)
+            # 価格パターン (TA-Lib の ±100 出力を 0/1 フラグに変換)
+            open_, high, low = (_as_float_array(data[column]) for column in ('Open', 'High', 'Low'))
+            new_cols['doji'] = (talib.CDLDOJI(open_, high, low, close) != 0).astype(np.uint8)
+            new_cols['hammer'] = (talib.CDLHAMMER(open_, high, low, close) != 0).astype(np.uint8)
+            new_cols['shooting_star'] = (talib.CDLSHOOTINGSTAR(open_, high, low, close) != 0).astype(np.uint8)
             
             # トレンド強度
-            features['trend_strength'] = self._calculate_trend_strength(features['Close'])
+            new_cols['trend_strength'] = self._calculate_trend_strength(close_series)
             
             # サポート・レジスタンス
-            features['support_resistance'] = self._calculate_support_resistance(features)
+            new_cols['support_resistance'] = self._calculate_support_resistance(data)
             
+            features = _append_columns(data, new_cols)
+            self._store_cached_features(cache_key, features)
             return features
             
         except Exception as e:
@@ -197,48 +433,72 @@ class FeatureEngineer:
     def generate_time_series_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """時系列特徴量の生成"""
         try:
-            features = data.copy()
+            cache_key = self._feature_cache_key('time_series', data)
+            cached = self._get_cached_features(cache_key)
+            if cached is not None:
+                return cached
+            
+            new_cols: Dict[str, Any] = {}
+            n = len(data)
             
             # 時間特徴量
-            if isinstance(features.index, pd.DatetimeIndex):
-                features['day_of_week'] = features.index.dayofweek
-                features['month'] = features.index.month
-                features['quarter'] = features.index.quarter
-                features['year'] = features.index.year
-                features['is_month_end'] = features.index.is_month_end.astype(int)
-                features['is_quarter_end'] = features.index.is_quarter_end.astype(int)
-                features['is_year_end'] = features.index.is_year_end.astype(int)
-            
-            # ラグ特徴量
-            for lag in [1, 2, 3, 5, 10]:
-                features[f'close_lag_{lag}'] = features['Close'].shift(lag)
-                features[f'volume_lag_{lag}'] = features['Volume'].shift(lag)
-                features[f'price_change_lag_{lag}'] = features['price_change'].shift(lag)
+            if isinstance(data.index, pd.DatetimeIndex):
+                new_cols['day_of_week'] = data.index.dayofweek
+                new_cols['month'] = data.index.month
+                new_cols['quarter'] = data.index.quarter
+                new_cols['year'] = data.index.year
+                new_cols['is_month_end'] = data.index.is_month_end.astype(int)
+                new_cols['is_quarter_end'] = data.index.is_quarter_end.astype(int)
+                new_cols['is_year_end'] = data.index.is_year_end.astype(int)
+            
+            # ラグ特徴量 (1つの行列に全ラグを書き込む)
+            lags = [1, 2, 3, 5, 10]
+            lag_sources = ['Close', 'Volume', 'price_change']
+            lag_prefixes = ['close', 'volume', 'price_change']
+            width = len(lag_sources)
+            source = data[lag_sources].to_numpy(dtype=np.float64)
+            lag_matrix = np.full((n, width * len(lags)), np.nan)
+            for k, lag in enumerate(lags):
+                if lag < n:
+                    lag_matrix[lag:, k * width:(k + 1) * width] = source[:-lag]
+                for j, prefix in enumerate(lag_prefixes):
+                    new_cols[f'{prefix}_lag_{lag}'] = lag_matrix[:, k * width + j]
             
             # ローリング統計
+            close = _as_float_array(data['Close'])
             for window in [5, 10, 20]:
-                features[f'close_rolling_mean_{window}'] = features['Close'].rolling(window).mean()
-                features[f'close_rolling_std_{window}'] = features['Close'].rolling(window).std()
-                features[f'close_rolling_min_{window}'] = features['Close'].rolling(window).min()
-                features[f'close_rolling_max_{window}'] = features['Close'].rolling(window).max()
-                features[f'close_rolling_skew_{window}'] = features['Close'].rolling(window).skew()
-                features[f'close_rolling_kurt_{window}'] = features['Close'].rolling(window).kurt()
+                if BOTTLENECK_AVAILABLE:
+                    new_cols[f'close_rolling_mean_{window}'] = bn.move_mean(close, window, min_count=window)
+                    new_cols[f'close_rolling_std_{window}'] = bn.move_std(close, window, min_count=window, ddof=1)
+                    new_cols[f'close_rolling_min_{window}'] = bn.move_min(close, window, min_count=window)
+                    new_cols[f'close_rolling_max_{window}'] = bn.move_max(close, window, min_count=window)
+                else:
+                    rolling = data['Close'].rolling(window)
+                    new_cols[f'close_rolling_mean_{window}'] = rolling.mean()
+                    new_cols[f'close_rolling_std_{window}'] = rolling.std()
+                    new_cols[f'close_rolling_min_{window}'] = rolling.min()
+                    new_cols[f'close_rolling_max_{window}'] = rolling.max()
+                skew, kurt = _rolling_skew_kurt(close, window)
+                new_cols[f'close_rolling_skew_{window}'] = skew
+                new_cols[f'close_rolling_kurt_{window}'] = kurt
             
             # 差分特徴量
-            features['close_diff_1'] = features['Close'].diff(1)
-            features['close_diff_5'] = features['Close'].diff(5)
-            features['volume_diff_1'] = features['Volume'].diff(1)
+            new_cols['close_diff_1'] = data['Close'].diff(1)
+            new_cols['close_diff_5'] = data['Close'].diff(5)
+            new_cols['volume_diff_1'] = data['Volume'].diff(1)
             
             # 季節性分解
-            if len(features) >= 50:
+            if n >= 50:
                 try:
-                    decomposition = seasonal_decompose(features['Close'].dropna(), model='additive', period=20)
-                    features['seasonal'] = decomposition.seasonal
-                    features['trend'] = decomposition.trend
-                    features['residual'] = decomposition.resid
+                    trend, seasonal, residual = _additive_decompose(close, 20)
+                    new_cols['seasonal'] = seasonal
+                    new_cols['trend'] = trend
+                    new_cols['residual'] = residual
                 except:
                     pass
             
+            features = _append_columns(data, new_cols)
+            self._store_cached_features(cache_key, features)
             return features
             
         except Exception as e:
@@ -248,24 +508,32 @@ class FeatureEngineer:
     def generate_market_microstructure_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """市場マイクロストラクチャ特徴量の生成"""
         try:
-            features = data.copy()
+            cache_key = self._feature_cache_key('microstructure', data)
+            cached = self._get_cached_features(cache_key)
+            if cached is not None:
+                return cached
+            
+            new_cols: Dict[str, Any] = {}
             
             # スプレッド関連
-            features['bid_ask_spread'] = features['High'] - features['Low']
-            features['spread_ratio'] = features['bid_ask_spread'] / features['Close']
+            bid_ask_spread = data['High'] - data['Low']
+            new_cols['bid_ask_spread'] = bid_ask_spread
+            new_cols['spread_ratio'] = bid_ask_spread / data['Close']
             
             # 価格インパクト
-            features['price_impact'] = features['Close'].pct_change() / features['Volume'].pct_change()
+            new_cols['price_impact'] = data['Close'].pct_change() / data['Volume'].pct_change()
             
             # 流動性指標
-            features['liquidity_ratio'] = features['Volume'] / features['bid_ask_spread']
+            new_cols['liquidity_ratio'] = data['Volume'] / bid_ask_spread
             
             # 価格効率性
-            features['price_efficiency'] = self._calculate_price_efficiency(features)
+            new_cols['price_efficiency'] = self._calculate_price_efficiency(data)
             
             # ボラティリティクラスタリング
-            features['volatility_clustering'] = self._calculate_volatility_clustering(features)
+            new_cols['volatility_clustering'] = self._calculate_volatility_clustering(data)
             
+            features = _append_columns(data, new_cols)
+            self._store_cached_features(cache_key, features)
             return features
             
         except Exception as e:
@@ -274,86 +542,71 @@ class FeatureEngineer:
     
     def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """RSI計算"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
-        """MACD計算"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
+        rsi = talib.RSI(_as_float_array(prices), timeperiod=window)
+        return pd.Series(rsi, index=prices.index)
+    
+    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9,
+                        ema_cache: Optional[Dict[int, np.ndarray]] = None) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """MACD計算 (ema_cache に計算済みの終値EMAがあれば再利用)"""
+        ema_cache = ema_cache or {}
+        close = None
+        if fast not in ema_cache or slow not in ema_cache:
+            close = _as_float_array(prices)
+        ema_fast = ema_cache[fast] if fast in ema_cache else talib.EMA(close, timeperiod=fast)
+        ema_slow = ema_cache[slow] if slow in ema_cache else talib.EMA(close, timeperiod=slow)
         macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
+        macd_signal = talib.EMA(macd, timeperiod=signal)
         macd_hist = macd - macd_signal
-        return macd, macd_signal, macd_hist
+        return (
+            pd.Series(macd, index=prices.index),
+            pd.Series(macd_signal, index=prices.index),
+            pd.Series(macd_hist, index=prices.index)
+        )
     
     def _calculate_bollinger_bands(self, prices: pd.Series, window: int = 20, num_std: float = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """ボリンジャーバンド計算"""
-        sma = prices.rolling(window=window).mean()
-        std = prices.rolling(window=window).std()
-        upper = sma + (std * num_std)
-        lower = sma - (std * num_std)
-        return upper, sma, lower
+        upper, sma, lower = talib.BBANDS(
+            _as_float_array(prices), timeperiod=window, nbdevup=num_std, nbdevdn=num_std, matype=0
+        )
+        return (
+            pd.Series(upper, index=prices.index),
+            pd.Series(sma, index=prices.index),
+            pd.Series(lower, index=prices.index)
+        )
     
     def _calculate_stochastic(self, data: pd.DataFrame, k_window: int = 14, d_window: int = 3) -> Tuple[pd.Series, pd.Series]:
         """ストキャスティクス計算"""
-        low_min = data['Low'].rolling(window=k_window).min()
-        high_max = data['High'].rolling(window=k_window).max()
-        k_percent = 100 * ((data['Close'] - low_min) / (high_max - low_min))
-        d_percent = k_percent.rolling(window=d_window).mean()
-        return k_percent, d_percent
-    
-    def _detect_hammer_pattern(self, data: pd.DataFrame) -> pd.Series:
-        """ハンマーパターン検出"""
-        body = abs(data['Close'] - data['Open'])
-        lower_shadow = data[['Open', 'Close']].min(axis=1) - data['Low']
-        upper_shadow = data['High'] - data[['Open', 'Close']].max(axis=1)
-        
-        hammer = (
-            (lower_shadow > 2 * body) & 
-            (upper_shadow < body) & 
-            (body > 0)
-        ).astype(int)
-        
-        return hammer
-    
-    def _detect_shooting_star_pattern(self, data: pd.DataFrame) -> pd.Series:
-        """シューティングスターパターン検出"""
-        body = abs(data['Close'] - data['Open'])
-        lower_shadow = data[['Open', 'Close']].min(axis=1) - data['Low']
-        upper_shadow = data['High'] - data[['Open', 'Close']].max(axis=1)
-        
-        shooting_star = (
-            (upper_shadow > 2 * body) & 
-            (lower_shadow < body) & 
-            (body > 0)
-        ).astype(int)
-        
-        return shooting_star
+        # 平滑化なしの%Kと、その単純移動平均の%D (STOCHF)
+        k_percent, d_percent = talib.STOCHF(
+            _as_float_array(data['High']),
+            _as_float_array(data['Low']),
+            _as_float_array(data['Close']),
+            fastk_period=k_window, fastd_period=d_window, fastd_matype=0
+        )
+        return pd.Series(k_percent, index=data.index), pd.Series(d_percent, index=data.index)
     
     def _calculate_trend_strength(self, prices: pd.Series, window: int = 20) -> pd.Series:
         """トレンド強度計算"""
         # 線形回帰の傾きを使用
-        def linear_regression_slope(series):
-            if len(series) < 2:
-                return 0
-            x = np.arange(len(series))
-            slope, _ = np.polyfit(x, series, 1)
-            return slope
-        
-        return prices.rolling(window=window).apply(linear_regression_slope, raw=False)
+        return pd.Series(_rolling_slope(_as_float_array(prices), window), index=prices.index)
     
     def _calculate_support_resistance(self, data: pd.DataFrame, window: int = 20) -> pd.Series:
         """サポート・レジスタンス計算"""
-        highs = data['High'].rolling(window=window).max()
-        lows = data['Low'].rolling(window=window).min()
+        high = _as_float_array(data['High'])
+        low = _as_float_array(data['Low'])
+        close = _as_float_array(data['Close'])
+        
+        if BOTTLENECK_AVAILABLE:
+            highs = bn.move_max(high, window, min_count=window)
+            lows = bn.move_min(low, window, min_count=window)
+        else:
+            highs = data['High'].rolling(window=window).max().to_numpy(dtype=np.float64)
+            lows = data['Low'].rolling(window=window).min().to_numpy(dtype=np.float64)
         
         # 現在価格がサポート・レジスタンスレベルに近いかどうか
-        support_distance = (data['Close'] - lows) / data['Close']
-        resistance_distance = (highs - data['Close']) / data['Close']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            support_distance = (close - lows) / close
+            resistance_distance = (highs - close) / close
         
         # サポート・レジスタンスの強度
         support_resistance = np.where(
@@ -361,7 +614,7 @@ class FeatureEngineer:
             np.where(resistance_distance < 0.02, -1, 0)  # レジスタンス近く
         )
         
-        return pd.Series(support_resistance, index=data.index)
+        return pd.Series(support_resistance.astype(np.int8), index=data.index)
     
     def _calculate_financial_health_score(self, metrics: Dict[str, Any]) -> float:
         """財務健全性スコア計算"""
@@ -435,15 +688,20 @@ class FeatureEngineer:
     def _calculate_price_efficiency(self, data: pd.DataFrame) -> pd.Series:
         """価格効率性計算"""
         # 価格のランダムウォークからの乖離度
-        returns = data['Close'].pct_change().dropna()
-        if len(returns) < 2:
-            return pd.Series([0], index=data.index)
+        close = _as_float_array(data['Close'])
+        returns = np.diff(close) / close[:-1]
+        returns = returns[~np.isnan(returns)]
+        if returns.size < 3:
+            return pd.Series(np.zeros(len(data)), index=data.index)
         
-        # 自己相関の絶対値
-        autocorr = returns.autocorr(lag=1)
-        efficiency = 1 - abs(autocorr) if not pd.isna(autocorr) else 0
+        # 1次の自己相関 (Series.autocorr と同じピアソン相関) の絶対値
+        lead = returns[1:] - returns[1:].mean()
+        lag = returns[:-1] - returns[:-1].mean()
+        denominator = np.sqrt(lag.dot(lag) * lead.dot(lead))
+        autocorr = lag.dot(lead) / denominator if denominator > 0 else np.nan
+        efficiency = 1 - abs(autocorr) if not np.isnan(autocorr) else 0
         
-        return pd.Series([efficiency] * len(data), index=data.index)
+        return pd.Series(np.full(len(data), efficiency), index=data.index)
     
     def _calculate_volatility_clustering(self, data: pd.DataFrame) -> pd.Series:
         """ボラティリティクラスタリング計算"""
@@ -457,6 +715,54 @@ class FeatureEngineer:
         
         return volatility_clustering.reindex(data.index, fill_value=0)
 
+# これ未満の行数の予測では joblib の並列ディスパッチを使わない
+SMALL_BATCH_PREDICT_ROWS = 1000
+
+class _SmallBatchPredictMixin:
+    """小さなバッチの予測を n_jobs=1 で行うフォレスト用ミックスイン"""
+    
+    def predict(self, X):
+        n_jobs = self.n_jobs
+        if X.shape[0] < SMALL_BATCH_PREDICT_ROWS:
+            self.n_jobs = 1
+        try:
+            return super().predict(X)
+        finally:
+            self.n_jobs = n_jobs
+
+class SmallBatchRandomForestRegressor(_SmallBatchPredictMixin, RandomForestRegressor):
+    """小バッチ予測を直列化した RandomForestRegressor"""
+
+class SmallBatchExtraTreesRegressor(_SmallBatchPredictMixin, ExtraTreesRegressor):
+    """小バッチ予測を直列化した ExtraTreesRegressor"""
+
+class FastRobustScaler(RobustScaler):
+    """行をサブサンプルして中央値・四分位範囲を推定する RobustScaler"""
+    
+    def __init__(self, *, with_centering: bool = True, with_scaling: bool = True,
+                 quantile_range: Tuple[float, float] = (25.0, 75.0), copy: bool = True,
+                 unit_variance: bool = False, max_samples: int = 10_000, random_state: int = 42):
+        super().__init__(
+            with_centering=with_centering,
+            with_scaling=with_scaling,
+            quantile_range=quantile_range,
+            copy=copy,
+            unit_variance=unit_variance
+        )
+        self.max_samples = max_samples
+        self.random_state = random_state
+    
+    def fit(self, X, y=None):
+        n_samples = X.shape[0]
+        if n_samples <= self.max_samples:
+            return super().fit(X, y)
+        
+        # 昇順の行インデックスで抽出し、統計量の計算は親クラスに任せる
+        rng = np.random.default_rng(self.random_state)
+        idx = np.sort(rng.choice(n_samples, size=self.max_samples, replace=False))
+        sample = X.iloc[idx] if isinstance(X, pd.DataFrame) else X[idx]
+        return super().fit(sample, y)
+
 class ModelFactory:
     """モデルファクトリークラス"""
     
@@ -464,7 +770,7 @@ class ModelFactory:
     def create_model(model_type: str, **kwargs) -> Any:
         """モデルを作成"""
         models = {
-            'random_forest': RandomForestRegressor(
+            'random_forest': SmallBatchRandomForestRegressor(
                 n_estimators=kwargs.get('n_estimators', 100),
                 max_depth=kwargs.get('max_depth', 10),
                 random_state=42,
@@ -476,7 +782,7 @@ class ModelFactory:
                 max_depth=kwargs.get('max_depth', 6),
                 random_state=42
             ),
-            'extra_trees': ExtraTreesRegressor(
+            'extra_trees': SmallBatchExtraTreesRegressor(
                 n_estimators=kwargs.get('n_estimators', 100),
                 max_depth=kwargs.get('max_depth', 10),
                 random_state=42,
@@ -492,12 +798,12 @@ class ModelFactory:
                 C=kwargs.get('C', 1.0),
                 gamma=kwargs.get('gamma', 'scale')
             ),
-            'neural_network': MLPRegressor(
-                hidden_layer_sizes=kwargs.get('hidden_layer_sizes', (100, 50)),
-                activation=kwargs.get('activation', 'relu'),
-                solver=kwargs.get('solver', 'adam'),
-                random_state=42,
-                max_iter=kwargs.get('max_iter', 1000)
+            'hist_gbm': HistGradientBoostingRegressor(
+                max_iter=kwargs.get('n_estimators', 200),
+                learning_rate=kwargs.get('learning_rate', 0.05),
+                max_depth=kwargs.get('max_depth', 8),
+                early_stopping=True,
+                random_state=42
             ),
             'ridge': Ridge(
                 alpha=kwargs.get('alpha', 1.0),
@@ -515,6 +821,8 @@ class ModelFactory:
                 max_iter=kwargs.get('max_iter', 1000)
             )
         }
+        # 旧 MLP キーは互換性のため hist_gbm を返す
+        models['neural_network'] = models['hist_gbm']
         
         return models.get(model_type, models['random_forest'])
     
@@ -524,6 +832,31 @@ class ModelFactory:
         estimators = [(f'model_{i}', model) for i, model in enumerate(models)]
         return VotingRegressor(estimators=estimators, weights=weights)
 
+def _fit_model(model_name: str, config: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+               X_test: np.ndarray, tuned_params: Optional[Dict[str, Any]] = None
+               ) -> Tuple[str, Any, Optional[np.ndarray], float, Optional[str]]:
+    """1モデルを訓練してテストデータを予測 (joblib ワーカーで実行)"""
+    try:
+        start_time = time.time()
+        model = ModelFactory.create_model(model_name, **config)
+        if tuned_params:
+            model.set_params(**tuned_params)
+
+        # 外側で並列化しているため、ワーカー内の多重並列は避ける
+        params = model.get_params()
+        inner_n_jobs = params.get('n_jobs') if 'n_jobs' in params else None
+        if inner_n_jobs is not None:
+            model.set_params(n_jobs=1)
+        model.fit(X_train, y_train)
+        if inner_n_jobs is not None:
+            model.set_params(n_jobs=inner_n_jobs)
+
+        y_pred = model.predict(X_test)
+        return model_name, model, y_pred, time.time() - start_time, None
+
+    except Exception as e:
+        return model_name, None, None, 0.0, str(e)
+
 class LSTMPredictor:
     """LSTM予測器（TensorFlow使用）"""
     
@@ -534,9 +867,11 @@ class LSTMPredictor:
         self.sequence_length = sequence_length
         self.features = features
         self.model = None
-        self.scaler = StandardScaler()
+        # 特徴量ごとの平均・標準偏差 (fit で設定)
+        self._mu = None
+        self._sigma = None
         
-    def build_model(self, input_shape: Tuple[int, int]) -> Sequential:
+    def build_model(self, input_shape: Tuple[int, int]) -> "Sequential":
         """LSTMモデルを構築"""
         model = Sequential([
             LSTM(50, return_sequences=True, input_shape=input_shape),
@@ -566,18 +901,30 @@ class LSTMPredictor:
     
     def prepare_sequences(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """時系列データをシーケンスに変換"""
-        X, y = [], []
+        data = np.asarray(data)
+        n = len(data)
+        
+        if n <= self.sequence_length:
+            empty_shape = (0, self.sequence_length) + data.shape[1:]
+            return np.empty(empty_shape, dtype=np.float32), np.empty((0,) + data.shape[1:], dtype=np.float32)
         
-        for i in range(self.sequence_length, len(data)):
-            X.append(data[i-self.sequence_length:i])
-            y.append(data[i])
+        # 先頭軸方向のゼロコピー窓ビュー (窓軸は末尾に付くので2番目へ移動)
+        windows = np.lib.stride_tricks.sliding_window_view(data, self.sequence_length, axis=0)
+        windows = np.moveaxis(windows, -1, 1)
         
-        return np.array(X), np.array(y)
+        # TensorFlow には所有バッファを渡すため最後に1回だけコピー
+        X = windows[:-1].astype(np.float32)
+        y = data[self.sequence_length:].astype(np.float32)
+        
+        return X, y
     
     def fit(self, X: np.ndarray, y: np.ndarray, validation_split: float = 0.2):
         """モデルを訓練"""
-        # データの正規化
-        X_scaled = self.scaler.fit_transform(X.reshape(-1, X.shape[-1])).reshape(X.shape)
+        # データの正規化 (最終軸=特徴量ごとの z-score をブロードキャストで一括計算)
+        axes = tuple(range(X.ndim - 1))
+        self._mu = X.mean(axis=axes, keepdims=True)
+        self._sigma = X.std(axis=axes, keepdims=True) + 1e-8
+        X_scaled = (X - self._mu) / self._sigma
         
         # シーケンスの準備
         X_seq, y_seq = self.prepare_sequences(X_scaled[:, 0])  # Close価格を使用
@@ -608,7 +955,7 @@ class LSTMPredictor:
         if self.model is None:
             raise ValueError("Model must be fitted before prediction")
         
-        X_scaled = self.scaler.transform(X.reshape(-1, X.shape[-1])).reshape(X.shape)
+        X_scaled = (X - self._mu) / self._sigma
         X_seq, _ = self.prepare_sequences(X_scaled[:, 0])
         
         predictions = self.model.predict(X_seq, verbose=0)
@@ -617,6 +964,11 @@ class LSTMPredictor:
 class AdvancedMLPipeline:
     """高度な機械学習パイプライン"""
     
+    # 銘柄ごとのモデル・前処理をまとめた保存ファイル
+    MODEL_BUNDLE_FILE = "bundle.joblib"
+    # lz4 があれば高速圧縮、無ければ従来通り非圧縮
+    MODEL_COMPRESSION = ('lz4', 3) if LZ4_AVAILABLE else 0
+    
     def __init__(self, model_save_dir: str = "models"):
         self.logger = logging.getLogger(__name__)
         self.model_save_dir = model_save_dir
@@ -628,6 +980,9 @@ class AdvancedMLPipeline:
         self.models = {}
         self.scalers = {}
         self.feature_selectors = {}
+        self.pipelines = {}
+        # 銘柄ごとのインサイト (生成元の性能辞書と組で保持)
+        self._insights_cache: Dict[str, Tuple[Dict[str, ModelPerformance], Dict[str, Any]]] = {}
         self.model_performance = {}
         
         # モデル設定
@@ -635,9 +990,41 @@ class AdvancedMLPipeline:
             'random_forest': {'n_estimators': 200, 'max_depth': 15},
             'gradient_boosting': {'n_estimators': 200, 'learning_rate': 0.05, 'max_depth': 8},
             'extra_trees': {'n_estimators': 200, 'max_depth': 15},
-            'neural_network': {'hidden_layer_sizes': (200, 100, 50), 'max_iter': 2000},
+            'hist_gbm': {'n_estimators': 200, 'learning_rate': 0.05, 'max_depth': 8},
             'lstm': {'sequence_length': 60}
         }
+        
+        # モデル訓練の並列数 (joblib)
+        self.training_n_jobs = -1
+        
+        # ハイパーパラメータ探索空間 (推定器のパラメータ名)
+        self.tuning_param_distributions = {
+            'random_forest': {
+                'n_estimators': stats.randint(100, 400),
+                'max_depth': stats.randint(5, 25),
+                'min_samples_leaf': stats.randint(1, 10),
+                'max_features': ['sqrt', 'log2', 1.0]
+            },
+            'gradient_boosting': {
+                'n_estimators': stats.randint(100, 400),
+                'learning_rate': stats.loguniform(0.01, 0.3),
+                'max_depth': stats.randint(3, 10),
+                'subsample': stats.uniform(0.6, 0.4)
+            },
+            'extra_trees': {
+                'n_estimators': stats.randint(100, 400),
+                'max_depth': stats.randint(5, 25),
+                'min_samples_leaf': stats.randint(1, 10),
+                'max_features': ['sqrt', 'log2', 1.0]
+            },
+            'hist_gbm': {
+                'learning_rate': stats.loguniform(0.01, 0.3),
+                'max_depth': stats.randint(3, 12),
+                'max_leaf_nodes': stats.randint(15, 63),
+                'l2_regularization': stats.loguniform(1e-4, 1.0)
+            }
+        }
+        self.tuned_params: Dict[str, Dict[str, Dict[str, Any]]] = {}
     
     def prepare_features(self, data: pd.DataFrame, 
                         financial_metrics: Optional[Dict[str, Any]] = None,
@@ -678,63 +1065,90 @@ class AdvancedMLPipeline:
                     symbol: str) -> Dict[str, ModelPerformance]:
         """複数のモデルを訓練"""
         try:
+            # 前処理から float32 で行い、メモリ帯域を半減
+            X = X.astype(np.float32)
+            
             # データの分割（時系列を考慮）
             split_idx = int(len(X) * 0.8)
             X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
             y_train, y_test = y.iloc[:split_idx], y.iloc[split_idx:]
             
             # 特徴量のスケーリング
-            scaler = RobustScaler()
+            scaler = FastRobustScaler()
             X_train_scaled = scaler.fit_transform(X_train)
             X_test_scaled = scaler.transform(X_test)
             
-            # 特徴量選択
-            feature_selector = SelectKBest(k=min(50, X_train.shape[1]))
-            X_train_selected = feature_selector.fit_transform(X_train_scaled, y_train)
+            # 特徴量選択 (ほぼ定数の列を落としてから上位k個を選択)
+            variance_filter = VarianceThreshold(threshold=1e-8)
+            X_train_filtered = variance_filter.fit_transform(X_train_scaled)
+            
+            k_best = SelectKBest(score_func=f_regression, k=min(50, X_train_filtered.shape[1]))
+            X_train_selected = k_best.fit_transform(X_train_filtered, y_train)
+            
+            # predict / 保存で1つの変換器として扱えるよう fit 済みの2段をまとめる
+            feature_selector = Pipeline([
+                ('variance', variance_filter),
+                ('k_best', k_best)
+            ])
             X_test_selected = feature_selector.transform(X_test_scaled)
             
+            # 木モデルの分割探索はメモリ帯域律速なので float32 で訓練
+            X_train_selected = X_train_selected.astype(np.float32, copy=False)
+            X_test_selected = X_test_selected.astype(np.float32, copy=False)
+            y_train_values = y_train.to_numpy(dtype=np.float32)
+            
             self.scalers[symbol] = scaler
             self.feature_selectors[symbol] = feature_selector
             
             performance_results = {}
             
-            # 各モデルを訓練
-            for model_name, config in self.model_configs.items():
-                if model_name == 'lstm' and not TENSORFLOW_AVAILABLE:
+            # LSTM以外のモデルは独立しているので並列に訓練
+            parallel_configs = {
+                name: config for name, config in self.model_configs.items() if name != 'lstm'
+            }
+            fit_results = Parallel(n_jobs=self.training_n_jobs, backend='loky')(
+                delayed(_fit_model)(
+                    model_name, config, X_train_selected, y_train_values, X_test_selected,
+                    self.tuned_params.get(symbol, {}).get(model_name)
+                )
+                for model_name, config in parallel_configs.items()
+            )
+            
+            for model_name, model, y_pred, training_time, error in fit_results:
+                if error is not None:
+                    self.logger.error(f"{symbol} {model_name} 訓練エラー: {error}")
                     continue
                 
+                self.models[f"{symbol}_{model_name}"] = model
+                
+                # 性能評価
+                performance = self._evaluate_model(y_test, y_pred, model_name, training_time)
+                performance_results[model_name] = performance
+                
+                self.logger.info(f"{symbol} {model_name} 訓練完了: R²={performance.r2:.4f}")
+            
+            # LSTMモデル (TensorFlow がスレッドを管理するため直列で訓練)
+            if 'lstm' in self.model_configs and TENSORFLOW_AVAILABLE:
                 try:
                     start_time = time.time()
                     
-                    if model_name == 'lstm':
-                        # LSTMモデル
-                        lstm = LSTMPredictor(sequence_length=config['sequence_length'])
-                        lstm.fit(X_train_scaled, y_train.values)
-                        self.models[f"{symbol}_{model_name}"] = lstm
-                        
-                        # 予測
-                        y_pred = lstm.predict(X_test_scaled)
-                        
-                    else:
-                        # 従来の機械学習モデル
-                        model = self.model_factory.create_model(model_name, **config)
-                        model.fit(X_train_selected, y_train)
-                        self.models[f"{symbol}_{model_name}"] = model
-                        
-                        # 予測
-                        y_pred = model.predict(X_test_selected)
+                    lstm = LSTMPredictor(sequence_length=self.model_configs['lstm']['sequence_length'])
+                    lstm.fit(X_train_scaled, y_train.values)
+                    self.models[f"{symbol}_lstm"] = lstm
+                    
+                    # 予測
+                    y_pred = lstm.predict(X_test_scaled)
                     
                     training_time = time.time() - start_time
                     
                     # 性能評価
-                    performance = self._evaluate_model(y_test, y_pred, model_name, training_time)
-                    performance_results[model_name] = performance
+                    performance = self._evaluate_model(y_test, y_pred, 'lstm', training_time)
+                    performance_results['lstm'] = performance
                     
-                    self.logger.info(f"{symbol} {model_name} 訓練完了: R²={performance.r2:.4f}")
+                    self.logger.info(f"{symbol} lstm 訓練完了: R²={performance.r2:.4f}")
                     
                 except Exception as e:
-                    self.logger.error(f"{symbol} {model_name} 訓練エラー: {e}")
-                    continue
+                    self.logger.error(f"{symbol} lstm 訓練エラー: {e}")
             
             # アンサンブルモデルの作成
             if len(performance_results) > 1:
@@ -748,7 +1162,7 @@ class AdvancedMLPipeline:
                 
                 if ensemble_models:
                     ensemble = self.model_factory.create_ensemble_model(ensemble_models, weights)
-                    ensemble.fit(X_train_selected, y_train)
+                    ensemble.fit(X_train_selected, y_train_values)
                     self.models[f"{symbol}_ensemble"] = ensemble
                     
                     y_pred_ensemble = ensemble.predict(X_test_selected)
@@ -756,30 +1170,90 @@ class AdvancedMLPipeline:
                     performance_results['ensemble'] = ensemble_performance
             
             self.model_performance[symbol] = performance_results
+            self._build_pipelines(symbol)
             return performance_results
             
         except Exception as e:
             self.logger.error(f"モデル訓練エラー {symbol}: {e}")
             return {}
     
+    def _build_pipelines(self, symbol: str):
+        """スケーラー・特徴量選択・モデルを予測用の Pipeline にまとめてキャッシュ"""
+        prefix = f"{symbol}_"
+        for model_key in [key for key in self.pipelines if key.startswith(prefix)]:
+            del self.pipelines[model_key]
+        
+        scaler = self.scalers.get(symbol)
+        feature_selector = self.feature_selectors.get(symbol)
+        if scaler is None or feature_selector is None:
+            return
+        
+        # LSTM は特徴量選択を通さないため対象外
+        for model_key, model in self.models.items():
+            if model_key.startswith(prefix) and model_key != f"{symbol}_lstm":
+                self.pipelines[model_key] = Pipeline([
+                    ('scaler', scaler),
+                    ('selector', feature_selector),
+                    ('model', model)
+                ])
+    
+    def tune(self, symbol: str, X: pd.DataFrame, y: pd.Series,
+             n_jobs: int = -1) -> Dict[str, Dict[str, Any]]:
+        """逐次半減ランダムサーチでハイパーパラメータを探索"""
+        results = {}
+        X = X.astype(np.float32)
+        
+        for model_name, distributions in self.tuning_param_distributions.items():
+            if model_name not in self.model_configs:
+                continue
+            
+            try:
+                start_time = time.time()
+                estimator = self.model_factory.create_model(model_name, **self.model_configs[model_name])
+                # 探索側で並列化するため推定器内部の並列は無効化
+                if 'n_jobs' in estimator.get_params():
+                    estimator.set_params(n_jobs=1)
+                
+                search = HalvingRandomSearchCV(
+                    estimator,
+                    distributions,
+                    resource='n_samples',
+                    factor=3,
+                    cv=TimeSeriesSplit(n_splits=5),
+                    scoring='r2',
+                    n_jobs=n_jobs,
+                    random_state=42
+                )
+                search.fit(X, y)
+                
+                results[model_name] = {
+                    'best_params': search.best_params_,
+                    'best_score': search.best_score_,
+                    'tuning_time': time.time() - start_time
+                }
+                self.tuned_params.setdefault(symbol, {})[model_name] = search.best_params_
+                
+                self.logger.info(f"{symbol} {model_name} チューニング完了: R²={search.best_score_:.4f}")
+                
+            except Exception as e:
+                self.logger.error(f"{symbol} {model_name} チューニングエラー: {e}")
+                continue
+        
+        return results
+    
     def _evaluate_model(self, y_true: pd.Series, y_pred: np.ndarray, 
-                       model_name: str, training_time: float) -> ModelPerformance:
-        """モデル性能を評価"""
+                       model_name: str, training_time: float,
+                       cv_score: Optional[float] = None) -> ModelPerformance:
+        """モデル性能を評価 (cv_score 未指定時はホールドアウトの R² を使用)"""
         mse = mean_squared_error(y_true, y_pred)
         mae = mean_absolute_error(y_true, y_pred)
         rmse = np.sqrt(mse)
         r2 = r2_score(y_true, y_pred)
         mape = mean_absolute_percentage_error(y_true, y_pred)
+        residual_std = float(np.std(np.asarray(y_true, dtype=np.float64) - np.ravel(y_pred)))
         
-        # クロスバリデーション
-        try:
-            cv_scores = cross_val_score(
-                self.models.get(f"{model_name}", None), 
-                y_true.values.reshape(-1, 1), y_true.values, 
-                cv=5, scoring='r2'
-            )
-            cv_score = cv_scores.mean()
-        except:
+        # 訓練後にモデルを再フィットするクロスバリデーションは行わない
+        if cv_score is None:
             cv_score = r2
         
         # 特徴量重要度（可能な場合）
@@ -797,11 +1271,12 @@ class AdvancedMLPipeline:
             mae=mae,
             rmse=rmse,
             r2=r2,
-            mape=mae,
+            mape=mape,
             training_time=training_time,
             prediction_time=0.0,  # 後で更新
             cross_val_score=cv_score,
-            feature_importance=feature_importance
+            feature_importance=feature_importance,
+            residual_std=residual_std
         )
     
     def predict(self, symbol: str, X: pd.DataFrame, 
@@ -813,40 +1288,42 @@ class AdvancedMLPipeline:
                 raise ValueError(f"Model {model_key} not found")
             
             model = self.models[model_key]
-            scaler = self.scalers.get(symbol)
-            feature_selector = self.feature_selectors.get(symbol)
             
-            if scaler is None or feature_selector is None:
-                raise ValueError(f"Preprocessing components for {symbol} not found")
-            
-            # データの前処理
-            X_scaled = scaler.transform(X)
-            X_selected = feature_selector.transform(X_scaled)
-            
-            # 予測
+            # 予測 (前処理込み)
             start_time = time.time()
             
             if model_name == 'lstm':
-                predictions = model.predict(X_scaled)
+                scaler = self.scalers.get(symbol)
+                if scaler is None:
+                    raise ValueError(f"Preprocessing components for {symbol} not found")
+                predictions = model.predict(scaler.transform(X))
+                n_features = X.shape[1]
             else:
-                predictions = model.predict(X_selected)
+                pipeline = self.pipelines.get(model_key)
+                if pipeline is None:
+                    raise ValueError(f"Preprocessing components for {symbol} not found")
+                predictions = pipeline.predict(X.astype(np.float32))
+                n_features = pipeline[-1].n_features_in_
             
             prediction_time = time.time() - start_time
             
-            # 信頼区間の計算（簡易版）
-            confidence_intervals = self._calculate_confidence_intervals(predictions, model_name)
-            
             # 性能メトリクス
             performance = self.model_performance.get(symbol, {}).get(model_name)
             
+            # 信頼区間の計算 (訓練時の残差標準偏差を使用)
+            residual_std = getattr(performance, 'residual_std', None)
+            confidence_intervals = self._calculate_confidence_intervals(
+                predictions, model_name, residual_std=residual_std
+            )
+            
             return PredictionResult(
                 symbol=symbol,
                 predictions=predictions.tolist(),
-                confidence_intervals=confidence_intervals,
+                confidence_intervals=list(zip(*confidence_intervals.T.tolist())),
                 model_used=model_name,
                 performance_metrics=performance,
                 timestamp=datetime.now(),
-                features_used=list(range(X_selected.shape[1]))
+                features_used=list(range(n_features))
             )
             
         except Exception as e:
@@ -854,18 +1331,18 @@ class AdvancedMLPipeline:
             raise
     
     def _calculate_confidence_intervals(self, predictions: np.ndarray, 
-                                      model_name: str, confidence: float = 0.95) -> List[Tuple[float, float]]:
-        """信頼区間を計算"""
-        # 簡易的な信頼区間計算
-        std_error = np.std(predictions) * 0.1  # 仮の標準誤差
-        z_score = 1.96 if confidence == 0.95 else 2.576  # 99%信頼区間
+                                      model_name: str, confidence: float = 0.95,
+                                      residual_std: Optional[float] = None) -> np.ndarray:
+        """信頼区間を計算 (各行が [下限, 上限] の (n, 2) 配列)"""
+        if residual_std is None:
+            # 残差が記録されていない旧形式の性能データ向けの簡易推定
+            residual_std = np.std(predictions) * 0.1
+        z_score = _Z.get(confidence)
+        if z_score is None:
+            z_score = stats.norm.ppf(0.5 + confidence / 2)
+        margin = z_score * residual_std
         
-        intervals = []
-        for pred in predictions:
-            margin = z_score * std_error
-            intervals.append((pred - margin, pred + margin))
-        
-        return intervals
+        return np.column_stack((predictions - margin, predictions + margin))
     
     def save_models(self, symbol: str):
         """モデルを保存"""
@@ -873,32 +1350,52 @@ class AdvancedMLPipeline:
             symbol_dir = os.path.join(self.model_save_dir, symbol)
             os.makedirs(symbol_dir, exist_ok=True)
             
-            # モデルを保存
-            for model_key, model in self.models.items():
-                if model_key.startswith(f"{symbol}_"):
-                    model_path = os.path.join(symbol_dir, f"{model_key}.joblib")
-                    joblib.dump(model, model_path)
-            
-            # 前処理コンポーネントを保存
-            if symbol in self.scalers:
-                scaler_path = os.path.join(symbol_dir, "scaler.joblib")
-                joblib.dump(self.scalers[symbol], scaler_path)
-            
-            if symbol in self.feature_selectors:
-                selector_path = os.path.join(symbol_dir, "feature_selector.joblib")
-                joblib.dump(self.feature_selectors[symbol], selector_path)
+            # モデルと前処理コンポーネントを1ファイルにまとめて保存
+            bundle = {
+                'models': {
+                    model_key: model for model_key, model in self.models.items()
+                    if model_key.startswith(f"{symbol}_")
+                },
+                'scaler': self.scalers.get(symbol),
+                'feature_selector': self.feature_selectors.get(symbol)
+            }
+            bundle_path = os.path.join(symbol_dir, self.MODEL_BUNDLE_FILE)
+            joblib.dump(bundle, bundle_path, compress=self.MODEL_COMPRESSION, protocol=5)
             
             # 性能メトリクスを保存
             if symbol in self.model_performance:
                 performance_path = os.path.join(symbol_dir, "performance.json")
-                with open(performance_path, 'w') as f:
-                    json.dump(self.model_performance[symbol], f, default=str)
+                with open(performance_path, 'wb') as f:
+                    f.write(self._dump_performance(self.model_performance[symbol]))
             
             self.logger.info(f"{symbol} モデル保存完了")
             
         except Exception as e:
             self.logger.error(f"モデル保存エラー {symbol}: {e}")
     
+    @staticmethod
+    def _dump_performance(performance: Dict[str, ModelPerformance]) -> bytes:
+        """性能メトリクスを JSON バイト列に変換 (dataclass / numpy を直接シリアライズ)"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                performance,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        serializable = {
+            name: asdict(perf) if isinstance(perf, ModelPerformance) else perf
+            for name, perf in performance.items()
+        }
+        return json.dumps(serializable, default=str).encode('utf-8')
+    
+    @staticmethod
+    def _load_performance(raw: bytes) -> Dict[str, Any]:
+        """JSON バイト列から性能メトリクスを復元"""
+        loaded = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        return {
+            name: ModelPerformance(**values) if isinstance(values, dict) else values
+            for name, values in loaded.items()
+        }
+    
     def load_models(self, symbol: str):
         """モデルを読み込み"""
         try:
@@ -908,27 +1405,36 @@ class AdvancedMLPipeline:
                 self.logger.warning(f"{symbol} モデルディレクトリが見つかりません")
                 return False
             
-            # モデルを読み込み
-            for model_file in os.listdir(symbol_dir):
-                if model_file.endswith('.joblib') and not model_file.startswith('scaler') and not model_file.startswith('feature_selector'):
-                    model_path = os.path.join(symbol_dir, model_file)
-                    model_name = model_file.replace('.joblib', '')
-                    self.models[model_name] = joblib.load(model_path)
-            
-            # 前処理コンポーネントを読み込み
-            scaler_path = os.path.join(symbol_dir, "scaler.joblib")
-            if os.path.exists(scaler_path):
-                self.scalers[symbol] = joblib.load(scaler_path)
-            
-            selector_path = os.path.join(symbol_dir, "feature_selector.joblib")
-            if os.path.exists(selector_path):
-                self.feature_selectors[symbol] = joblib.load(selector_path)
+            bundle_path = os.path.join(symbol_dir, self.MODEL_BUNDLE_FILE)
+            if os.path.exists(bundle_path):
+                # 圧縮形式は joblib が自動判別
+                bundle = joblib.load(bundle_path)
+                self.models.update(bundle['models'])
+                if bundle.get('scaler') is not None:
+                    self.scalers[symbol] = bundle['scaler']
+                if bundle.get('feature_selector') is not None:
+                    self.feature_selectors[symbol] = bundle['feature_selector']
+            else:
+                # 旧形式 (モデル・前処理ごとの個別ファイル、モデルはファイル名が "{symbol}_{model}" のキー)
+                with os.scandir(symbol_dir) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not name.endswith('.joblib') or not entry.is_file():
+                            continue
+                        if name == "scaler.joblib":
+                            self.scalers[symbol] = joblib.load(entry.path)
+                        elif name == "feature_selector.joblib":
+                            self.feature_selectors[symbol] = joblib.load(entry.path)
+                        else:
+                            self.models[name[:-len('.joblib')]] = joblib.load(entry.path)
+            
+            self._build_pipelines(symbol)
             
             # 性能メトリクスを読み込み
             performance_path = os.path.join(symbol_dir, "performance.json")
             if os.path.exists(performance_path):
-                with open(performance_path, 'r') as f:
-                    self.model_performance[symbol] = json.load(f)
+                with open(performance_path, 'rb') as f:
+                    self.model_performance[symbol] = self._load_performance(f.read())
             
             self.logger.info(f"{symbol} モデル読み込み完了")
             return True
@@ -943,6 +1449,10 @@ class AdvancedMLPipeline:
             # 新しいデータでモデルを更新
             X, y = self.prepare_features(new_data)
             
+            # 最終行は翌日の価格 (ターゲット) が無いので除外
+            valid = y.notna()
+            X, y = X[valid], y[valid]
+            
             if X.empty or y.empty:
                 self.logger.warning(f"{symbol} 継続学習用データが不足")
                 return
@@ -959,9 +1469,46 @@ class AdvancedMLPipeline:
             if performance_results:
                 self.save_models(symbol)
                 self.logger.info(f"{symbol} 継続学習完了")
+                return True
+            
+            return False
             
         except Exception as e:
             self.logger.error(f"継続学習エラー {symbol}: {e}")
+            return False
+    
+    def continuous_learning_batch(self, symbol_data: Dict[str, pd.DataFrame],
+                                  max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """複数銘柄の継続学習を別プロセスで並列実行"""
+        results = {}
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _continuous_learning_worker,
+                    self.model_save_dir,
+                    self.model_configs,
+                    self.tuned_params.get(symbol, {}),
+                    symbol,
+                    new_data
+                ): symbol
+                for symbol, new_data in symbol_data.items()
+            }
+            
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    _, success = future.result()
+                except Exception as e:
+                    self.logger.error(f"継続学習エラー {symbol}: {e}")
+                    success = False
+                
+                # 子プロセスは保存済みなので、親はディスクから最新のモデルを取り込む
+                if success:
+                    success = self.load_models(symbol)
+                results[symbol] = success
+        
+        return results
     
     def get_model_insights(self, symbol: str) -> Dict[str, Any]:
         """モデルインサイトを取得"""
@@ -978,6 +1525,14 @@ class AdvancedMLPipeline:
             
             performance = self.model_performance[symbol]
             
+            # 再訓練・再読み込みで性能辞書が差し替わるまでは前回の結果を再利用
+            cached = self._insights_cache.get(symbol)
+            if cached is not None and cached[0] is performance:
+                # 呼び出し側の変更がキャッシュに波及しないよう深いコピーを返し、時刻は更新する
+                result = copy.deepcopy(cached[1])
+                result['timestamp'] = insights['timestamp']
+                return result
+            
             # 最良のモデルを特定
             best_model = max(performance.items(), key=lambda x: x[1].r2)
             insights['best_model'] = {
@@ -1003,11 +1558,25 @@ class AdvancedMLPipeline:
             if best_model[1].mae > 100:
                 insights['recommendations'].append("予測誤差が大きいため、より多くのデータでの訓練を推奨")
             
+            self._insights_cache[symbol] = (performance, copy.deepcopy(insights))
             return insights
             
         except Exception as e:
             self.logger.error(f"モデルインサイト取得エラー {symbol}: {e}")
             return {}
 
+def _continuous_learning_worker(model_save_dir: str, model_configs: Dict[str, Dict[str, Any]],
+                                tuned_params: Dict[str, Dict[str, Any]], symbol: str,
+                                new_data: pd.DataFrame) -> Tuple[str, bool]:
+    """1銘柄の継続学習を行うプロセスプール用ワーカー (モデルはディスク経由で受け渡す)"""
+    pipeline = AdvancedMLPipeline(model_save_dir=model_save_dir)
+    pipeline.model_configs = model_configs
+    if tuned_params:
+        pipeline.tuned_params[symbol] = tuned_params
+    # 銘柄間で並列化しているため、プロセス内のモデル並列訓練は行わない
+    pipeline.training_n_jobs = 1
+    # continuous_learning は早期終了時に None を返すため bool に揃える
+    return symbol, bool(pipeline.continuous_learning(symbol, new_data))
+
 # グローバルインスタンス
 advanced_ml_pipeline = AdvancedMLPipeline()
@@ -6,21 +6,22 @@ Advanced Visualization System
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-import plotly.figure_factory as ff
 import pandas as pd
 import numpy as np
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Tuple, Union, Callable
 from dataclasses import dataclass
-import json
-import streamlit as st
-from scipy import stats
-import talib
+from collections import OrderedDict
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import threading
+import hashlib
+from scipy.interpolate import griddata
 import warnings
 warnings.filterwarnings('ignore')
 
-@dataclass
+@dataclass(frozen=True)
 class ChartConfig:
     """チャート設定"""
     title: str
@@ -44,46 +45,315 @@ class ColorScheme:
     light: str = '#f8f9fa'
     dark: str = '#343a40'
 
+# ダッシュボードで共通に使うチャート設定 (Streamlit の再実行ごとに生成しない)
+DEFAULT_CHART_CONFIG = ChartConfig(title="Stock Analysis Chart", width=800, height=600)
+MARKET_PERFORMANCE_CONFIG = ChartConfig(title="Market Index Performance", width=800, height=400)
+SECTOR_PERFORMANCE_CONFIG = ChartConfig(title="Sector Performance", width=800, height=400)
+VOLUME_ANALYSIS_CONFIG = ChartConfig(title="Volume Analysis", width=800, height=400)
+STOCK_PRICE_CONFIG = ChartConfig(title="Stock Price Analysis", width=800, height=400)
+TECHNICAL_INDICATORS_CONFIG = ChartConfig(title="Technical Indicators", width=800, height=600)
+RISK_RETURN_CONFIG = ChartConfig(title="Risk-Return Analysis", width=800, height=400)
+PORTFOLIO_PERFORMANCE_CONFIG = ChartConfig(title="Portfolio Performance", width=800, height=400)
+ASSET_CORRELATION_CONFIG = ChartConfig(title="Asset Correlation", width=800, height=400)
+
+@lru_cache(maxsize=256)
+def _make_chart_config(items: Tuple[Tuple[str, Any], ...]) -> ChartConfig:
+    """同じ設定内容の ChartConfig を共有 (不変なのでレイアウト等のキャッシュキーとして再利用できる)"""
+    return ChartConfig(**dict(items))
+
+# ダッシュボードのチャートを並行生成するスレッド数
+DASHBOARD_MAX_WORKERS = 4
+
+# ローソク足に必要な列
+OHLC_COLUMNS = ('Open', 'High', 'Low', 'Close')
+
+# この行数を超えるトレースは WebGL (Scattergl) で描画する
+SCATTERGL_MIN_ROWS = 1000
+
+# この本数を超えるローソク足はヒゲ・実体を線分にして WebGL で描画する
+CANDLESTICK_GL_MIN_ROWS = 2000
+
+# 3Dサーフェスの1軸あたりの最大グリッド数 (最大 128×128 ≒ 16k 点)
+SURFACE_MAX_GRID = 128
+
+# 相関ヒートマップでセルに数値を表示する最大銘柄数 (超える場合はホバーのみ)
+HEATMAP_TEXT_MAX_SIZE = 30
+
+def _scatter_type(n_points: int) -> str:
+    """点数に応じて SVG ('scatter') と WebGL ('scattergl') のトレース種別を切り替え"""
+    return 'scattergl' if n_points > SCATTERGL_MIN_ROWS else 'scatter'
+
+def _ohlc_float32(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """ローソク足用の OHLC を float32 配列で取得 (図の JSON に埋め込むバイナリ配列が半分になる)"""
+    return {
+        key: data[column].to_numpy(dtype=np.float32)
+        for key, column in (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close'))
+    }
+
+def _candlestick_gl_traces(data: pd.DataFrame, increasing_color: str,
+                           decreasing_color: str) -> List[Dict[str, Any]]:
+    """ローソク足を陽線・陰線ごとのヒゲ/実体の線分 (Scattergl 4本) で表現
+    
+    各ローソクを [始点, 終点, NaN] の3点にし、NaN で線を切って1トレースに全本数を詰める。
+    日付インデックスは文字列化を避けるためエポックミリ秒で送る (x 軸を date 型にすること)
+    """
+    ohlc = _ohlc_float32(data)
+    if isinstance(data.index, pd.DatetimeIndex):
+        index = data.index.tz_localize(None) if data.index.tz is not None else data.index
+        index = index.to_numpy(dtype='datetime64[ms]').astype(np.float64)
+    else:
+        index = data.index.to_numpy()
+    rising = ohlc['close'] >= ohlc['open']
+    
+    traces = []
+    for mask, color, label in ((rising, increasing_color, 'increasing'),
+                               (~rising, decreasing_color, 'decreasing')):
+        x = np.repeat(index[mask], 3)
+        for (start, end), width in (((ohlc['high'], ohlc['low']), 1), ((ohlc['open'], ohlc['close']), 3)):
+            y = np.full(x.shape, np.nan, dtype=np.float32)
+            y[0::3] = start[mask]
+            y[1::3] = end[mask]
+            traces.append(_trace('scattergl',
+                x=x,
+                y=y,
+                mode='lines',
+                line=dict(color=color, width=width),
+                name='Price',
+                legendgroup='Price',
+                showlegend=label == 'increasing' and width == 1,
+                hoverinfo='x+y'
+            ))
+    return traces
+
+def _trace(trace_type: str, **properties: Any) -> Dict[str, Any]:
+    """トレースを dict で定義 (型付きトレースクラスと違い Figure 追加時の1回だけ検証される)"""
+    return {'type': trace_type, **properties}
+
+def _cumulative_returns(close: pd.Series) -> np.ndarray:
+    """初日を 1 とした累積リターン (欠損した終値は直前の値で補完、表示用に float32)"""
+    values = close.ffill().to_numpy(dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    if valid.size == 0:
+        return np.full(values.shape, np.nan, dtype=np.float32)
+    return (values / values[valid[0]]).astype(np.float32)
+
+def _surface_grid(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """散布点を go.Surface 用の格子 (x 軸, y 軸, z 行列) に変換し SURFACE_MAX_GRID まで間引く"""
+    x_axis = np.unique(x)
+    y_axis = np.unique(y)
+    rows = np.searchsorted(y_axis, y)
+    cols = np.searchsorted(x_axis, x)
+    # (x, y) の組が重複なく全格子点を覆う場合のみ格子状データとみなす
+    if len(x_axis) * len(y_axis) == len(z) and len(np.unique(rows * len(x_axis) + cols)) == len(z):
+        # 格子状のデータはそのまま行列化 (z[i, j] が (y_axis[i], x_axis[j]) に対応)
+        z_grid = np.empty((len(y_axis), len(x_axis)))
+        z_grid[rows, cols] = z
+        x_step = -(-len(x_axis) // SURFACE_MAX_GRID)
+        y_step = -(-len(y_axis) // SURFACE_MAX_GRID)
+        return x_axis[::x_step], y_axis[::y_step], z_grid[::y_step, ::x_step]
+    
+    # 不規則な散布点は線形補間で格子に載せる
+    x_axis = np.linspace(x.min(), x.max(), min(len(x_axis), SURFACE_MAX_GRID))
+    y_axis = np.linspace(y.min(), y.max(), min(len(y_axis), SURFACE_MAX_GRID))
+    grid_x, grid_y = np.meshgrid(x_axis, y_axis)
+    return x_axis, y_axis, griddata((x, y), z, (grid_x, grid_y), method='linear')
+
+def _volume_colors(close: Union[pd.Series, np.ndarray], color_scheme: ColorScheme) -> List[str]:
+    """前日比で出来高バーの色を決定 (先頭は primary、上昇・横ばいは success、下落は danger)"""
+    close = np.asarray(close, dtype=np.float64)
+    if close.size == 0:
+        return []
+    
+    changes = np.where(close[1:] >= close[:-1], color_scheme.success, color_scheme.danger)
+    return [color_scheme.primary] + changes.tolist()
+
+def _build_charts(builders: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """独立したチャートをスレッドプールで並行生成 (結果は builders の順序で返す)"""
+    if len(builders) <= 1:
+        return {chart_id: build() for chart_id, build in builders.items()}
+    
+    with ThreadPoolExecutor(max_workers=min(DASHBOARD_MAX_WORKERS, len(builders))) as executor:
+        futures = {chart_id: executor.submit(build) for chart_id, build in builders.items()}
+        return {chart_id: future.result() for chart_id, future in futures.items()}
+
+def _reveal_ranges(index: pd.Index, low: np.ndarray, high: np.ndarray, ends: List[int],
+                   floor: Optional[float] = None) -> List[Tuple[list, list]]:
+    """先頭から ends[k] 行だけを表示する x / y 軸範囲 (アニメーションは軸範囲だけを更新)"""
+    low_min = np.fmin.accumulate(np.asarray(low, dtype=np.float64))
+    high_max = np.fmax.accumulate(np.asarray(high, dtype=np.float64))
+    
+    if isinstance(index, pd.DatetimeIndex) or pd.api.types.is_numeric_dtype(index):
+        if len(index) > 1:
+            half_step = pd.Series(index).diff().median() / 2
+        else:
+            # 1行のみの場合は幅なし (日時軸は Timedelta で揃える)
+            half_step = pd.Timedelta(0) if isinstance(index, pd.DatetimeIndex) else 0
+        x_ranges = [[index[0] - half_step, index[end - 1] + half_step] for end in ends]
+    else:
+        # カテゴリ軸は位置で範囲を指定
+        x_ranges = [[-0.5, end - 0.5] for end in ends]
+    
+    ranges = []
+    for x_range, end in zip(x_ranges, ends):
+        y_low, y_high = low_min[end - 1], high_max[end - 1]
+        pad = (y_high - y_low) * 0.05
+        ranges.append((x_range, [y_low - pad if floor is None else floor, y_high + pad]))
+    return ranges
+
 class AdvancedChartGenerator:
     """高度なチャート生成クラス"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 32):
         self.logger = logging.getLogger(__name__)
         self.color_scheme = ColorScheme()
-        self.default_config = ChartConfig(
-            title="Stock Analysis Chart",
-            width=800,
-            height=600
-        )
+        self.default_config = DEFAULT_CHART_CONFIG
+        # (チャート種別, 設定, 入力データのハッシュ) -> 生成済みチャート (LRU)
+        self.figure_cache: "OrderedDict[Tuple[Any, ...], go.Figure]" = OrderedDict()
+        self.cache_size = cache_size
+        # (チャート種別, 設定, 入力データのハッシュ) -> 直列化済み JSON (LRU、API 応答用)
+        self.json_cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # ダッシュボードの並行生成から共有される
+        # ChartConfig -> 共通レイアウト (title/template/width/height)
+        self._base_layouts: Dict[ChartConfig, Dict[str, Any]] = {
+            self.default_config: self._make_base_layout(self.default_config)
+        }
+    
+    @staticmethod
+    def _make_base_layout(config: ChartConfig) -> Dict[str, Any]:
+        return {
+            'title': config.title,
+            'template': config.theme,
+            'width': config.width,
+            'height': config.height
+        }
+    
+    def _base_layout(self, config: ChartConfig) -> Dict[str, Any]:
+        """設定ごとの共通レイアウトを返す (ChartConfig は不変なので使い回せる)"""
+        layout = self._base_layouts.get(config)
+        if layout is None:
+            layout = self._base_layouts.setdefault(config, self._make_base_layout(config))
+        return layout
+    
+    def _figure_cache_key(self, kind: str, data: pd.DataFrame, *options: Any) -> Tuple[Any, ...]:
+        """入力データの内容と設定からキャッシュキーを生成"""
+        digest = hashlib.md5(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        digest.update('\0'.join(map(str, data.columns)).encode())
+        return (kind, *options, digest.hexdigest())
+    
+    def _cached(self, cache: OrderedDict, key: Tuple[Any, ...], build: Callable[[], Any],
+                cacheable: Callable[[Any], bool]) -> Any:
+        """キャッシュ済みの値を返し、なければ生成して保存 (上限を超えたら最も古いものを削除)"""
+        with self._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                return cached
+        
+        value = build()
+        if cacheable(value):
+            with self._cache_lock:
+                cache[key] = value
+                while len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return value
+    
+    def _cached_figure(self, key: Tuple[Any, ...], build) -> go.Figure:
+        """キャッシュ済みのチャートを返し、なければ生成 (エラー時の空チャートはキャッシュしない)
+
+        呼び出し側が update_layout 等で変更してもキャッシュに影響しないよう、常に複製を返す。
+        """
+        return go.Figure(self._cached(self.figure_cache, key, build, lambda fig: bool(fig.data)))
+    
+    def create_chart_json(self, chart_type: str, data: pd.DataFrame,
+                          config: ChartConfig = None) -> str:
+        """チャートを JSON 文字列で作成 (同じ種別・データ・設定なら直列化済みの JSON を返す)"""
+        builders = {
+            'candlestick': self.create_candlestick_chart,
+            'volume': self.create_volume_chart,
+            'technical_indicators': lambda data, config: self.create_technical_indicators_chart(data, config=config)
+        }
+        builder = builders.get(chart_type)
+        if builder is None:
+            self.logger.warning(f"未対応のチャート種別です: {chart_type}")
+            return go.Figure().to_json()
+        
+        config = config or self.default_config
+        
+        def build() -> Optional[str]:
+            fig = builder(data, config)
+            return fig.to_json() if fig.data else None  # 空チャートはキャッシュしない
+        
+        try:
+            key = self._figure_cache_key(chart_type, data, config)
+            chart_json = self._cached(self.json_cache, key, build, lambda value: value is not None)
+        except Exception:
+            chart_json = build()
+        return chart_json if chart_json is not None else go.Figure().to_json()
+    
+    def _validate_ohlc(self, data: pd.DataFrame, columns: Tuple[str, ...] = OHLC_COLUMNS) -> bool:
+        """チャート作成前に必要な列とデータ件数を確認 (不足時は警告して False)"""
+        if data is None or len(data) == 0:
+            self.logger.warning("チャート作成スキップ: データがありません")
+            return False
+        missing = [column for column in columns if column not in data.columns]
+        if missing:
+            self.logger.warning(f"チャート作成スキップ: 必要な列がありません {missing}")
+            return False
+        return True
     
     def create_candlestick_chart(self, data: pd.DataFrame, 
                                config: ChartConfig = None) -> go.Figure:
-        """ローソク足チャートを作成"""
+        """ローソク足チャートを作成 (同じデータ・設定ならキャッシュから返す)"""
+        config = config or self.default_config
         try:
-            config = config or self.default_config
+            key = self._figure_cache_key('candlestick', data, config)
+        except Exception:
+            return self._create_candlestick_chart(data, config)
+        return self._cached_figure(key, lambda: self._create_candlestick_chart(data, config))
+    
+    def create_candlestick_chart_gl(self, data: pd.DataFrame,
+                                  config: ChartConfig = None) -> go.Figure:
+        """ローソク足を本数に関係なく WebGL の線分で描画したチャートを作成"""
+        config = config or self.default_config
+        try:
+            key = self._figure_cache_key('candlestick_gl', data, config)
+        except Exception:
+            return self._create_candlestick_chart(data, config, webgl=True)
+        return self._cached_figure(key, lambda: self._create_candlestick_chart(data, config, webgl=True))
+    
+    def _create_candlestick_chart(self, data: pd.DataFrame, config: ChartConfig,
+                                  webgl: Optional[bool] = None) -> go.Figure:
+        """ローソク足チャートを生成 (webgl 未指定時は本数が多ければ WebGL の線分で描画)"""
+        if not self._validate_ohlc(data):
+            return go.Figure()
+        
+        try:
+            if webgl is None:
+                webgl = len(data) > CANDLESTICK_GL_MIN_ROWS
             
-            fig = go.Figure(data=go.Candlestick(
-                x=data.index,
-                open=data['Open'],
-                high=data['High'],
-                low=data['Low'],
-                close=data['Close'],
-                name='Price',
-                increasing_line_color=self.color_scheme.success,
-                decreasing_line_color=self.color_scheme.danger
-            ))
+            if webgl:
+                fig = go.Figure(data=_candlestick_gl_traces(
+                    data, self.color_scheme.success, self.color_scheme.danger
+                ))
+                if isinstance(data.index, pd.DatetimeIndex):
+                    fig.update_xaxes(type='date')
+            else:
+                fig = go.Figure(data=_trace('candlestick',
+                    x=data.index,
+                    **_ohlc_float32(data),
+                    name='Price',
+                    increasing_line_color=self.color_scheme.success,
+                    decreasing_line_color=self.color_scheme.danger
+                ))
             
             # レイアウト設定
-            fig.update_layout(
-                title=config.title,
-                xaxis_title='Date',
-                yaxis_title='Price',
-                template=config.theme,
-                width=config.width,
-                height=config.height,
-                showlegend=config.show_legend,
-                xaxis_rangeslider_visible=False
-            )
+            fig.update_layout({
+                **self._base_layout(config),
+                'xaxis_title': 'Date',
+                'yaxis_title': 'Price',
+                'showlegend': config.show_legend,
+                'xaxis_rangeslider_visible': False
+            })
             
             # グリッド設定
             if config.show_grid:
@@ -99,21 +369,16 @@ class AdvancedChartGenerator:
     def create_volume_chart(self, data: pd.DataFrame, 
                           config: ChartConfig = None) -> go.Figure:
         """出来高チャートを作成"""
+        if not self._validate_ohlc(data, ('Close', 'Volume')):
+            return go.Figure()
+        
         try:
             config = config or self.default_config
             
             # 出来高の色を価格変動に基づいて設定
-            colors = []
-            for i in range(len(data)):
-                if i == 0:
-                    colors.append(self.color_scheme.primary)
-                else:
-                    if data['Close'].iloc[i] >= data['Close'].iloc[i-1]:
-                        colors.append(self.color_scheme.success)
-                    else:
-                        colors.append(self.color_scheme.danger)
+            colors = _volume_colors(data['Close'], self.color_scheme)
             
-            fig = go.Figure(data=go.Bar(
+            fig = go.Figure(data=_trace('bar',
                 x=data.index,
                 y=data['Volume'],
                 name='Volume',
@@ -121,15 +386,12 @@ class AdvancedChartGenerator:
                 opacity=0.7
             ))
             
-            fig.update_layout(
-                title=config.title,
-                xaxis_title='Date',
-                yaxis_title='Volume',
-                template=config.theme,
-                width=config.width,
-                height=config.height,
-                showlegend=config.show_legend
-            )
+            fig.update_layout({
+                **self._base_layout(config),
+                'xaxis_title': 'Date',
+                'yaxis_title': 'Volume',
+                'showlegend': config.show_legend
+            })
             
             return fig
             
@@ -140,83 +402,109 @@ class AdvancedChartGenerator:
     def create_technical_indicators_chart(self, data: pd.DataFrame,
                                         indicators: List[str] = None,
                                         config: ChartConfig = None) -> go.Figure:
-        """テクニカル指標チャートを作成"""
+        """テクニカル指標チャートを作成 (同じデータ・設定ならキャッシュから返す)"""
+        config = config or self.default_config
+        indicators = indicators or ['SMA_20', 'SMA_50', 'RSI', 'MACD']
         try:
-            config = config or self.default_config
-            indicators = indicators or ['SMA_20', 'SMA_50', 'RSI', 'MACD']
+            key = self._figure_cache_key('technical_indicators', data, config, tuple(indicators))
+        except Exception:
+            return self._create_technical_indicators_chart(data, indicators, config)
+        return self._cached_figure(
+            key, lambda: self._create_technical_indicators_chart(data, indicators, config)
+        )
+    
+    def _create_technical_indicators_chart(self, data: pd.DataFrame, indicators: List[str],
+                                         config: ChartConfig) -> go.Figure:
+        """テクニカル指標チャートを生成"""
+        if not self._validate_ohlc(data, ('Close',)):
+            return go.Figure()
+        
+        try:
+            # データのある指標だけサブプロットの行を割り当てる
+            show_rsi = 'RSI' in indicators and 'RSI' in data.columns
+            show_macd = 'MACD' in indicators and 'MACD' in data.columns
+            subplot_titles = ['Price with Moving Averages']
+            row_heights = [0.6]
+            if show_rsi:
+                subplot_titles.append('RSI')
+                row_heights.append(0.2)
+                rsi_row = len(subplot_titles)
+            if show_macd:
+                subplot_titles.append('MACD')
+                row_heights.append(0.2)
+                macd_row = len(subplot_titles)
             
             # サブプロットを作成
             fig = make_subplots(
-                rows=3, cols=1,
+                rows=len(subplot_titles), cols=1,
                 shared_xaxes=True,
                 vertical_spacing=0.05,
-                subplot_titles=('Price with Moving Averages', 'RSI', 'MACD'),
-                row_heights=[0.6, 0.2, 0.2]
+                subplot_titles=subplot_titles,
+                row_heights=row_heights
             )
             
             # 価格と移動平均
             fig.add_trace(
-                go.Scatter(x=data.index, y=data['Close'], name='Close', 
-                          line=dict(color=self.color_scheme.primary)),
+                _trace('scatter', x=data.index, y=data['Close'], name='Close',
+                                 line=dict(color=self.color_scheme.primary)),
                 row=1, col=1
             )
             
             if 'SMA_20' in indicators and 'SMA_20' in data.columns:
                 fig.add_trace(
-                    go.Scatter(x=data.index, y=data['SMA_20'], name='SMA 20',
-                              line=dict(color=self.color_scheme.secondary, dash='dash')),
+                    _trace('scatter', x=data.index, y=data['SMA_20'], name='SMA 20',
+                                     line=dict(color=self.color_scheme.secondary, dash='dash')),
                     row=1, col=1
                 )
             
             if 'SMA_50' in indicators and 'SMA_50' in data.columns:
                 fig.add_trace(
-                    go.Scatter(x=data.index, y=data['SMA_50'], name='SMA 50',
-                              line=dict(color=self.color_scheme.warning, dash='dash')),
+                    _trace('scatter', x=data.index, y=data['SMA_50'], name='SMA 50',
+                                     line=dict(color=self.color_scheme.warning, dash='dash')),
                     row=1, col=1
                 )
             
             # RSI
-            if 'RSI' in indicators and 'RSI' in data.columns:
+            if show_rsi:
                 fig.add_trace(
-                    go.Scatter(x=data.index, y=data['RSI'], name='RSI',
-                              line=dict(color=self.color_scheme.info)),
-                    row=2, col=1
+                    _trace('scatter', x=data.index, y=data['RSI'], name='RSI',
+                                     line=dict(color=self.color_scheme.info)),
+                    row=rsi_row, col=1
                 )
                 
                 # RSIの過買い・過売りライン
-                fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-                fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+                fig.add_hline(y=70, line_dash="dash", line_color="red", row=rsi_row, col=1)
+                fig.add_hline(y=30, line_dash="dash", line_color="green", row=rsi_row, col=1)
             
             # MACD
-            if 'MACD' in indicators and 'MACD' in data.columns:
+            if show_macd:
                 fig.add_trace(
-                    go.Scatter(x=data.index, y=data['MACD'], name='MACD',
-                              line=dict(color=self.color_scheme.primary)),
-                    row=3, col=1
+                    _trace('scatter', x=data.index, y=data['MACD'], name='MACD',
+                                     line=dict(color=self.color_scheme.primary)),
+                    row=macd_row, col=1
                 )
                 
                 if 'MACD_Signal' in data.columns:
                     fig.add_trace(
-                        go.Scatter(x=data.index, y=data['MACD_Signal'], name='MACD Signal',
-                                  line=dict(color=self.color_scheme.secondary)),
-                        row=3, col=1
+                        _trace('scatter', x=data.index, y=data['MACD_Signal'], name='MACD Signal',
+                                         line=dict(color=self.color_scheme.secondary)),
+                        row=macd_row, col=1
                     )
                 
                 if 'MACD_Histogram' in data.columns:
-                    colors = ['green' if val >= 0 else 'red' for val in data['MACD_Histogram']]
+                    histogram = data['MACD_Histogram'].to_numpy(dtype=np.float64)
+                    colors = np.where(histogram >= 0, 'green', 'red').tolist()
                     fig.add_trace(
-                        go.Bar(x=data.index, y=data['MACD_Histogram'], name='MACD Histogram',
-                              marker_color=colors, opacity=0.7),
-                        row=3, col=1
+                        _trace('bar', x=data.index, y=data['MACD_Histogram'], name='MACD Histogram',
+                                     marker_color=colors, opacity=0.7),
+                        row=macd_row, col=1
                     )
             
-            fig.update_layout(
-                title=config.title,
-                template=config.theme,
-                width=config.width,
-                height=config.height * 1.5,
-                showlegend=config.show_legend
-            )
+            fig.update_layout({
+                **self._base_layout(config),
+                'height': config.height * (1.5 if len(row_heights) > 1 else 1),
+                'showlegend': config.show_legend
+            })
             
             return fig
             
@@ -226,31 +514,45 @@ class AdvancedChartGenerator:
     
     def create_correlation_heatmap(self, data: pd.DataFrame,
                                  config: ChartConfig = None) -> go.Figure:
-        """相関ヒートマップを作成"""
+        """相関ヒートマップを作成 (同じデータ・設定ならキャッシュから返す)"""
+        config = config or self.default_config
         try:
-            config = config or self.default_config
-            
-            # 相関行列を計算
-            correlation_matrix = data.corr()
+            key = self._figure_cache_key('correlation', data, config)
+        except Exception:
+            return self._create_correlation_heatmap(data, config)
+        return self._cached_figure(key, lambda: self._create_correlation_heatmap(data, config))
+    
+    def _create_correlation_heatmap(self, data: pd.DataFrame, config: ChartConfig) -> go.Figure:
+        """相関ヒートマップを生成"""
+        try:
+            # 相関行列を計算 (欠損がなければ NumPy で直接、あればペアワイズ除外の pandas)
+            values = data.to_numpy(dtype=np.float64)
+            if np.isnan(values).any():
+                correlation = data.corr().to_numpy()
+            else:
+                correlation = np.corrcoef(values, rowvar=False)
+            labels = list(data.columns)
+            
+            # 銘柄数が多い場合はセルへの数値表示を省略
+            text_kwargs = {}
+            if len(labels) <= HEATMAP_TEXT_MAX_SIZE:
+                text_kwargs = dict(
+                    text=np.round(correlation, 2),
+                    texttemplate="%{text}",
+                    textfont={"size": 10}
+                )
             
-            fig = go.Figure(data=go.Heatmap(
-                z=correlation_matrix.values,
-                x=correlation_matrix.columns,
-                y=correlation_matrix.columns,
+            fig = go.Figure(data=_trace('heatmap',
+                z=correlation.astype(np.float32),
+                x=labels,
+                y=labels,
                 colorscale='RdBu',
                 zmid=0,
-                text=np.round(correlation_matrix.values, 2),
-                texttemplate="%{text}",
-                textfont={"size": 10},
-                hoverongaps=False
+                hoverongaps=False,
+                **text_kwargs
             ))
             
-            fig.update_layout(
-                title=config.title,
-                template=config.theme,
-                width=config.width,
-                height=config.height
-            )
+            fig.update_layout(self._base_layout(config))
             
             return fig
             
@@ -265,25 +567,28 @@ class AdvancedChartGenerator:
         try:
             config = config or self.default_config
             
-            fig = go.Figure(data=go.Surface(
-                x=data[x_col],
-                y=data[y_col],
-                z=data[z_col],
+            x_axis, y_axis, z_grid = _surface_grid(
+                data[x_col].to_numpy(dtype=np.float64),
+                data[y_col].to_numpy(dtype=np.float64),
+                data[z_col].to_numpy(dtype=np.float64)
+            )
+            
+            fig = go.Figure(data=_trace('surface',
+                x=x_axis,
+                y=y_axis,
+                z=z_grid,
                 colorscale='Viridis',
                 opacity=0.8
             ))
             
-            fig.update_layout(
-                title=config.title,
-                scene=dict(
+            fig.update_layout({
+                **self._base_layout(config),
+                'scene': dict(
                     xaxis_title=x_col,
                     yaxis_title=y_col,
                     zaxis_title=z_col
-                ),
-                template=config.theme,
-                width=config.width,
-                height=config.height
-            )
+                )
+            })
             
             return fig
             
@@ -303,16 +608,18 @@ class AdvancedChartGenerator:
                 animation_frame=animation_column,
                 size='Volume',
                 color='Close',
-                hover_name=data.index,
-                color_continuous_scale='Viridis'
+                color_continuous_scale='Viridis',
+                render_mode='webgl' if len(data) > SCATTERGL_MIN_ROWS else 'svg'
             )
             
-            fig.update_layout(
-                title=config.title,
-                template=config.theme,
-                width=config.width,
-                height=config.height
-            )
+            # ホバーは送信済みの x/y だけで描画する (インデックスを全フレームに複製しない)
+            hovertemplate = 'Close: %{x:.2f}<br>Volume: %{y:,.0f}<extra></extra>'
+            fig.update_traces(hovertemplate=hovertemplate)
+            for frame in fig.frames:
+                for trace in frame.data:
+                    trace.hovertemplate = hovertemplate
+            
+            fig.update_layout(self._base_layout(config))
             
             return fig
             
@@ -323,15 +630,26 @@ class AdvancedChartGenerator:
     def create_risk_return_scatter(self, data: pd.DataFrame,
                                  config: ChartConfig = None) -> go.Figure:
         """リスク・リターンスキャッタープロットを作成"""
+        if not self._validate_ohlc(data, ('Close',)):
+            return go.Figure()
+        
         try:
             config = config or self.default_config
             
             # リターンとリスクを計算
+            # ローリング平均・標準偏差は enhanced_ml_analyzer の1パスカーネルを共用
+            # (sklearn 等を読み込むため、モジュール読み込み時ではなく初回呼び出し時にインポート)
+            from enhanced_ml_analyzer import _rolling_mean_std
             returns = data['Close'].pct_change().dropna()
-            risk = returns.rolling(window=20).std()
-            expected_return = returns.rolling(window=20).mean()
-            
-            fig = go.Figure(data=go.Scatter(
+            mean_values, std_values = _rolling_mean_std(returns.to_numpy(dtype=np.float64), 20)
+            # 表示用なので float32 で送る (ホバーは小数4桁)
+            risk = std_values.astype(np.float32)
+            expected_return = mean_values.astype(np.float32)
+            labels = returns.index
+            if isinstance(labels, pd.DatetimeIndex):
+                labels = labels.strftime('%Y-%m-%d')
+            
+            fig = go.Figure(data=_trace(_scatter_type(len(risk)),
                 x=risk,
                 y=expected_return,
                 mode='markers',
@@ -342,20 +660,17 @@ class AdvancedChartGenerator:
                     showscale=True,
                     colorbar=dict(title="Expected Return")
                 ),
-                text=data.index,
+                text=labels.to_numpy(),
                 hovertemplate='<b>%{text}</b><br>' +
                              'Risk: %{x:.4f}<br>' +
                              'Expected Return: %{y:.4f}<extra></extra>'
             ))
             
-            fig.update_layout(
-                title=config.title,
-                xaxis_title='Risk (Standard Deviation)',
-                yaxis_title='Expected Return',
-                template=config.theme,
-                width=config.width,
-                height=config.height
-            )
+            fig.update_layout({
+                **self._base_layout(config),
+                'xaxis_title': 'Risk (Standard Deviation)',
+                'yaxis_title': 'Expected Return'
+            })
             
             return fig
             
@@ -374,8 +689,8 @@ class AdvancedChartGenerator:
             
             # 各資産の累積リターンを計算
             for asset_name, asset_data in portfolio_data.items():
-                cumulative_return = (1 + asset_data['Close'].pct_change()).cumprod()
-                fig.add_trace(go.Scatter(
+                cumulative_return = _cumulative_returns(asset_data['Close'])
+                fig.add_trace(_trace(_scatter_type(len(cumulative_return)),
                     x=asset_data.index,
                     y=cumulative_return,
                     mode='lines',
@@ -385,8 +700,8 @@ class AdvancedChartGenerator:
             
             # ベンチマークを追加
             if benchmark_data is not None:
-                benchmark_cumulative = (1 + benchmark_data['Close'].pct_change()).cumprod()
-                fig.add_trace(go.Scatter(
+                benchmark_cumulative = _cumulative_returns(benchmark_data['Close'])
+                fig.add_trace(_trace(_scatter_type(len(benchmark_cumulative)),
                     x=benchmark_data.index,
                     y=benchmark_cumulative,
                     mode='lines',
@@ -394,15 +709,12 @@ class AdvancedChartGenerator:
                     line=dict(width=3, dash='dash', color='black')
                 ))
             
-            fig.update_layout(
-                title=config.title,
-                xaxis_title='Date',
-                yaxis_title='Cumulative Return',
-                template=config.theme,
-                width=config.width,
-                height=config.height,
-                showlegend=config.show_legend
-            )
+            fig.update_layout({
+                **self._base_layout(config),
+                'xaxis_title': 'Date',
+                'yaxis_title': 'Cumulative Return',
+                'showlegend': config.show_legend
+            })
             
             return fig
             
@@ -421,42 +733,30 @@ class InteractiveDashboard:
     def create_market_overview_dashboard(self, market_data: Dict[str, pd.DataFrame]) -> Dict[str, go.Figure]:
         """市場概要ダッシュボードを作成"""
         try:
-            dashboard = {}
+            builders = {}
             
             # 市場全体のパフォーマンス
             if 'market_index' in market_data:
-                config = ChartConfig(
-                    title="Market Index Performance",
-                    width=800,
-                    height=400
-                )
-                dashboard['market_performance'] = self.chart_generator.create_candlestick_chart(
-                    market_data['market_index'], config
+                builders['market_performance'] = partial(
+                    self.chart_generator.create_candlestick_chart,
+                    market_data['market_index'], MARKET_PERFORMANCE_CONFIG
                 )
             
             # セクター別パフォーマンス
             if 'sector_performance' in market_data:
-                config = ChartConfig(
-                    title="Sector Performance",
-                    width=800,
-                    height=400
-                )
-                dashboard['sector_performance'] = self._create_sector_performance_chart(
-                    market_data['sector_performance'], config
+                builders['sector_performance'] = partial(
+                    self._create_sector_performance_chart,
+                    market_data['sector_performance'], SECTOR_PERFORMANCE_CONFIG
                 )
             
             # 出来高分析
             if 'volume_analysis' in market_data:
-                config = ChartConfig(
-                    title="Volume Analysis",
-                    width=800,
-                    height=400
-                )
-                dashboard['volume_analysis'] = self.chart_generator.create_volume_chart(
-                    market_data['volume_analysis'], config
+                builders['volume_analysis'] = partial(
+                    self.chart_generator.create_volume_chart,
+                    market_data['volume_analysis'], VOLUME_ANALYSIS_CONFIG
                 )
             
-            return dashboard
+            return _build_charts(builders)
             
         except Exception as e:
             self.logger.error(f"市場概要ダッシュボード作成エラー: {e}")
@@ -466,55 +766,33 @@ class InteractiveDashboard:
                                       financial_metrics: Dict[str, Any] = None) -> Dict[str, go.Figure]:
         """株式分析ダッシュボードを作成"""
         try:
-            dashboard = {}
-            
-            # 価格チャート
-            config = ChartConfig(
-                title="Stock Price Analysis",
-                width=800,
-                height=400
-            )
-            dashboard['price_chart'] = self.chart_generator.create_candlestick_chart(
-                stock_data, config
-            )
-            
-            # テクニカル指標
-            config = ChartConfig(
-                title="Technical Indicators",
-                width=800,
-                height=600
-            )
-            dashboard['technical_indicators'] = self.chart_generator.create_technical_indicators_chart(
-                stock_data, config=config
-            )
-            
-            # 出来高分析
-            config = ChartConfig(
-                title="Volume Analysis",
-                width=800,
-                height=400
-            )
-            dashboard['volume_chart'] = self.chart_generator.create_volume_chart(
-                stock_data, config
-            )
-            
-            # リスク・リターン分析
-            config = ChartConfig(
-                title="Risk-Return Analysis",
-                width=800,
-                height=400
-            )
-            dashboard['risk_return'] = self.chart_generator.create_risk_return_scatter(
-                stock_data, config
-            )
+            builders = {
+                # 価格チャート
+                'price_chart': partial(
+                    self.chart_generator.create_candlestick_chart, stock_data, STOCK_PRICE_CONFIG
+                ),
+                # テクニカル指標
+                'technical_indicators': partial(
+                    self.chart_generator.create_technical_indicators_chart,
+                    stock_data, config=TECHNICAL_INDICATORS_CONFIG
+                ),
+                # 出来高分析
+                'volume_chart': partial(
+                    self.chart_generator.create_volume_chart, stock_data, VOLUME_ANALYSIS_CONFIG
+                ),
+                # リスク・リターン分析
+                'risk_return': partial(
+                    self.chart_generator.create_risk_return_scatter, stock_data, RISK_RETURN_CONFIG
+                )
+            }
             
             # 財務指標（利用可能な場合）
             if financial_metrics:
-                dashboard['financial_metrics'] = self._create_financial_metrics_chart(
-                    financial_metrics
+                builders['financial_metrics'] = partial(
+                    self._create_financial_metrics_chart, financial_metrics
                 )
             
-            return dashboard
+            return _build_charts(builders)
             
         except Exception as e:
             self.logger.error(f"株式分析ダッシュボード作成エラー: {e}")
@@ -524,39 +802,41 @@ class InteractiveDashboard:
                                  portfolio_weights: Dict[str, float] = None) -> Dict[str, go.Figure]:
         """ポートフォリオダッシュボードを作成"""
         try:
-            dashboard = {}
+            builders = {}
             
             # ポートフォリオパフォーマンス
-            config = ChartConfig(
-                title="Portfolio Performance",
-                width=800,
-                height=400
-            )
-            dashboard['portfolio_performance'] = self.chart_generator.create_portfolio_performance_chart(
-                portfolio_data, config=config
+            builders['portfolio_performance'] = partial(
+                self.chart_generator.create_portfolio_performance_chart,
+                portfolio_data, config=PORTFOLIO_PERFORMANCE_CONFIG
             )
             
             # 資産配分（利用可能な場合）
             if portfolio_weights:
-                dashboard['asset_allocation'] = self._create_asset_allocation_chart(
-                    portfolio_weights
+                builders['asset_allocation'] = partial(
+                    self._create_asset_allocation_chart, portfolio_weights
                 )
             
             # 相関分析
             if len(portfolio_data) > 1:
-                combined_data = pd.concat([data['Close'] for data in portfolio_data.values()], axis=1)
-                combined_data.columns = list(portfolio_data.keys())
+                names = list(portfolio_data.keys())
+                closes = [data['Close'] for data in portfolio_data.values()]
+                index = closes[0].index
+                if all(close.index is index or close.index.equals(index) for close in closes):
+                    # 日付が揃っていれば1つの配列に直接詰める (concat の整列・コピーを省略)
+                    values = np.empty((len(index), len(closes)), dtype=np.float64)
+                    for j, close in enumerate(closes):
+                        values[:, j] = close.to_numpy(dtype=np.float64)
+                    combined_data = pd.DataFrame(values, index=index, columns=names, copy=False)
+                else:
+                    combined_data = pd.concat(closes, axis=1)
+                    combined_data.columns = names
                 
-                config = ChartConfig(
-                    title="Asset Correlation",
-                    width=800,
-                    height=400
-                )
-                dashboard['correlation'] = self.chart_generator.create_correlation_heatmap(
-                    combined_data, config
+                builders['correlation'] = partial(
+                    self.chart_generator.create_correlation_heatmap,
+                    combined_data, ASSET_CORRELATION_CONFIG
                 )
             
-            return dashboard
+            return _build_charts(builders)
             
         except Exception as e:
             self.logger.error(f"ポートフォリオダッシュボード作成エラー: {e}")
@@ -567,9 +847,10 @@ class InteractiveDashboard:
         """セクター別パフォーマンスチャートを作成"""
         try:
             fig = go.Figure()
+            scatter_type = _scatter_type(len(sector_data))
             
             for column in sector_data.columns:
-                fig.add_trace(go.Scatter(
+                fig.add_trace(_trace(scatter_type,
                     x=sector_data.index,
                     y=sector_data[column],
                     mode='lines',
@@ -625,7 +906,7 @@ class InteractiveDashboard:
                 
                 if values:
                     fig.add_trace(
-                        go.Bar(x=labels, y=values, name=category, showlegend=False),
+                        _trace('bar', x=labels, y=values, name=category, showlegend=False),
                         row=row, col=col
                     )
             
@@ -647,7 +928,7 @@ class InteractiveDashboard:
             labels = list(weights.keys())
             values = list(weights.values())
             
-            fig = go.Figure(data=[go.Pie(
+            fig = go.Figure(data=[_trace('pie',
                 labels=labels,
                 values=values,
                 hole=0.3,
@@ -678,47 +959,38 @@ class AnimationEngine:
     def create_price_animation(self, data: pd.DataFrame,
                              animation_speed: int = 100) -> go.Figure:
         """価格アニメーションを作成"""
+        if not self.chart_generator._validate_ohlc(data):
+            return go.Figure()
+        
         try:
             # データを時系列でソート
             data_sorted = data.sort_index()
             
-            # フレームごとのデータを作成
-            frames = []
-            for i in range(10, len(data_sorted), 5):  # 5日ごとにフレーム
-                frame_data = data_sorted.iloc[:i]
-                
-                frame = go.Frame(
-                    data=[
-                        go.Candlestick(
-                            x=frame_data.index,
-                            open=frame_data['Open'],
-                            high=frame_data['High'],
-                            low=frame_data['Low'],
-                            close=frame_data['Close']
-                        )
-                    ],
-                    name=str(i)
-                )
-                frames.append(frame)
+            # 全データは1度だけ送り、フレームは表示範囲 (5日ごと) だけを更新
+            ends = [min(10, len(data_sorted))] + list(range(10, len(data_sorted), 5))
+            ranges = _reveal_ranges(
+                data_sorted.index, data_sorted['Low'].to_numpy(), data_sorted['High'].to_numpy(), ends
+            )
+            frames = [
+                go.Frame(layout=dict(xaxis=dict(range=x_range), yaxis=dict(range=y_range)), name=str(end))
+                for end, (x_range, y_range) in zip(ends[1:], ranges[1:])
+            ]
             
-            # 初期データ
-            initial_data = data_sorted.iloc[:10]
             fig = go.Figure(
                 data=[
-                    go.Candlestick(
-                        x=initial_data.index,
-                        open=initial_data['Open'],
-                        high=initial_data['High'],
-                        low=initial_data['Low'],
-                        close=initial_data['Close']
+                    _trace('candlestick',
+                        x=data_sorted.index,
+                        **_ohlc_float32(data_sorted)
                     )
                 ],
                 frames=frames
             )
             
-            # アニメーション設定
+            # アニメーション設定 (初期表示は先頭10日)
             fig.update_layout(
                 title="Animated Stock Price",
+                xaxis_range=ranges[0][0],
+                yaxis_range=ranges[0][1],
                 xaxis_rangeslider_visible=False,
                 updatemenus=[
                     dict(
@@ -749,43 +1021,30 @@ class AnimationEngine:
     def create_volume_animation(self, data: pd.DataFrame,
                               animation_speed: int = 100) -> go.Figure:
         """出来高アニメーションを作成"""
+        if not self.chart_generator._validate_ohlc(data, ('Close', 'Volume')):
+            return go.Figure()
+        
         try:
             data_sorted = data.sort_index()
             
-            frames = []
-            for i in range(10, len(data_sorted), 5):
-                frame_data = data_sorted.iloc[:i]
-                
-                # 出来高の色を価格変動に基づいて設定
-                colors = []
-                for j in range(len(frame_data)):
-                    if j == 0:
-                        colors.append('#1f77b4')
-                    else:
-                        if frame_data['Close'].iloc[j] >= frame_data['Close'].iloc[j-1]:
-                            colors.append('#2ca02c')
-                        else:
-                            colors.append('#d62728')
-                
-                frame = go.Frame(
-                    data=[
-                        go.Bar(
-                            x=frame_data.index,
-                            y=frame_data['Volume'],
-                            marker_color=colors
-                        )
-                    ],
-                    name=str(i)
-                )
-                frames.append(frame)
+            # 出来高の色は全期間で一度だけ計算
+            colors = _volume_colors(data_sorted['Close'], self.chart_generator.color_scheme)
+            
+            # 全データは1度だけ送り、フレームは表示範囲 (5日ごと) だけを更新
+            volume = data_sorted['Volume'].to_numpy()
+            ends = [min(10, len(data_sorted))] + list(range(10, len(data_sorted), 5))
+            ranges = _reveal_ranges(data_sorted.index, volume, volume, ends, floor=0)
+            frames = [
+                go.Frame(layout=dict(xaxis=dict(range=x_range), yaxis=dict(range=y_range)), name=str(end))
+                for end, (x_range, y_range) in zip(ends[1:], ranges[1:])
+            ]
             
-            initial_data = data_sorted.iloc[:10]
             fig = go.Figure(
                 data=[
-                    go.Bar(
-                        x=initial_data.index,
-                        y=initial_data['Volume'],
-                        marker_color='#1f77b4'
+                    _trace('bar',
+                        x=data_sorted.index,
+                        y=volume,
+                        marker_color=colors
                     )
                 ],
                 frames=frames
@@ -793,6 +1052,8 @@ class AnimationEngine:
             
             fig.update_layout(
                 title="Animated Volume",
+                xaxis_range=ranges[0][0],
+                yaxis_range=ranges[0][1],
                 updatemenus=[
                     dict(
                         type="buttons",
@@ -819,6 +1080,79 @@ class AnimationEngine:
             self.logger.error(f"出来高アニメーション作成エラー: {e}")
             return go.Figure()
 
+# ダッシュボードテンプレート (テンプレート名 -> チャートID -> チャート定義)
+DASHBOARD_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    'market_overview': {
+        'market_performance': {
+            'type': 'candlestick',
+            'data_key': 'market_data',
+            'config': {
+                'title': 'Market Performance',
+                'width': 800,
+                'height': 400
+            }
+        },
+        'sector_analysis': {
+            'type': 'correlation',
+            'data_key': 'sector_data',
+            'config': {
+                'title': 'Sector Correlation',
+                'width': 800,
+                'height': 400
+            }
+        }
+    },
+    'stock_analysis': {
+        'price_chart': {
+            'type': 'candlestick',
+            'data_key': 'stock_data',
+            'config': {
+                'title': 'Stock Price',
+                'width': 800,
+                'height': 400
+            }
+        },
+        'technical_analysis': {
+            'type': 'technical_indicators',
+            'data_key': 'stock_data',
+            'config': {
+                'title': 'Technical Indicators',
+                'width': 800,
+                'height': 600
+            }
+        },
+        'volume_analysis': {
+            'type': 'volume',
+            'data_key': 'stock_data',
+            'config': {
+                'title': 'Volume Analysis',
+                'width': 800,
+                'height': 400
+            }
+        }
+    },
+    'portfolio_analysis': {
+        'performance': {
+            'type': 'candlestick',
+            'data_key': 'portfolio_data',
+            'config': {
+                'title': 'Portfolio Performance',
+                'width': 800,
+                'height': 400
+            }
+        },
+        'correlation': {
+            'type': 'correlation',
+            'data_key': 'portfolio_correlation',
+            'config': {
+                'title': 'Asset Correlation',
+                'width': 800,
+                'height': 400
+            }
+        }
+    }
+}
+
 class CustomDashboardBuilder:
     """カスタムダッシュボードビルダー"""
     
@@ -827,134 +1161,89 @@ class CustomDashboardBuilder:
         self.dashboard_generator = InteractiveDashboard()
         self.animation_engine = AnimationEngine()
         self.chart_generator = AdvancedChartGenerator()
+        # チャート種別 -> (データ, チャート定義) を受け取る生成関数
+        self._builders: Dict[str, Callable[[Any, Dict[str, Any]], go.Figure]] = {
+            'candlestick': lambda data, spec: self.chart_generator.create_candlestick_chart(
+                data, self._chart_config(spec)
+            ),
+            'volume': lambda data, spec: self.chart_generator.create_volume_chart(
+                data, self._chart_config(spec)
+            ),
+            'technical_indicators': lambda data, spec: self.chart_generator.create_technical_indicators_chart(
+                data, spec.get('indicators'), self._chart_config(spec)
+            ),
+            'correlation': lambda data, spec: self.chart_generator.create_correlation_heatmap(
+                data, self._chart_config(spec)
+            ),
+            '3d_surface': lambda data, spec: self.chart_generator.create_3d_surface_chart(
+                data,
+                spec.get('x_col', 'x'),
+                spec.get('y_col', 'y'),
+                spec.get('z_col', 'z'),
+                self._chart_config(spec)
+            ),
+            'animated_price': lambda data, spec: self.animation_engine.create_price_animation(
+                data, spec.get('animation_speed', 100)
+            ),
+            'animated_volume': lambda data, spec: self.animation_engine.create_volume_animation(
+                data, spec.get('animation_speed', 100)
+            )
+        }
+    
+    @staticmethod
+    def _chart_config(spec: Dict[str, Any]) -> ChartConfig:
+        config = spec.get('config', {})
+        try:
+            return _make_chart_config(tuple(sorted(config.items())))
+        except TypeError:
+            # ハッシュ不可能な値を含む設定は共有せず都度生成
+            return ChartConfig(**config)
+    
+    def register_chart_builder(self, chart_type: str,
+                               builder: Callable[[Any, Dict[str, Any]], go.Figure]):
+        """チャート種別を追加・上書き (builder はデータとチャート定義を受け取り Figure を返す)"""
+        self._builders[chart_type] = builder
+    
+    def _build_chart(self, chart_id: str, builder: Callable[[Any, Dict[str, Any]], go.Figure],
+                     chart_data: Any, chart_config: Dict[str, Any]) -> Optional[go.Figure]:
+        """1チャートを生成 (失敗してもダッシュボード全体は止めない)"""
+        try:
+            return builder(chart_data, chart_config)
+        except Exception as e:
+            self.logger.error(f"チャート構築エラー {chart_id}: {e}")
+            return None
     
     def build_dashboard(self, dashboard_config: Dict[str, Any],
                        data: Dict[str, Any]) -> Dict[str, go.Figure]:
         """カスタムダッシュボードを構築"""
         try:
-            dashboard = {}
+            builds = {}
             
             for chart_id, chart_config in dashboard_config.items():
                 chart_type = chart_config.get('type')
                 chart_data = data.get(chart_config.get('data_key'))
                 
-                if not chart_data:
+                if chart_data is None or len(chart_data) == 0:
                     continue
                 
-                if chart_type == 'candlestick':
-                    dashboard[chart_id] = self.chart_generator.create_candlestick_chart(
-                        chart_data, ChartConfig(**chart_config.get('config', {}))
-                    )
-                elif chart_type == 'volume':
-                    dashboard[chart_id] = self.chart_generator.create_volume_chart(
-                        chart_data, ChartConfig(**chart_config.get('config', {}))
-                    )
-                elif chart_type == 'technical_indicators':
-                    dashboard[chart_id] = self.chart_generator.create_technical_indicators_chart(
-                        chart_data, ChartConfig(**chart_config.get('config', {}))
-                    )
-                elif chart_type == 'correlation':
-                    dashboard[chart_id] = self.chart_generator.create_correlation_heatmap(
-                        chart_data, ChartConfig(**chart_config.get('config', {}))
-                    )
-                elif chart_type == '3d_surface':
-                    dashboard[chart_id] = self.chart_generator.create_3d_surface_chart(
-                        chart_data,
-                        chart_config.get('x_col', 'x'),
-                        chart_config.get('y_col', 'y'),
-                        chart_config.get('z_col', 'z'),
-                        ChartConfig(**chart_config.get('config', {}))
-                    )
-                elif chart_type == 'animated_price':
-                    dashboard[chart_id] = self.animation_engine.create_price_animation(
-                        chart_data, chart_config.get('animation_speed', 100)
-                    )
-                elif chart_type == 'animated_volume':
-                    dashboard[chart_id] = self.animation_engine.create_volume_animation(
-                        chart_data, chart_config.get('animation_speed', 100)
-                    )
+                builder = self._builders.get(chart_type)
+                if builder is None:
+                    self.logger.warning(f"未対応のチャート種別です: {chart_type} ({chart_id})")
+                    continue
+                
+                builds[chart_id] = partial(self._build_chart, chart_id, builder, chart_data, chart_config)
             
-            return dashboard
+            # 各チャートは独立しているので並行生成し、失敗したチャートだけ除外する
+            charts = _build_charts(builds)
+            return {chart_id: fig for chart_id, fig in charts.items() if fig is not None}
             
         except Exception as e:
             self.logger.error(f"カスタムダッシュボード構築エラー: {e}")
             return {}
     
     def create_dashboard_template(self, template_name: str) -> Dict[str, Any]:
-        """ダッシュボードテンプレートを作成"""
-        templates = {
-            'market_overview': {
-                'market_performance': {
-                    'type': 'candlestick',
-                    'data_key': 'market_data',
-                    'config': {
-                        'title': 'Market Performance',
-                        'width': 800,
-                        'height': 400
-                    }
-                },
-                'sector_analysis': {
-                    'type': 'correlation',
-                    'data_key': 'sector_data',
-                    'config': {
-                        'title': 'Sector Correlation',
-                        'width': 800,
-                        'height': 400
-                    }
-                }
-            },
-            'stock_analysis': {
-                'price_chart': {
-                    'type': 'candlestick',
-                    'data_key': 'stock_data',
-                    'config': {
-                        'title': 'Stock Price',
-                        'width': 800,
-                        'height': 400
-                    }
-                },
-                'technical_analysis': {
-                    'type': 'technical_indicators',
-                    'data_key': 'stock_data',
-                    'config': {
-                        'title': 'Technical Indicators',
-                        'width': 800,
-                        'height': 600
-                    }
-                },
-                'volume_analysis': {
-                    'type': 'volume',
-                    'data_key': 'stock_data',
-                    'config': {
-                        'title': 'Volume Analysis',
-                        'width': 800,
-                        'height': 400
-                    }
-                }
-            },
-            'portfolio_analysis': {
-                'performance': {
-                    'type': 'candlestick',
-                    'data_key': 'portfolio_data',
-                    'config': {
-                        'title': 'Portfolio Performance',
-                        'width': 800,
-                        'height': 400
-                    }
-                },
-                'correlation': {
-                    'type': 'correlation',
-                    'data_key': 'portfolio_correlation',
-                    'config': {
-                        'title': 'Asset Correlation',
-                        'width': 800,
-                        'height': 400
-                    }
-                }
-            }
-        }
-        
-        return templates.get(template_name, {})
+        """ダッシュボードテンプレートを取得 (共有の定義を壊さないよう複製を返す)"""
+        return copy.deepcopy(DASHBOARD_TEMPLATES.get(template_name, {}))
 
 # グローバルインスタンス
 advanced_visualization = {
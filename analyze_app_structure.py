@@ -7,10 +7,42 @@ import sys
 import time
 import logging
 from browser_mcp_client import BrowserMCPClient
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# 複数セレクターの要素数と先頭 limit 個の詳細を1回のスクリプト実行でまとめて取得
+# (find_elements や要素ごとの tag_name / is_displayed / size はそれぞれ WebDriver への往復になる)
+ELEMENT_DETAILS_SCRIPT = """
+const limit = arguments[1];
+return arguments[0].map(selector => {
+    const elements = document.querySelectorAll(selector);
+    return {
+        count: elements.length,
+        details: Array.from(elements).slice(0, limit).map(e => {
+            const rect = e.getBoundingClientRect();
+            return {
+                tag_name: e.tagName.toLowerCase(),
+                text: (e.innerText || '').trim(),
+                class_name: e.getAttribute('class'),
+                element_id: e.getAttribute('id'),
+                displayed: !!(e.offsetParent || e.getClientRects().length),
+                enabled: !e.disabled,
+                size: {height: Math.round(rect.height), width: Math.round(rect.width)},
+                location: {x: Math.round(rect.left + window.scrollX), y: Math.round(rect.top + window.scrollY)}
+            };
+        })
+    };
+});
+"""
+
+# 幅・高さを持つ要素数をブラウザ内で数える (要素ごとに size を問い合わせない)
+SIZED_ELEMENT_COUNT_SCRIPT = """
+return Array.from(document.querySelectorAll('*')).filter(e => {
+    const rect = e.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}).length;
+"""
+
 def analyze_app_structure():
     """アプリケーションの構造を分析"""
     print("=== MCPを使用したアプリケーション構造分析開始 ===")
@@ -57,28 +89,7 @@ def analyze_app_structure():
                 "div[data-testid='stApp'] button"
             ]
             
-            for selector in selectors:
-                elements = browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"セレクター '{selector}': {len(elements)} 個の要素が見つかりました")
-                
-                if elements:
-                    for i, element in enumerate(elements[:3]):  # 最初の3個を詳細表示
-                        try:
-                            tag_name = element.tag_name
-                            text = element.text.strip()
-                            class_name = element.get_attribute("class")
-                            element_id = element.get_attribute("id")
-                            
-                            print(f"  - 要素 {i+1}: <{tag_name}>")
-                            print(f"    テキスト: '{text}'")
-                            print(f"    クラス: {class_name}")
-                            print(f"    ID: {element_id}")
-                            
-                        except Exception as e:
-                            print(f"  - 要素 {i+1}: 詳細取得エラー - {e}")
-            
-            # Streamlitの特定要素を検索
-            print("\n6. Streamlitの特定要素を検索中...")
+            # Streamlitの特定要素
             streamlit_elements = [
                 "section[data-testid='stSidebar']",
                 "div[data-testid='stApp']",
@@ -90,34 +101,43 @@ def analyze_app_structure():
                 ".stNumberInput"
             ]
             
-            for selector in streamlit_elements:
-                elements = browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"Streamlit要素 '{selector}': {len(elements)} 個が見つかりました")
+            # 両方のセレクター一覧を1回の往復で調べる
+            results = browser.driver.execute_script(
+                ELEMENT_DETAILS_SCRIPT, selectors + streamlit_elements, 3
+            )
+            button_results = results[:len(selectors)]
+            streamlit_results = results[len(selectors):]
+            
+            for selector, result in zip(selectors, button_results):
+                print(f"セレクター '{selector}': {result['count']} 個の要素が見つかりました")
+                
+                for i, detail in enumerate(result['details']):  # 最初の3個を詳細表示
+                    print(f"  - 要素 {i+1}: <{detail['tag_name']}>")
+                    print(f"    テキスト: '{detail['text']}'")
+                    print(f"    クラス: {detail['class_name']}")
+                    print(f"    ID: {detail['element_id']}")
+            
+            print("\n6. Streamlitの特定要素を検索中...")
+            for selector, result in zip(streamlit_elements, streamlit_results):
+                print(f"Streamlit要素 '{selector}': {result['count']} 個が見つかりました")
                 
-                if elements:
-                    element = elements[0]
-                    try:
-                        is_displayed = element.is_displayed()
-                        is_enabled = element.is_enabled()
-                        size = element.size
-                        location = element.location
-                        
-                        print(f"  - 表示状態: {is_displayed}")
-                        print(f"  - 有効状態: {is_enabled}")
-                        print(f"  - サイズ: {size}")
-                        print(f"  - 位置: {location}")
-                        
-                    except Exception as e:
-                        print(f"  - 詳細取得エラー: {e}")
+                if result['details']:
+                    detail = result['details'][0]
+                    print(f"  - 表示状態: {detail['displayed']}")
+                    print(f"  - 有効状態: {detail['enabled']}")
+                    print(f"  - サイズ: {detail['size']}")
+                    print(f"  - 位置: {detail['location']}")
             
             # ページのHTMLソースの一部を取得
             print("\n7. ページソースの一部を確認中...")
             page_source = browser.get_page_source()
             
             # ボタン関連のHTMLを検索
+            # 小文字化はページ全体で一度だけ (キーワードごとの lower() は全文コピーになる)
             button_keywords = ["button", "stButton", "click", "onclick"]
+            page_source_lower = page_source.lower()
             for keyword in button_keywords:
-                count = page_source.lower().count(keyword.lower())
+                count = page_source_lower.count(keyword.lower())
                 print(f"'{keyword}' の出現回数: {count}")
             
             # ページのタイトルとURLを再確認
@@ -131,14 +151,7 @@ def analyze_app_structure():
             print(f"ページサイズ: {page_width} x {page_height}")
             
             # スクロール可能な要素を確認
-            scrollable_elements = browser.driver.find_elements(By.CSS_SELECTOR, "*")
-            scrollable_count = 0
-            for element in scrollable_elements:
-                try:
-                    if element.size['height'] > 0 and element.size['width'] > 0:
-                        scrollable_count += 1
-                except:
-                    pass
+            scrollable_count = browser.driver.execute_script(SIZED_ELEMENT_COUNT_SCRIPT)
             print(f"スクロール可能な要素数: {scrollable_count}")
             
         except Exception as e:
@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import time
+import uuid
 from datetime import datetime, timedelta
 import numpy as np
 import os
@@ -677,25 +678,29 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-try:
-    database_manager = DatabaseManager()
-except Exception:
-    database_manager = None
+# 分析サービスはプロセス内で共有するリソースとしてキャッシュ (再実行ごとに作り直さない)
+# 起動時には生成せず、利用するページで初めて呼ばれたときに生成する
+# 生成に失敗した場合は例外を送出する (st.cache_resource は例外時にキャッシュしないため、
+# 次回の呼び出しで再試行される)。呼び出し側で捕捉すること
+@st.cache_resource(show_spinner=False)
+def get_database_manager():
+    return DatabaseManager()
 
-try:
-    news_analyzer_service = NewsAnalyzer()
-except Exception:
-    news_analyzer_service = None
 
-try:
-    news_signal_engine = NewsSignalEngine(news_analyzer_service, database_manager)
-except Exception:
-    news_signal_engine = None
+@st.cache_resource(show_spinner=False)
+def get_news_analyzer_service():
+    return NewsAnalyzer()
+
+
+@st.cache_resource(show_spinner=False)
+def get_news_signal_engine():
+    return NewsSignalEngine(get_news_analyzer_service(), get_database_manager())
+
+
+@st.cache_resource(show_spinner=False)
+def get_uptrend_selector():
+    return UptrendSelector(get_news_signal_engine())
 
-try:
-    uptrend_selector = UptrendSelector(news_signal_engine)
-except Exception:
-    uptrend_selector = None
 
 # セッション状態の初期化
 query_params = {}
@@ -1119,6 +1124,11 @@ def render_news_insights_page():
     # MCP 用の描画完了マーカー（安定待機のため）
     st.markdown("<div data-testid='news-view-ready'></div>", unsafe_allow_html=True)
 
+    try:
+        news_signal_engine = get_news_signal_engine()
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"ニュース分析モジュールの初期化に失敗しました: {e}")
+        news_signal_engine = None
     if not news_signal_engine or not hasattr(news_signal_engine, 'generate_news_signals'):
         st.info("ニュース分析モジュールを利用できません。依存モジュールのインストール状況を確認してください。")
         return
@@ -1237,6 +1247,11 @@ def render_news_insights_page():
     st.dataframe(df_display, use_container_width=True)
 
     candidates = []
+    try:
+        uptrend_selector = get_uptrend_selector()
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"上昇候補セレクタの初期化に失敗しました: {e}")
+        uptrend_selector = None
     if uptrend_selector and hasattr(uptrend_selector, 'rank_from_signals'):
         try:
             candidates = uptrend_selector.rank_from_signals(signals, top_n=5)
@@ -2591,7 +2606,7 @@ def render_realtime_page():
                         )
                         
                         # アラートルールを作成
-                        rule_id = f"rule_{int(time.time())}"
+                        rule_id = f"rule_{uuid.uuid4().hex[:12]}"
                         rule = AlertRule(
                             id=rule_id,
                             name=rule_name or f"アラート {alert_symbol}",
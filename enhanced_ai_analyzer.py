@@ -478,11 +478,14 @@ class EnhancedAIAnalyzer:
             
             patterns = {}
             
+            # Daily returns are shared by the volatility and volume analyses
+            returns = data['Close'].pct_change()
+            
             # Trend analysis
             patterns['trend'] = self._analyze_trend(data)
             
             # Volatility analysis
-            patterns['volatility'] = self._analyze_volatility(data)
+            patterns['volatility'] = self._analyze_volatility(data, returns=returns)
             
             # Support and resistance levels
             patterns['support_resistance'] = self._find_support_resistance(data)
@@ -491,7 +494,7 @@ class EnhancedAIAnalyzer:
             patterns['chart_patterns'] = self._detect_chart_patterns(data)
             
             # Volume analysis
-            patterns['volume_patterns'] = self._analyze_volume_patterns(data)
+            patterns['volume_patterns'] = self._analyze_volume_patterns(data, returns=returns)
             
             return patterns
             
@@ -527,9 +530,12 @@ class EnhancedAIAnalyzer:
             'consistency': 'consistent' if short_direction == long_direction else 'mixed'
         }
     
-    def _analyze_volatility(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_volatility(self, data: pd.DataFrame,
+                            returns: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Analyze price volatility"""
-        returns = data['Close'].pct_change().dropna()
+        if returns is None:
+            returns = data['Close'].pct_change()
+        returns = returns.dropna()
         
         # Current volatility (20 days)
         current_vol = returns.tail(20).std()
@@ -594,21 +600,20 @@ class EnhancedAIAnalyzer:
         
         return patterns
     
-    def _analyze_volume_patterns(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_volume_patterns(self, data: pd.DataFrame,
+                                 returns: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Analyze volume patterns"""
         if 'Volume' not in data.columns:
             return {'error': 'Volume data not available'}
         
         volume = data['Volume']
-        prices = data['Close']
         
-        # Volume trend
-        volume_ma = volume.rolling(20).mean()
+        # Volume trend (only the latest 20-bar average is needed)
         current_volume = volume.iloc[-1]
-        avg_volume = volume_ma.iloc[-1]
+        avg_volume = volume.iloc[-20:].mean() if len(volume) >= 20 else np.nan
         
         # Price-volume relationship
-        price_change = prices.pct_change()
+        price_change = returns if returns is not None else data['Close'].pct_change()
         volume_change = volume.pct_change()
         correlation = price_change.corr(volume_change)
         
@@ -259,7 +259,7 @@ class EnhancedStockAnalysisApp:
             
             model_type = st.selectbox(
                 "使用モデル",
-                options=['ensemble', 'random_forest', 'gradient_boosting', 'neural_network'],
+                options=['ensemble', 'random_forest', 'gradient_boosting', 'hist_gbm'],
                 index=0
             )
             
@@ -22,6 +22,171 @@ import yfinance as yf
 import warnings
 warnings.filterwarnings('ignore')
 
+# JIT Compilation (optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _rolling_mean_std(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """1パスでローリング平均・標準偏差 (ddof=1) を計算 (NaN を含む窓は NaN)"""
+    n = values.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if period < 2 or n < period:
+        return mean, std
+
+    shift = 0.0
+    s1 = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(period - 1, n):
+        start = i - period + 1
+        if start % period == 0:
+            # 累積誤差を抑えるため、period ごとに窓平均を原点として和を再計算
+            nan_count = 0
+            total = 0.0
+            for j in range(start, i + 1):
+                if np.isnan(values[j]):
+                    nan_count += 1
+                else:
+                    total += values[j]
+            shift = total / max(period - nan_count, 1)
+            s1 = 0.0
+            s2 = 0.0
+            for j in range(start, i + 1):
+                y = values[j]
+                if not np.isnan(y):
+                    y -= shift
+                    s1 += y
+                    s2 += y * y
+        else:
+            y = values[i]
+            if np.isnan(y):
+                nan_count += 1
+            else:
+                y -= shift
+                s1 += y
+                s2 += y * y
+            y = values[start - 1]
+            if np.isnan(y):
+                nan_count -= 1
+            else:
+                y -= shift
+                s1 -= y
+                s2 -= y * y
+
+        if nan_count > 0:
+            continue
+
+        mean[i] = shift + s1 / period
+        var = (s2 - s1 * s1 / period) / (period - 1)
+        std[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+    return mean, std
+
+def _rolling_min_max(low: np.ndarray, high: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """単調デックで low のローリング最小値と high のローリング最大値を同時に計算"""
+    n = low.shape[0]
+    low_min = np.full(n, np.nan)
+    high_max = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return low_min, high_max
+
+    min_deque = np.empty(n, dtype=np.int64)
+    max_deque = np.empty(n, dtype=np.int64)
+    min_head = 0
+    min_tail = 0
+    max_head = 0
+    max_tail = 0
+    low_nans = 0
+    high_nans = 0
+    for i in range(n):
+        if np.isnan(low[i]):
+            low_nans += 1
+        else:
+            while min_tail > min_head and low[min_deque[min_tail - 1]] >= low[i]:
+                min_tail -= 1
+            min_deque[min_tail] = i
+            min_tail += 1
+        if np.isnan(high[i]):
+            high_nans += 1
+        else:
+            while max_tail > max_head and high[max_deque[max_tail - 1]] <= high[i]:
+                max_tail -= 1
+            max_deque[max_tail] = i
+            max_tail += 1
+
+        start = i - period + 1
+        if start > 0:
+            # 窓から外れた要素を除去
+            if np.isnan(low[start - 1]):
+                low_nans -= 1
+            if np.isnan(high[start - 1]):
+                high_nans -= 1
+        while min_tail > min_head and min_deque[min_head] < start:
+            min_head += 1
+        while max_tail > max_head and max_deque[max_head] < start:
+            max_head += 1
+
+        if start >= 0:
+            if low_nans == 0:
+                low_min[i] = low[min_deque[min_head]]
+            if high_nans == 0:
+                high_max[i] = high[max_deque[max_head]]
+
+    return low_min, high_max
+
+def _wilder_rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder の平滑化による RSI (pandas の ewm(alpha=1/period, adjust=False) と同じ漸化式)"""
+    n = values.shape[0]
+    rsi = np.full(n, np.nan)
+    if n < 2:
+        return rsi
+
+    alpha = 1.0 / period
+    decay = 1.0 - alpha
+    avg_gain = np.nan
+    avg_loss = np.nan
+    old_wt = 1.0
+    nobs = 0
+    for i in range(1, n):
+        delta = values[i] - values[i - 1]
+        is_obs = not np.isnan(delta)
+        if is_obs:
+            nobs += 1
+        if not np.isnan(avg_gain):
+            # 欠損区間では直前の平均の重みだけを減衰させる
+            old_wt *= decay
+            if is_obs:
+                gain = delta if delta > 0.0 else 0.0
+                loss = -delta if delta < 0.0 else 0.0
+                if avg_gain != gain:
+                    avg_gain = (old_wt * avg_gain + alpha * gain) / (old_wt + alpha)
+                if avg_loss != loss:
+                    avg_loss = (old_wt * avg_loss + alpha * loss) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            avg_gain = delta if delta > 0.0 else 0.0
+            avg_loss = -delta if delta < 0.0 else 0.0
+
+        if nobs < period:
+            continue
+        if avg_loss == 0.0:
+            # 0 除算を避ける (pandas と同様に 上昇のみ → 100、変動なし → NaN)
+            if avg_gain > 0.0:
+                rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
+
+if NUMBA_AVAILABLE:
+    _rolling_mean_std = njit(cache=True)(_rolling_mean_std)
+    _rolling_min_max = njit(cache=True)(_rolling_min_max)
+    _wilder_rsi = njit(cache=True)(_wilder_rsi)
+
 @dataclass
 class MLPrediction:
     """機械学習予測結果クラス"""
@@ -95,9 +260,12 @@ class FeatureEngineer:
             df['Volume_MA_5'] = df['Volume'].rolling(window=5).mean()
             df['Volume_ratio'] = df['Volume'] / df['Volume_MA_5']
             
-            # 価格位置
-            df['Price_position_5d'] = (df['Close'] - df['Low'].rolling(window=5).min()) / (df['High'].rolling(window=5).max() - df['Low'].rolling(window=5).min())
-            df['Price_position_10d'] = (df['Close'] - df['Low'].rolling(window=10).min()) / (df['High'].rolling(window=10).max() - df['Low'].rolling(window=10).min())
+            # 価格位置 (期間ごとに安値の最小値・高値の最大値を1回だけ計算)
+            close = df['Close'].to_numpy(dtype=np.float64)
+            for window in (5, 10):
+                low_min, high_max = self._rolling_low_high(df, window)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    df[f'Price_position_{window}d'] = (close - low_min) / (high_max - low_min)
             
             return df
             
@@ -166,35 +334,66 @@ class FeatureEngineer:
             self.logger.error(f"市場特徴量作成エラー: {e}")
             return df
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """RSIを計算"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
+    @staticmethod
+    def _calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
+        """RSIを計算 (Wilder の平滑化)"""
+        values = prices.to_numpy(dtype=np.float64)
+        if NUMBA_AVAILABLE:
+            return pd.Series(_wilder_rsi(values, period), index=prices.index)
+        
+        delta = np.diff(values, prepend=np.nan)
+        
+        # Wilder の移動平均は alpha=1/period の指数平滑と等価
+        smoothed = pd.DataFrame(
+            {'gain': np.maximum(delta, 0.0), 'loss': np.maximum(-delta, 0.0)},
+            index=prices.index
+        ).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+        
+        rs = smoothed['gain'] / smoothed['loss']
         rsi = 100 - (100 / (1 + rs))
         return rsi
     
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series]:
+    @staticmethod
+    def _calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series]:
         """MACDを計算"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
+        ema_fast = prices.ewm(span=fast, adjust=False).mean()
+        ema_slow = prices.ewm(span=slow, adjust=False).mean()
         macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
+        macd_signal = macd.ewm(span=signal, adjust=False).mean()
         return macd, macd_signal
     
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2) -> Tuple[pd.Series, pd.Series]:
+    @staticmethod
+    def _calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: float = 2) -> Tuple[pd.Series, pd.Series]:
         """ボリンジャーバンドを計算"""
-        ma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+        if NUMBA_AVAILABLE:
+            ma_values, std_values = _rolling_mean_std(prices.to_numpy(dtype=np.float64), period)
+            ma = pd.Series(ma_values, index=prices.index)
+            std = pd.Series(std_values, index=prices.index)
+        else:
+            ma = prices.rolling(window=period).mean()
+            std = prices.rolling(window=period).std()
         upper = ma + (std * std_dev)
         lower = ma - (std * std_dev)
         return upper, lower
     
-    def _calculate_stochastic(self, df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> Tuple[pd.Series, pd.Series]:
+    @staticmethod
+    def _rolling_low_high(df: pd.DataFrame, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """安値のローリング最小値と高値のローリング最大値"""
+        if NUMBA_AVAILABLE:
+            return _rolling_min_max(
+                df['Low'].to_numpy(dtype=np.float64), df['High'].to_numpy(dtype=np.float64), window
+            )
+        return (
+            df['Low'].rolling(window=window).min().to_numpy(dtype=np.float64),
+            df['High'].rolling(window=window).max().to_numpy(dtype=np.float64)
+        )
+    
+    @staticmethod
+    def _calculate_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> Tuple[pd.Series, pd.Series]:
         """ストキャスティクスを計算"""
-        low_min = df['Low'].rolling(window=k_period).min()
-        high_max = df['High'].rolling(window=k_period).max()
+        low_values, high_values = FeatureEngineer._rolling_low_high(df, k_period)
+        low_min = pd.Series(low_values, index=df.index)
+        high_max = pd.Series(high_values, index=df.index)
         k_percent = 100 * ((df['Close'] - low_min) / (high_max - low_min))
         d_percent = k_percent.rolling(window=d_period).mean()
         return k_percent, d_percent
@@ -453,18 +652,102 @@ class MLModelManager:
 class TechnicalAnalyzer:
     """テクニカル分析クラス"""
     
+    # 最新値の計算に使う足数 (最長の MA_50 に加え、RSI/MACD の指数平滑が収束する長さ)
+    LOOKBACK_BARS = 250
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.feature_engineer = FeatureEngineer()
     
-    def analyze_symbol(self, df: pd.DataFrame) -> List[TechnicalIndicator]:
+    def analyze_symbol(self, df: pd.DataFrame, tail_only: bool = True) -> List[TechnicalIndicator]:
         """銘柄のテクニカル分析を実行"""
         try:
             indicators = []
             
+            # 最新行しか参照しないので、必要な末尾だけで特徴量を計算
+            if tail_only:
+                df = df.iloc[-self.LOOKBACK_BARS:]
+            
             # 特徴量を計算
             df_features = self.feature_engineer.create_technical_features(df)
-            latest = df_features.iloc[-1]
+            return self._build_indicators(df_features.iloc[-1])
+            
+        except Exception as e:
+            self.logger.error(f"テクニカル分析エラー: {e}")
+            return []
+    
+    def analyze_batch(self, close_matrix: np.ndarray, high_matrix: np.ndarray, low_matrix: np.ndarray,
+                      symbols: List[str], tail_only: bool = True) -> Dict[str, List[TechnicalIndicator]]:
+        """複数銘柄のテクニカル分析を (T, N) 行列で一括実行 (列が銘柄)"""
+        try:
+            close = np.asarray(close_matrix, dtype=np.float64)
+            high = np.asarray(high_matrix, dtype=np.float64)
+            low = np.asarray(low_matrix, dtype=np.float64)
+            if tail_only:
+                close = close[-self.LOOKBACK_BARS:]
+                high = high[-self.LOOKBACK_BARS:]
+                low = low[-self.LOOKBACK_BARS:]
+            
+            latest = self._latest_values_batch(close)
+            
+            # 銘柄ごとに行うのはスカラーの取り出しとシグナル判定だけ
+            return {
+                symbol: self._build_indicators({name: values[j] for name, values in latest.items()})
+                for j, symbol in enumerate(symbols)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"一括テクニカル分析エラー: {e}")
+            return {}
+    
+    def _latest_values_batch(self, close: np.ndarray, rsi_period: int = 14,
+                             bb_period: int = 20, bb_std: float = 2) -> Dict[str, np.ndarray]:
+        """各列の最新時点の指標値を列方向の一括演算で計算"""
+        n_rows, n_cols = close.shape
+        nan_row = np.full(n_cols, np.nan)
+        
+        def last_window(window: int) -> Optional[np.ndarray]:
+            # (N, window) の最新ウィンドウ (データ不足なら None)
+            if n_rows < window:
+                return None
+            return np.lib.stride_tricks.sliding_window_view(close, window, axis=0)[-1]
+        
+        values: Dict[str, np.ndarray] = {'Close': close[-1]}
+        for window in (5, 20):
+            tail = last_window(window)
+            values[f'MA_{window}'] = nan_row if tail is None else tail.mean(axis=1)
+        
+        # RSI (Wilder の平滑化を列ごとに ewm で計算)
+        delta = np.diff(close, axis=0, prepend=np.full((1, n_cols), np.nan))
+        smoothing = dict(alpha=1.0 / rsi_period, adjust=False, min_periods=rsi_period)
+        avg_gain = pd.DataFrame(np.maximum(delta, 0.0)).ewm(**smoothing).mean().to_numpy()[-1]
+        avg_loss = pd.DataFrame(np.maximum(-delta, 0.0)).ewm(**smoothing).mean().to_numpy()[-1]
+        
+        # MACD
+        frame = pd.DataFrame(close)
+        macd = frame.ewm(span=12, adjust=False).mean() - frame.ewm(span=26, adjust=False).mean()
+        macd_signal = macd.ewm(span=9, adjust=False).mean()
+        values['MACD'] = macd.to_numpy()[-1]
+        values['MACD_signal'] = macd_signal.to_numpy()[-1]
+        
+        # ボリンジャーバンド位置
+        tail = last_window(bb_period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values['RSI'] = 100 - (100 / (1 + avg_gain / avg_loss))
+            if tail is None:
+                values['BB_position'] = nan_row
+            else:
+                ma = tail.mean(axis=1)
+                std = tail.std(axis=1, ddof=1)
+                lower = ma - std * bb_std
+                values['BB_position'] = (close[-1] - lower) / (2 * std * bb_std)
+        
+        return values
+    
+    def _build_indicators(self, latest: Any) -> List[TechnicalIndicator]:
+        """最新の指標値からシグナルを判定"""
+        try:
+            indicators = []
             
             # RSI分析
             rsi = latest.get('RSI', 50)
@@ -549,7 +832,7 @@ class TechnicalAnalyzer:
             return indicators
             
         except Exception as e:
-            self.logger.error(f"テクニカル分析エラー: {e}")
+            self.logger.error(f"シグナル判定エラー: {e}")
             return []
 
 class EnhancedMLAnalyzer:
@@ -1,7 +1,7 @@
 import logging
 import traceback
 import functools
-from typing import Any, Callable, Optional, Union, Dict
+from typing import Any, Callable, Optional, Union, Dict, List, Tuple
 from datetime import datetime
 import json
 import os
@@ -91,6 +91,9 @@ class ErrorHandler:
         self.logger = logging.getLogger(__name__)
         self._error_count = 0
         self._max_errors_per_session = 1000
+        # 解析済みエラーログと、そのときのファイル状態 (更新時刻, サイズ)
+        self._error_log_cache: List[Dict] = []
+        self._error_log_stat: Optional[Tuple[int, int]] = None
     
     def handle_error(self, error: Exception, context: Dict = None) -> Dict:
         """エラーを処理"""
@@ -141,20 +144,29 @@ class ErrorHandler:
         except Exception as e:
             self.logger.critical(f"エラーログ記録に失敗: {e}")
     
+    def _read_error_log(self) -> List[Dict]:
+        """エラーログを読み込み (前回からファイルが変わっていなければ解析済みの内容を返す)"""
+        try:
+            stat = os.stat(self.error_log_file)
+        except FileNotFoundError:
+            return []
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key != self._error_log_stat:
+            if stat.st_size == 0:
+                error_log = []
+            else:
+                with open(self.error_log_file, 'r', encoding='utf-8') as f:
+                    error_log = json.load(f)
+            self._error_log_cache = error_log
+            self._error_log_stat = key
+        return self._error_log_cache
+    
     def _save_error(self, error_info: Dict):
         """エラーをファイルに保存"""
         try:
-            # エラーログファイルが存在しない場合は作成
-            if not os.path.exists(self.error_log_file):
-                with open(self.error_log_file, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
-            
-            # 既存のエラーログを読み込み
-            with open(self.error_log_file, 'r', encoding='utf-8') as f:
-                error_log = json.load(f)
-            
-            # 新しいエラーを追加
-            error_log.append(error_info)
+            # 既存のエラーログに新しいエラーを追加 (キャッシュは書き込み成功後に差し替える)
+            error_log = self._read_error_log() + [error_info]
             
             # 最新1000件のみ保持
             if len(error_log) > 1000:
@@ -163,6 +175,10 @@ class ErrorHandler:
             # ファイルに保存
             with open(self.error_log_file, 'w', encoding='utf-8') as f:
                 json.dump(error_log, f, ensure_ascii=False, indent=2)
+            
+            stat = os.stat(self.error_log_file)
+            self._error_log_cache = error_log
+            self._error_log_stat = (stat.st_mtime_ns, stat.st_size)
                 
         except Exception as e:
             self.logger.critical(f"エラーファイル保存に失敗: {e}")
@@ -170,12 +186,10 @@ class ErrorHandler:
     def get_error_statistics(self) -> Dict:
         """エラー統計情報を取得"""
         try:
-            if not os.path.exists(self.error_log_file):
+            error_log = self._read_error_log()
+            if not error_log and not os.path.exists(self.error_log_file):
                 return {'total_errors': 0, 'error_types': {}, 'recent_errors': []}
             
-            with open(self.error_log_file, 'r', encoding='utf-8') as f:
-                error_log = json.load(f)
-            
             # エラー種別の集計
             error_types = {}
             for error in error_log:
@@ -202,6 +216,8 @@ class ErrorHandler:
             if os.path.exists(self.error_log_file):
                 os.remove(self.error_log_file)
             self._error_count = 0
+            self._error_log_cache = []
+            self._error_log_stat = None
             self.logger.info("エラーログをクリアしました")
         except Exception as e:
             self.logger.error(f"エラーログクリアに失敗: {e}")
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from scipy.optimize import minimize
 import warnings
@@ -69,7 +69,7 @@ class PortfolioAnalyzer:
                 'portfolio_metrics': portfolio_metrics,
                 'weights': weights,
                 'symbols': symbols,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -182,7 +182,7 @@ class PortfolioAnalyzer:
                 'correlation_interpretation': correlation_interpretation,
                 'diversification_benefit': diversification_benefit,
                 'symbols': symbols,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -323,7 +323,7 @@ class PortfolioAnalyzer:
                 'optimization_type': 'max_sharpe' if target_return is None else 'min_variance_target_return',
                 'target_return': target_return,
                 'symbols': symbols,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -476,7 +476,7 @@ class PortfolioAnalyzer:
                 'min_volatility_portfolio': min_volatility_portfolio,
                 'target_returns': target_returns.tolist(),
                 'symbols': symbols,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -519,7 +519,7 @@ class PortfolioAnalyzer:
                 'correlation_analysis': correlation_analysis,
                 'optimization_result': optimization_result,
                 'efficient_frontier': efficient_frontier,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
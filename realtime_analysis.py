@@ -14,10 +14,35 @@ import threading
 import time
 import queue
 from concurrent.futures import ThreadPoolExecutor
-import yfinance as yf
 from collections import deque
 import json
 
+# シグナル状態 (0: 買い, 1: 中立, 2: 売り) ごとのラベルと説明
+_SIGNAL_LABELS = ('buy', 'hold', 'sell')
+_RSI_DESCRIPTIONS = ('RSI過売り', 'RSI中立', 'RSI過買い')
+_BOLLINGER_DESCRIPTIONS = ('ボリンジャーバンド下限', 'ボリンジャーバンド内', 'ボリンジャーバンド上限')
+_STOCHASTIC_DESCRIPTIONS = ('ストキャスティクス過売り', 'ストキャスティクス中立', 'ストキャスティクス過買い')
+
+# 0-100 オシレーターの過売り / 過買い境界 (境界値ちょうどは中立)
+_RSI_BOUNDS = (30.0, 70.0)
+_STOCHASTIC_BOUNDS = (20.0, 80.0)
+
+def _signal_entry(state: int, strength: float, descriptions: Tuple[str, str, str]) -> Dict[str, Any]:
+    """状態インデックスからシグナル辞書を作成"""
+    return {'signal': _SIGNAL_LABELS[state], 'strength': strength, 'description': descriptions[state]}
+
+def _oscillator_entry(state: int, value: float, bounds: Tuple[float, float],
+                      descriptions: Tuple[str, str, str]) -> Dict[str, Any]:
+    """オシレーターのシグナル辞書を作成 (強度は境界の外側の幅で正規化)"""
+    lower, upper = bounds
+    if state == 0:
+        strength = min(1.0, (lower - value) / lower)
+    elif state == 2:
+        strength = min(1.0, (value - upper) / (100.0 - upper))
+    else:
+        strength = 0.0
+    return _signal_entry(state, strength, descriptions)
+
 @dataclass
 class RealtimeAnalysisResult:
     """リアルタイム分析結果クラス"""
@@ -329,12 +354,14 @@ class RealtimeAnalyzer:
     
     def _get_rsi_signal(self, rsi: float) -> Dict[str, Any]:
         """RSIシグナルを生成"""
-        if rsi < 30:
-            return {'signal': 'buy', 'strength': min(1.0, (30 - rsi) / 30), 'description': 'RSI過売り'}
-        elif rsi > 70:
-            return {'signal': 'sell', 'strength': min(1.0, (rsi - 70) / 30), 'description': 'RSI過買い'}
+        lower, upper = _RSI_BOUNDS
+        if rsi < lower:
+            state = 0
+        elif rsi > upper:
+            state = 2
         else:
-            return {'signal': 'hold', 'strength': 0.0, 'description': 'RSI中立'}
+            state = 1
+        return _oscillator_entry(state, rsi, _RSI_BOUNDS, _RSI_DESCRIPTIONS)
     
     def _get_ma_signal(self, ma_5: float, ma_20: float) -> Dict[str, Any]:
         """移動平均シグナルを生成"""
@@ -349,12 +376,10 @@ class RealtimeAnalyzer:
     
     def _get_bollinger_signal(self, price: float, upper: float, lower: float) -> Dict[str, Any]:
         """ボリンジャーバンドシグナルを生成"""
-        if price <= lower:
-            return {'signal': 'buy', 'strength': min(1.0, (lower - price) / lower), 'description': 'ボリンジャーバンド下限'}
-        elif price >= upper:
-            return {'signal': 'sell', 'strength': min(1.0, (price - upper) / upper), 'description': 'ボリンジャーバンド上限'}
-        else:
-            return {'signal': 'hold', 'strength': 0.0, 'description': 'ボリンジャーバンド内'}
+        state = 0 if price <= lower else 1 + int(price >= upper)
+        band = (lower, None, upper)[state]
+        strength = 0.0 if band is None else min(1.0, abs(price - band) / band)
+        return _signal_entry(state, strength, _BOLLINGER_DESCRIPTIONS)
     
     def _get_macd_signal(self, macd: float, macd_signal: float) -> Dict[str, Any]:
         """MACDシグナルを生成"""
@@ -365,12 +390,14 @@ class RealtimeAnalyzer:
     
     def _get_stochastic_signal(self, k: float, d: float) -> Dict[str, Any]:
         """ストキャスティクスシグナルを生成"""
-        if k < 20 and d < 20:
-            return {'signal': 'buy', 'strength': min(1.0, (20 - k) / 20), 'description': 'ストキャスティクス過売り'}
-        elif k > 80 and d > 80:
-            return {'signal': 'sell', 'strength': min(1.0, (k - 80) / 20), 'description': 'ストキャスティクス過買い'}
+        lower, upper = _STOCHASTIC_BOUNDS
+        if k < lower and d < lower:
+            state = 0
+        elif k > upper and d > upper:
+            state = 2
         else:
-            return {'signal': 'hold', 'strength': 0.0, 'description': 'ストキャスティクス中立'}
+            state = 1
+        return _oscillator_entry(state, k, _STOCHASTIC_BOUNDS, _STOCHASTIC_DESCRIPTIONS)
     
     def _analyze_volume(self) -> Dict[str, Any]:
         """ボリューム分析"""
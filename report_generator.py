@@ -256,10 +256,10 @@ class ChartGenerator:
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """MACDを計算"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
+        ema_fast = prices.ewm(span=fast, adjust=False).mean()
+        ema_slow = prices.ewm(span=slow, adjust=False).mean()
         macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
+        macd_signal = macd.ewm(span=signal, adjust=False).mean()
         macd_histogram = macd - macd_signal
         return macd, macd_signal, macd_histogram
 
@@ -341,10 +341,10 @@ class DataAnalyzer:
             
             # MACD
             if len(data) >= 26:
-                ema_12 = data['Close'].ewm(span=12).mean()
-                ema_26 = data['Close'].ewm(span=26).mean()
+                ema_12 = data['Close'].ewm(span=12, adjust=False).mean()
+                ema_26 = data['Close'].ewm(span=26, adjust=False).mean()
                 macd = ema_12 - ema_26
-                macd_signal = macd.ewm(span=9).mean()
+                macd_signal = macd.ewm(span=9, adjust=False).mean()
                 indicators['macd'] = macd.iloc[-1]
                 indicators['macd_signal'] = macd_signal.iloc[-1]
             
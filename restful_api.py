@@ -621,29 +621,26 @@ async def get_chart_data(
                 detail="Stock data not found"
             )
         
-        # チャートタイプに応じてデータを生成
-        if chart_type == "candlestick":
-            chart = advanced_visualization['chart_generator'].create_candlestick_chart(
-                stock_data.data
-            )
-        elif chart_type == "volume":
-            chart = advanced_visualization['chart_generator'].create_volume_chart(
-                stock_data.data
-            )
-        elif chart_type == "technical":
-            chart = advanced_visualization['chart_generator'].create_technical_indicators_chart(
-                stock_data.data
-            )
-        else:
+        # チャートタイプに応じてデータを生成 (同じデータなら直列化済みの JSON を再利用)
+        chart_types = {
+            "candlestick": "candlestick",
+            "volume": "volume",
+            "technical": "technical_indicators"
+        }
+        if chart_type not in chart_types:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid chart type"
             )
         
+        chart_json = advanced_visualization['chart_generator'].create_chart_json(
+            chart_types[chart_type], stock_data.data
+        )
+        
         return APIResponse(
             success=True,
             message="Chart data retrieved successfully",
-            data=chart.to_json()
+            data=chart_json
         )
     except Exception as e:
         raise HTTPException(
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import yfinance as yf
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from scipy import stats
 import warnings
@@ -20,7 +21,7 @@ class RiskAnalyzer:
                 return None
             
             data = stock_data['data']
-            if data.empty or len(data) < 30:
+            if data.shape[0] < 30:
                 return None
             
             close = data['Close']
@@ -62,7 +63,7 @@ class RiskAnalyzer:
                 'max_drawdown': max_drawdown,
                 'sharpe_ratio': sharpe_ratio,
                 'volatility': std_return * np.sqrt(252),  # 年率ボラティリティ
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -156,7 +157,7 @@ class RiskAnalyzer:
                 return None
             
             data = stock_data['data']
-            if data.empty or len(data) < 30:
+            if data.shape[0] < 30:
                 return None
             
             # 日経平均のデータを取得
@@ -216,7 +217,7 @@ class RiskAnalyzer:
                         'systematic_percentage': (systematic_risk / stock_variance) * 100 if stock_variance > 0 else 0,
                         'unsystematic_percentage': (unsystematic_risk / stock_variance) * 100 if stock_variance > 0 else 0
                     },
-                    'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'analysis_date': datetime.now().isoformat(' ', 'seconds')
                 }
                 
             except Exception as e:
@@ -272,7 +273,7 @@ class RiskAnalyzer:
                 return None
             
             data = stock_data['data']
-            if data.empty or len(data) < 20:
+            if data.shape[0] < 20:
                 return None
             
             volume = data['Volume']
@@ -311,7 +312,7 @@ class RiskAnalyzer:
                 'risk_factors': self._identify_liquidity_risks(
                     avg_volume, volume_volatility, volume_trend, price_impact
                 ),
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -507,7 +508,7 @@ class RiskAnalyzer:
                 'risk_description': risk_desc,
                 'credit_rating': rating,
                 'risk_factors': self._identify_credit_risks(debt_ratio, roe, pe_ratio, pb_ratio),
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -612,7 +613,7 @@ class RiskAnalyzer:
                 'beta_analysis': beta_analysis,
                 'liquidity_analysis': liquidity_analysis,
                 'credit_analysis': credit_analysis,
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': datetime.now().isoformat(' ', 'seconds')
             }
             
         except Exception as e:
@@ -1,13 +1,23 @@
 """Tests for realtime enhancements in AdvancedAlertSystem."""
 
+import asyncio
+import gc
+import os
+import sqlite3
+import tempfile
+import threading
 import unittest
 from datetime import datetime, timedelta
 
+import advanced_alert_system
 from advanced_alert_system import (
     AdvancedAlertSystem,
     AlertCondition,
     AlertType,
-    AlertDatabase
+    AlertDatabase,
+    AlertRule,
+    AlertSeverity,
+    AlertTrigger
 )
 
 
@@ -15,10 +25,10 @@ class TestAdvancedAlertRealtime(unittest.TestCase):
     """Validate realtime snapshot ingestion and new alert types."""
 
     def setUp(self):
-        self.system = AdvancedAlertSystem()
-        # Use in-memory DB for isolation
-        self.system.database = AlertDatabase(':memory:')
-        self.system.alert_rules = {}
+        # Use a temporary database so tests never touch ./alerts.db
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.system = AdvancedAlertSystem(AlertDatabase(os.path.join(tmpdir.name, 'alerts.db')))
         self.symbol = 'TEST.T'
         self.base_time = datetime.now()
         self.system.realtime_history.clear()
@@ -27,6 +37,30 @@ class TestAdvancedAlertRealtime(unittest.TestCase):
     def tearDown(self):
         self.system.stop_monitoring()
 
+    def _make_condition(self, threshold=100.0, operator='>', symbol=None,
+                        alert_type=AlertType.PRICE_ABOVE, time_window=0):
+        return AlertCondition(
+            symbol=symbol or self.symbol,
+            alert_type=alert_type,
+            condition=f'Price {operator} {threshold}',
+            threshold_value=threshold,
+            comparison_operator=operator,
+            time_window=time_window
+        )
+
+    def _make_rule(self, rule_id='rule-1', conditions=None, **overrides):
+        fields = dict(
+            id=rule_id,
+            name='price rule',
+            description='',
+            conditions=conditions if conditions is not None else [],
+            severity=AlertSeverity.LOW,
+            notification_channels=[],
+            cooldown_period=0
+        )
+        fields.update(overrides)
+        return AlertRule(**fields)
+
     def _update_snapshots(self, prices, volumes=None, vwap=None, start_offset=0):
         volumes = volumes or [1000] * len(prices)
         for idx, price in enumerate(prices):
@@ -50,6 +84,8 @@ class TestAdvancedAlertRealtime(unittest.TestCase):
 
         self.assertAlmostEqual(data['price'], 101.2)
         self.assertEqual(len(history), 2)
+        # Latest snapshot is shared with history rather than copied per read
+        self.assertIs(data, history[-1])
 
     def test_vwap_deviation_condition_triggers(self):
         """VWAP deviation alert should trigger on large gap."""
@@ -108,6 +144,267 @@ class TestAdvancedAlertRealtime(unittest.TestCase):
         self.assertIsNotNone(momentum_value)
         self.assertGreater(momentum_value, 4.0)
 
+    def test_volume_spike_uses_prior_volume_baseline(self):
+        """Volume spike rate should compare against the mean of earlier volumes."""
+        self._update_snapshots([100.0, 100.5, 101.0, 101.5], volumes=[1000, 2000, 3000, 8000])
+
+        data = self.system._get_symbol_data(self.symbol)
+        history = self.system._get_symbol_history(self.symbol)
+
+        rate = self.system._calculate_volume_rate(data, history, 15)
+        self.assertAlmostEqual(rate, 4.0)
+
+    def test_evaluate_condition_dispatch_and_operators(self):
+        """Alert types and comparison operators should dispatch via lookup tables."""
+        data = {'price': 100.0, 'bid': 99.0, 'ask': 100.0}
+
+        spread_condition = AlertCondition(
+            symbol=self.symbol,
+            alert_type=AlertType.BID_ASK_SPREAD,
+            condition='Spread >= 1',
+            threshold_value=1.0,
+            comparison_operator='>=',
+            time_window=0
+        )
+        value = self.system._evaluate_condition(spread_condition, data, [])
+        self.assertAlmostEqual(value, 1.0101, places=4)
+
+        equal_condition = AlertCondition(
+            symbol=self.symbol,
+            alert_type=AlertType.CUSTOM_CONDITION,
+            condition='Price == 100',
+            threshold_value=100.0,
+            comparison_operator='==',
+            time_window=0
+        )
+        self.assertEqual(self.system._evaluate_condition(equal_condition, data, []), 100.0)
+
+        equal_condition.comparison_operator = '~'
+        self.assertIsNone(self.system._evaluate_condition(equal_condition, data, []))
+
+    def test_rules_share_symbol_data_within_a_check_cycle(self):
+        """Rules on the same symbol should fetch its data once per cycle."""
+        calls = []
+
+        def data_source():
+            calls.append(1)
+            return {'price': 105.0}
+
+        self.system.update_data_source('SRC.T', data_source)
+        rules = [
+            self._make_rule(f'rule-{idx}', [self._make_condition(threshold, symbol='SRC.T')])
+            for idx, threshold in enumerate((100.0, 110.0))
+        ]
+
+        symbol_cache = {}
+        results = [self.system._check_rule_conditions(rule, symbol_cache) for rule in rules]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results[0]['current_value'], 105.0)
+        self.assertIsNone(results[1])
+
+    def test_price_alert_batch_matches_scalar_evaluation(self):
+        """Batch price checks should agree with per-condition evaluation."""
+        prices = {'AAA.T': 100.0, 'BBB.T': 50.0}
+        cases = [
+            ('AAA.T', '>', 99.0), ('AAA.T', '<', 99.0), ('AAA.T', '>=', 100.0),
+            ('BBB.T', '<=', 49.0), ('BBB.T', '==', 50.0), ('BBB.T', '!=', 50.0),
+            ('CCC.T', '>', 0.0)
+        ]
+        for idx, (symbol, op, threshold) in enumerate(cases):
+            self.system.alert_rules[f'rule-{idx}'] = self._make_rule(f'rule-{idx}', [
+                self._make_condition(threshold, op, symbol, alert_type=AlertType.PRICE_BELOW)
+            ])
+
+        matched = self.system.check_price_alerts_batch(prices, trigger=False)
+
+        expected = [
+            rule.id for rule in self.system.alert_rules.values()
+            if rule.conditions[0].symbol in prices and self.system._evaluate_condition(
+                rule.conditions[0], {'price': prices[rule.conditions[0].symbol]}, []
+            ) is not None
+        ]
+        self.assertEqual([result['rule'].id for result in matched], expected)
+        self.assertEqual(expected, ['rule-0', 'rule-2', 'rule-4'])
+
+    def test_triggers_are_persisted_without_monitoring(self):
+        """Triggered alerts should reach the database even if monitoring never started."""
+        condition = self._make_condition()
+        rule = self._make_rule(conditions=[condition], severity=AlertSeverity.HIGH)
+
+        written = []
+        write_batch = self.system._write_batch
+        self.system._write_batch = lambda batch: (written.extend(batch), write_batch(batch))
+
+        # Several triggers within the same second must get distinct IDs
+        for price in (101.0, 102.0, 103.0):
+            self.system._trigger_alert(rule, {
+                'condition': condition,
+                'data': {'price': price},
+                'current_value': price
+            })
+
+        self.assertFalse(self.system.is_running)
+        self.assertTrue(self.system._db_writer_thread.is_alive())
+
+        # Stopping joins the writer and flushes whatever it has not written yet
+        self.system.stop_monitoring()
+        self.assertIsNone(self.system._db_writer_thread)
+        self.assertEqual(len(written), 6)
+        self.assertEqual(len(self.system.database.get_alert_history(self.symbol)), 3)
+
+    def test_trigger_data_is_isolated_from_snapshots(self):
+        """Callbacks mutating trigger data must not alter the cached snapshot or history."""
+        self._update_snapshots([101.0])
+        condition = self._make_condition()
+        rule = self._make_rule(conditions=[condition])
+        fired = []
+
+        def mutate(trigger):
+            fired.append(trigger)
+            trigger.metadata['data']['price'] = 0.0
+
+        self.system.add_alert_callback(mutate)
+        triggered = self.system._check_rule_conditions(rule)
+
+        async def fire():
+            self.system._trigger_alert(rule, triggered)
+
+        # Notifications are scheduled as tasks, so triggering needs a running loop;
+        # use a fresh one on a worker thread in case the test runner already owns one
+        runner = threading.Thread(target=asyncio.run, args=(fire(),))
+        runner.start()
+        runner.join()
+
+        self.assertEqual(len(fired), 1)
+        self.assertEqual(self.system._get_symbol_data(self.symbol)['price'], 101.0)
+        self.assertEqual(self.system._get_symbol_history(self.symbol)[-1]['price'], 101.0)
+
+    def test_wal_is_enabled_only_while_monitoring(self):
+        """Construction must not switch the journal mode; monitoring turns WAL on."""
+        database = self.system.database
+
+        def journal_mode():
+            conn = sqlite3.connect(database.db_path)
+            try:
+                return conn.execute('PRAGMA journal_mode').fetchone()[0]
+            finally:
+                conn.close()
+
+        self.assertEqual(journal_mode(), 'delete')
+
+        self.system.start_monitoring()
+        self.assertTrue(database.wal)
+        self.assertEqual(journal_mode(), 'wal')
+
+        self.system.stop_monitoring()
+        wal_path = database.db_path + '-wal'
+        self.assertTrue(not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0)
+
+    def test_exit_handler_flushes_live_systems_only(self):
+        """One shared exit hook should flush live systems and forget collected ones."""
+        self.assertIn(self.system, advanced_alert_system._LIVE_SYSTEMS)
+        gc.collect()
+        live_before = len(advanced_alert_system._LIVE_SYSTEMS)
+        other = AdvancedAlertSystem(self.system.database)
+        self.assertIn(other, advanced_alert_system._LIVE_SYSTEMS)
+        del other
+        gc.collect()
+        self.assertEqual(len(advanced_alert_system._LIVE_SYSTEMS), live_before)
+
+        trigger = AlertTrigger(
+            id='trigger-exit', rule_id='rule-1', symbol=self.symbol,
+            alert_type=AlertType.PRICE_ABOVE, condition='Price > 100',
+            current_value=101.0, threshold_value=100.0, severity=AlertSeverity.LOW,
+            message='', timestamp=datetime.now(), metadata={}
+        )
+        self.system._write_queue.put_nowait(('trigger', trigger))
+        advanced_alert_system._flush_at_exit()
+
+        history = self.system.database.get_alert_history(self.symbol)
+        self.assertEqual([item.id for item in history], ['trigger-exit'])
+
+    def test_cleanup_old_alerts_deletes_expired_triggers(self):
+        """Triggers older than the retention period should be removed."""
+        now = datetime.now()
+        triggers = [
+            AlertTrigger(
+                id=f'trigger-{days}',
+                rule_id='rule-1',
+                symbol=self.symbol,
+                alert_type=AlertType.PRICE_ABOVE,
+                condition='Price > 100',
+                current_value=101.0,
+                threshold_value=100.0,
+                severity=AlertSeverity.LOW,
+                message='',
+                timestamp=now - timedelta(days=days, microseconds=500),
+                metadata={}
+            )
+            for days in (0, 10, 40, 90)
+        ]
+        self.system.database.save_batch(triggers, [])
+
+        self.assertEqual(self.system.cleanup_old_alerts(days=30), 2)
+        remaining = [trigger.id for trigger in self.system.get_alert_history(self.symbol)]
+        self.assertEqual(remaining, ['trigger-0', 'trigger-10'])
+
+    def test_system_status_tracks_enabled_rules(self):
+        """Enabled rule count should follow add, re-add and remove."""
+        rules = [
+            self._make_rule(f'rule-{idx}', enabled=enabled)
+            for idx, enabled in enumerate((True, True, False))
+        ]
+        for rule in rules:
+            self.assertTrue(self.system.add_alert_rule(rule))
+        self.assertEqual(self.system.get_system_status()['enabled_rules'], 2)
+
+        rules[0].enabled = False
+        self.system.add_alert_rule(rules[0])
+        self.system.remove_alert_rule('rule-1')
+
+        status = self.system.get_system_status()
+        self.assertEqual(status['enabled_rules'], 0)
+        self.assertEqual(status['total_rules'], 2)
+
+    def test_rule_conditions_round_trip_through_database(self):
+        """Rule conditions with enums and datetimes should survive save and load."""
+        condition = self._make_condition(time_window=5)
+        rule = self._make_rule(conditions=[condition], name='価格ルール', severity=AlertSeverity.HIGH)
+
+        database = self.system.database
+        self.assertTrue(database.save_alert_rule(rule))
+
+        loaded = database.load_alert_rules()
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].name, '価格ルール')
+        self.assertEqual(loaded[0].conditions, [condition])
+
+    def test_db_writer_coalesces_writes_within_flush_interval(self):
+        """Writes arriving after the first, within the flush interval, should share one batch."""
+        batches = []
+        stop = threading.Event()
+
+        def write_batch(batch):
+            batches.append(len(batch))
+            stop.set()
+
+        self.system._write_batch = write_batch
+        # The interval never expires here, so the batch closes only on the size
+        # limit and the result does not depend on wall-clock timing
+        self.system.write_flush_interval = 3600
+        self.system.write_batch_size = 4
+
+        self.system._write_queue.put_nowait(('trigger', None))
+        writer = threading.Thread(target=self.system._db_writer, args=(stop,), daemon=True)
+        writer.start()
+        for _ in range(3):
+            self.system._write_queue.put_nowait(('trigger', None))
+
+        writer.join(timeout=10)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(batches, [4])
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
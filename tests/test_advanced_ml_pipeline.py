@@ -0,0 +1,164 @@
+"""
+Tests for Advanced ML Pipeline rolling and decomposition kernels
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_ml_pipeline import (
+    AdvancedMLPipeline, ModelPerformance, _additive_decompose, _continuous_learning_worker,
+    _rolling_skew_kurt, _rolling_slope
+)
+
+
+def _make_prices(n_rows, offset=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return offset + rng.standard_normal(n_rows).cumsum()
+
+
+class TestRollingKernels(unittest.TestCase):
+    """Test rolling kernels against pandas / numpy references"""
+
+    @staticmethod
+    def _exact_skew_kurt(values, window):
+        """Per-window bias-corrected moments (NaN windows propagate NaN)"""
+        windows = sliding_window_view(values, window)
+        skew = np.full(values.shape[0], np.nan)
+        kurt = np.full(values.shape[0], np.nan)
+        skew[window - 1:] = stats.skew(windows, axis=1, bias=False)
+        kurt[window - 1:] = stats.kurtosis(windows, axis=1, bias=False)
+        return skew, kurt
+
+    def test_rolling_skew_kurt_matches_pandas(self):
+        prices = pd.Series(_make_prices(400))
+        prices.iloc[[30, 31, 200]] = np.nan
+
+        for window in (4, 5, 20, 60):
+            skew, kurt = _rolling_skew_kurt(prices.to_numpy(), window)
+            expected_skew, expected_kurt = self._exact_skew_kurt(prices.to_numpy(), window)
+            np.testing.assert_allclose(skew, expected_skew, atol=1e-9)
+            np.testing.assert_allclose(kurt, expected_kurt, atol=1e-8)
+
+            # pandas の online 計算は誤差が大きいので NaN の位置と概算値のみ比較
+            rolling = prices.rolling(window=window)
+            np.testing.assert_allclose(skew, rolling.skew().to_numpy(), atol=1e-5)
+            np.testing.assert_allclose(kurt, rolling.kurt().to_numpy(), atol=1e-3)
+
+    def test_rolling_skew_kurt_with_large_price_offset(self):
+        prices = _make_prices(300, offset=1e6, seed=1)
+
+        for window in (4, 20):
+            skew, kurt = _rolling_skew_kurt(prices, window)
+            expected_skew, expected_kurt = self._exact_skew_kurt(prices, window)
+            np.testing.assert_allclose(skew, expected_skew, atol=1e-7)
+            np.testing.assert_allclose(kurt, expected_kurt, atol=1e-7)
+
+    def test_rolling_skew_kurt_constant_and_short_input(self):
+        skew, kurt = _rolling_skew_kurt(np.full(10, 5.0), 4)
+        self.assertTrue(np.isnan(skew[:3]).all())
+        np.testing.assert_array_equal(skew[3:], 0.0)
+        np.testing.assert_array_equal(kurt[3:], -3.0)
+
+        skew, kurt = _rolling_skew_kurt(np.arange(3.0), 5)
+        self.assertTrue(np.isnan(skew).all() and np.isnan(kurt).all())
+
+    def test_rolling_slope_matches_polyfit(self):
+        for offset in (100.0, 1e6):
+            values = _make_prices(120, offset=offset, seed=2)
+            values[50] = np.nan
+            window = 10
+
+            expected = np.full(values.shape[0], np.nan)
+            x = np.arange(window)
+            for end in range(window, values.shape[0] + 1):
+                segment = values[end - window:end]
+                if not np.isnan(segment).any():
+                    expected[end - 1] = np.polyfit(x, segment, 1)[0]
+
+            np.testing.assert_allclose(_rolling_slope(values, window), expected, atol=1e-7)
+
+        self.assertTrue(np.isnan(_rolling_slope(np.arange(5.0), 10)).all())
+
+
+class TestAdditiveDecompose(unittest.TestCase):
+    """Test moving-average trend and phase-mean seasonal decomposition"""
+
+    def test_recovers_seasonal_pattern_on_linear_trend(self):
+        period = 7
+        t = np.arange(140, dtype=np.float64)
+        pattern = np.array([3.0, -1.0, 2.0, -4.0, 0.5, 1.5, -2.0])
+        values = 1000.0 + 0.5 * t + pattern[t.astype(int) % period]
+
+        trend, seasonal, residual = _additive_decompose(values, period)
+
+        np.testing.assert_allclose(
+            trend, pd.Series(values).rolling(window=period).mean().to_numpy()
+        )
+        np.testing.assert_allclose(seasonal, pattern[t.astype(int) % period], atol=1e-9)
+        self.assertAlmostEqual(seasonal[:period].sum(), 0.0)
+
+        valid = ~np.isnan(trend)
+        self.assertTrue(np.isnan(residual[~valid]).all())
+        np.testing.assert_allclose((trend + seasonal + residual)[valid], values[valid])
+
+
+
+class TestContinuousLearningWorker(unittest.TestCase):
+    """Test that batch workers always report a bool"""
+
+    def test_missing_model_reports_false(self):
+        close = _make_prices(120)
+        data = pd.DataFrame({
+            'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+            'Volume': np.full(close.shape[0], 1_000.0)
+        }, index=pd.date_range('2024-01-01', periods=close.shape[0], freq='D'))
+
+        with tempfile.TemporaryDirectory() as model_dir:
+            pipeline = AdvancedMLPipeline(model_save_dir=model_dir)
+            # 既存モデルが無い場合は早期終了する
+            self.assertIsNone(pipeline.continuous_learning('TEST', data))
+            result = _continuous_learning_worker(model_dir, pipeline.model_configs, {}, 'TEST', data)
+
+        self.assertEqual(result, ('TEST', False))
+        self.assertIs(result[1], False)
+
+
+
+class TestModelInsightsCache(unittest.TestCase):
+    """Test that cached insights are not shared with callers"""
+
+    def test_cached_insights_are_copied_with_fresh_timestamp(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            pipeline = AdvancedMLPipeline(model_save_dir=model_dir)
+        pipeline.model_performance['TEST'] = {
+            'rf': ModelPerformance('rf', 4.0, 1.5, 2.0, 0.4, 1.0, 0.1, 0.01, 0.3, {})
+        }
+
+        first = pipeline.get_model_insights('TEST')
+        first['recommendations'].append('MUTATED')
+        first['models']['rf']['r2'] = 1.0
+        first['extra'] = True
+        second = pipeline.get_model_insights('TEST')
+        second['recommendations'].append('MUTATED')
+        third = pipeline.get_model_insights('TEST')
+
+        self.assertIsNot(first, second)
+        self.assertNotIn('extra', second)
+        self.assertEqual(len(second['recommendations']), 2)
+        self.assertEqual(second['models']['rf']['r2'], 0.4)
+        self.assertEqual(len(third['recommendations']), 1)
+        self.assertGreaterEqual(second['timestamp'], first['timestamp'])
+        self.assertEqual(second['best_model']['name'], 'rf')
+
+
+if __name__ == '__main__':
+    unittest.main()
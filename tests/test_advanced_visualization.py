@@ -0,0 +1,214 @@
+"""
+Tests for Advanced Visualization chart caching and geometry helpers
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_visualization import (
+    AdvancedChartGenerator, AnimationEngine, CustomDashboardBuilder, CANDLESTICK_GL_MIN_ROWS,
+    SURFACE_MAX_GRID,
+    _candlestick_gl_traces, _reveal_ranges, _surface_grid
+)
+
+
+def _make_ohlcv(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n_rows).cumsum()
+    open_ = close + rng.standard_normal(n_rows) * 0.5
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.random(n_rows),
+        'Low': np.minimum(open_, close) - rng.random(n_rows),
+        'Close': close,
+        'Volume': rng.integers(1_000, 10_000, n_rows).astype(float)
+    }, index=pd.date_range('2024-01-01', periods=n_rows, freq='D'))
+
+
+class TestFigureCache(unittest.TestCase):
+    """Test that cached figures are isolated from callers"""
+
+    def setUp(self):
+        self.generator = AdvancedChartGenerator()
+        self.data = _make_ohlcv(50)
+
+    def test_mutating_returned_figure_does_not_affect_cache(self):
+        first = self.generator.create_candlestick_chart(self.data)
+        title = first.layout.title.text
+        first.update_layout(title='MUTATED')
+        first.add_scatter(x=[0], y=[0])
+
+        second = self.generator.create_candlestick_chart(self.data)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.layout.title.text, title)
+        self.assertEqual(len(second.data), len(first.data) - 1)
+        self.assertEqual(len(self.generator.figure_cache), 1)
+
+
+class TestDashboardTemplates(unittest.TestCase):
+    """Test that templates are handed out as independent copies"""
+
+    def test_mutating_template_does_not_affect_later_calls(self):
+        builder = CustomDashboardBuilder()
+        template = builder.create_dashboard_template('market_overview')
+        expected = builder.create_dashboard_template('market_overview')
+
+        template['market_performance']['config']['title'] = 'MUTATED'
+        template.pop('sector_analysis')
+
+        self.assertEqual(builder.create_dashboard_template('market_overview'), expected)
+        self.assertEqual(builder.create_dashboard_template('missing'), {})
+
+
+class TestRiskReturnScatter(unittest.TestCase):
+    """Test rolling risk/return points against pandas"""
+
+    def test_points_match_pandas_rolling_mean_and_std(self):
+        data = _make_ohlcv(80, seed=4)
+        fig = AdvancedChartGenerator().create_risk_return_scatter(data)
+
+        returns = data['Close'].pct_change().dropna().rolling(window=20)
+        np.testing.assert_allclose(fig.data[0].x, returns.std().to_numpy(), rtol=1e-5)
+        np.testing.assert_allclose(fig.data[0].y, returns.mean().to_numpy(), rtol=1e-5, atol=1e-9)
+
+
+class TestCandlestickGL(unittest.TestCase):
+    """Test NaN-separated WebGL candlestick encoding"""
+
+    def test_traces_encode_wicks_and_bodies_per_candle(self):
+        data = _make_ohlcv(40, seed=1)
+        traces = _candlestick_gl_traces(data, 'green', 'red')
+
+        self.assertEqual(len(traces), 4)
+        rising = (data['Close'] >= data['Open']).to_numpy()
+        epoch_ms = data.index.to_numpy(dtype='datetime64[ms]').astype(np.float64)
+        expected = [
+            (rising, 'High', 'Low'), (rising, 'Open', 'Close'),
+            (~rising, 'High', 'Low'), (~rising, 'Open', 'Close')
+        ]
+        for trace, (mask, start, end) in zip(traces, expected):
+            self.assertEqual(trace['type'], 'scattergl')
+            self.assertEqual(len(trace['x']), 3 * mask.sum())
+            np.testing.assert_array_equal(trace['x'][0::3], epoch_ms[mask])
+            np.testing.assert_array_equal(trace['x'][1::3], epoch_ms[mask])
+            self.assertTrue(np.isnan(trace['y'][2::3]).all())
+            np.testing.assert_allclose(trace['y'][0::3], data[start].to_numpy()[mask], rtol=1e-6)
+            np.testing.assert_allclose(trace['y'][1::3], data[end].to_numpy()[mask], rtol=1e-6)
+        self.assertEqual([trace['showlegend'] for trace in traces], [True, False, False, False])
+
+    def test_large_input_switches_to_webgl_date_axis(self):
+        generator = AdvancedChartGenerator()
+        small = generator.create_candlestick_chart(_make_ohlcv(50))
+        large = generator.create_candlestick_chart(_make_ohlcv(CANDLESTICK_GL_MIN_ROWS + 1))
+
+        self.assertEqual([trace.type for trace in small.data], ['candlestick'])
+        self.assertEqual({trace.type for trace in large.data}, {'scattergl'})
+        self.assertEqual(large.layout.xaxis.type, 'date')
+
+
+class TestRevealRanges(unittest.TestCase):
+    """Test axis-range animation frames"""
+
+    def test_datetime_ranges_cover_revealed_rows(self):
+        data = _make_ohlcv(30, seed=2)
+        low, high = data['Low'].to_numpy(), data['High'].to_numpy()
+        ends = [10, 15, 30]
+
+        ranges = _reveal_ranges(data.index, low, high, ends)
+
+        half_day = pd.Timedelta(hours=12)
+        for (x_range, y_range), end in zip(ranges, ends):
+            self.assertEqual(x_range, [data.index[0] - half_day, data.index[end - 1] + half_day])
+            y_low, y_high = low[:end].min(), high[:end].max()
+            pad = (y_high - y_low) * 0.05
+            np.testing.assert_allclose(y_range, [y_low - pad, y_high + pad])
+
+    def test_single_row_datetime_index(self):
+        data = _make_ohlcv(1, seed=5)
+        ranges = _reveal_ranges(data.index, data['Low'].to_numpy(), data['High'].to_numpy(), [1])
+        self.assertEqual(ranges[0][0], [data.index[0], data.index[0]])
+
+        engine = AnimationEngine()
+        for fig in (engine.create_price_animation(data), engine.create_volume_animation(data)):
+            self.assertEqual(len(fig.data), 1)
+
+    def test_floor_and_categorical_index(self):
+        volume = np.array([5.0, 3.0, 8.0, 2.0])
+        ranges = _reveal_ranges(pd.Index(list('abcd')), volume, volume, [2, 4], floor=0)
+
+        self.assertEqual([x_range for x_range, _ in ranges], [[-0.5, 1.5], [-0.5, 3.5]])
+        self.assertEqual([y_range[0] for _, y_range in ranges], [0, 0])
+        self.assertAlmostEqual(ranges[1][1][1], 8.0 + 6.0 * 0.05)
+
+    def test_price_animation_frames_only_update_ranges(self):
+        data = _make_ohlcv(30, seed=3)
+        fig = AnimationEngine().create_price_animation(data)
+
+        self.assertEqual(len(fig.data), 1)
+        self.assertEqual([frame.name for frame in fig.frames], ['10', '15', '20', '25'])
+        for frame in fig.frames:
+            self.assertEqual(len(frame.data), 0)
+            self.assertIsNotNone(frame.layout.xaxis.range)
+        self.assertEqual(len(fig.layout.xaxis.range), 2)
+
+
+class TestSurfaceGrid(unittest.TestCase):
+    """Test gridded vs scattered surface input"""
+
+    def test_gridded_input_is_reshaped_without_interpolation(self):
+        xs, ys = np.meshgrid(np.arange(4.0), np.arange(3.0))
+        x, y = xs.ravel(), ys.ravel()
+        z = x * 10 + y
+        order = np.random.default_rng(0).permutation(len(z))
+
+        x_axis, y_axis, z_grid = _surface_grid(x[order], y[order], z[order])
+
+        np.testing.assert_array_equal(x_axis, np.arange(4.0))
+        np.testing.assert_array_equal(y_axis, np.arange(3.0))
+        np.testing.assert_array_equal(z_grid, xs * 10 + ys)
+
+    def test_large_grid_is_decimated(self):
+        xs, ys = np.meshgrid(np.arange(300.0), np.arange(10.0))
+        x_axis, y_axis, z_grid = _surface_grid(xs.ravel(), ys.ravel(), (xs + ys).ravel())
+
+        self.assertLessEqual(len(x_axis), SURFACE_MAX_GRID)
+        self.assertEqual(z_grid.shape, (len(y_axis), len(x_axis)))
+        np.testing.assert_array_equal(z_grid, x_axis[None, :] + y_axis[:, None])
+
+    def test_duplicate_points_are_not_treated_as_grid(self):
+        xs, ys = np.meshgrid(np.arange(3.0), np.arange(3.0))
+        x, y = xs.ravel(), ys.ravel()
+        # 中央の点を欠落させ、代わりに角の点を重複させる (点数は 3x3 のまま)
+        x[4], y[4] = 0.0, 0.0
+        z = 2 * x + 3 * y
+
+        x_axis, y_axis, z_grid = _surface_grid(x, y, z)
+
+        self.assertFalse(np.isnan(z_grid).any())
+        np.testing.assert_allclose(z_grid, 2 * x_axis[None, :] + 3 * y_axis[:, None], atol=1e-9)
+
+    def test_scattered_input_is_interpolated_onto_grid(self):
+        rng = np.random.default_rng(1)
+        corners_x = np.array([0.0, 1.0, 0.0, 1.0])
+        corners_y = np.array([0.0, 0.0, 1.0, 1.0])
+        x = np.concatenate([corners_x, rng.random(40)])
+        y = np.concatenate([corners_y, rng.random(40)])
+        z = 2 * x + 3 * y
+
+        x_axis, y_axis, z_grid = _surface_grid(x, y, z)
+
+        np.testing.assert_allclose(x_axis, np.linspace(0, 1, len(x_axis)))
+        self.assertEqual(z_grid.shape, (len(y_axis), len(x_axis)))
+        # 線形補間は平面を正確に再現する
+        np.testing.assert_allclose(z_grid, 2 * x_axis[None, :] + 3 * y_axis[:, None], atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for Enhanced ML Analyzer technical indicators
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_ml_analyzer import (
+    FeatureEngineer, TechnicalAnalyzer, _rolling_mean_std, _rolling_min_max, _wilder_rsi
+)
+
+
+def _make_prices(n_rows, n_cols=1, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal((n_rows, n_cols)).cumsum(axis=0)
+    high = close + rng.random((n_rows, n_cols))
+    low = close - rng.random((n_rows, n_cols))
+    return close, high, low
+
+
+class TestRollingKernels(unittest.TestCase):
+    """Test fused rolling kernels against pandas"""
+
+    def test_rolling_mean_std_matches_pandas(self):
+        close, _, _ = _make_prices(300)
+        prices = pd.Series(close[:, 0])
+        prices.iloc[[40, 41, 150]] = np.nan
+
+        for period in (2, 5, 20):
+            mean, std = _rolling_mean_std(prices.to_numpy(), period)
+            rolling = prices.rolling(window=period)
+            np.testing.assert_allclose(mean, rolling.mean().to_numpy(), atol=1e-8)
+            np.testing.assert_allclose(std, rolling.std().to_numpy(), atol=1e-8)
+
+    def test_rolling_min_max_matches_pandas(self):
+        _, high, low = _make_prices(300)
+        high_series = pd.Series(high[:, 0])
+        low_series = pd.Series(low[:, 0])
+        low_series.iloc[77] = np.nan
+
+        for period in (1, 5, 14):
+            low_min, high_max = _rolling_min_max(low_series.to_numpy(), high_series.to_numpy(), period)
+            np.testing.assert_array_equal(low_min, low_series.rolling(window=period).min().to_numpy())
+            np.testing.assert_array_equal(high_max, high_series.rolling(window=period).max().to_numpy())
+
+    def test_rsi_uses_wilder_smoothing(self):
+        close, _, _ = _make_prices(100)
+        prices = pd.Series(close[:, 0])
+        rsi = FeatureEngineer()._calculate_rsi(prices)
+
+        delta = prices.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        expected = 100 - 100 / (1 + gain / loss)
+
+        self.assertEqual(rsi.isna().sum(), 14)
+        np.testing.assert_allclose(rsi.to_numpy(), expected.to_numpy())
+
+    def test_wilder_rsi_kernel_matches_pandas_with_gaps(self):
+        close, _, _ = _make_prices(200)
+        prices = pd.Series(close[:, 0])
+        prices.iloc[[0, 60, 61, 150]] = np.nan
+
+        delta = prices.diff()
+        smoothing = dict(alpha=1 / 14, adjust=False, min_periods=14)
+        gain = delta.clip(lower=0).ewm(**smoothing).mean()
+        loss = (-delta).clip(lower=0).ewm(**smoothing).mean()
+        expected = 100 - 100 / (1 + gain / loss)
+
+        np.testing.assert_allclose(_wilder_rsi(prices.to_numpy(), 14), expected.to_numpy(), atol=1e-9)
+        self.assertTrue(np.isnan(_wilder_rsi(np.full(30, 10.0), 14)).all())
+        self.assertEqual(_wilder_rsi(np.arange(30.0), 14)[-1], 100.0)
+
+
+class TestTechnicalAnalyzer(unittest.TestCase):
+    """Test TechnicalAnalyzer single and batch paths"""
+
+    def setUp(self):
+        self.analyzer = TechnicalAnalyzer()
+
+    @staticmethod
+    def _key(indicators):
+        return [(i.name, i.signal, round(float(i.value), 8), round(float(i.strength), 8)) for i in indicators]
+
+    def test_batch_matches_single_symbol(self):
+        close, high, low = _make_prices(400, n_cols=5, seed=1)
+        symbols = [f"TEST{j}" for j in range(5)]
+
+        batch = self.analyzer.analyze_batch(close, high, low, symbols)
+
+        self.assertEqual(list(batch.keys()), symbols)
+        for j, symbol in enumerate(symbols):
+            df = pd.DataFrame({
+                'Open': close[:, j], 'High': high[:, j], 'Low': low[:, j],
+                'Close': close[:, j], 'Volume': 1_000_000.0
+            })
+            self.assertEqual(self._key(batch[symbol]), self._key(self.analyzer.analyze_symbol(df)))
+
+    def test_tail_only_matches_full_history(self):
+        close, high, low = _make_prices(1500, seed=2)
+        df = pd.DataFrame({
+            'Open': close[:, 0], 'High': high[:, 0], 'Low': low[:, 0],
+            'Close': close[:, 0], 'Volume': 1_000_000.0
+        })
+
+        tail = self.analyzer.analyze_symbol(df)
+        full = self.analyzer.analyze_symbol(df, tail_only=False)
+
+        # RSI/MACD の指数平滑は打ち切りによる微小差のみ
+        self.assertEqual([(i.name, i.signal) for i in tail], [(i.name, i.signal) for i in full])
+        for tail_indicator, full_indicator in zip(tail, full):
+            self.assertAlmostEqual(tail_indicator.value, full_indicator.value, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()